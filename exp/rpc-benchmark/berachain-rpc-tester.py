@@ -12,24 +12,99 @@ Usage:
 Key features:
 - Tests multiple contract function calls via eth_call
 - Measures latency, throughput, and error rates
+- Records latency in constant-memory HDR-style histograms
 - Provides detailed statistics and reporting
 - Supports concurrent request patterns
+- Multi-process load generation with merged statistics, across hosts with a coordinator and
+  worker agents on a LAN
+- JSON-RPC batch requests with a batch-size sweep
+- HTTP or multiplexed WebSocket transport, plus eth_subscribe head latency probe
+- Per-interval time series streamed to JSON-lines or CSV while the test runs
+- Live Prometheus/OpenMetrics endpoint for scraping during long runs
+- Declarative JSON/YAML workload files with weighted call mixes per network
+- Archive latency by block age (log-scaled depth buckets), exportable as CSV/JSON
+- Uniform, recency-weighted, Zipf and replayed historical block selection, seedable
+- eth_getLogs range-scan workload and block range size sweep with response sizes
+- Trace workload (debug_traceTransaction, debug_traceBlockByNumber, trace_block) on sampled transactions
+- Head-to-head comparison of several endpoints on one request schedule, with result consistency checks
+- Pre-encoded request templates and optional orjson parsing to keep client CPU per call low
+- Per-request connection phases (pool wait, DNS, connect, send, TTFB, body) and a no-keep-alive mode
+- Run history in SQLite (config, environment, node version, histograms) and regression checks
+  between runs with bootstrap confidence intervals
+- Client overhead: event-loop lag, task-to-send delay and tester CPU, with a client-bound verdict
+  and optional cProfile/yappi capture
+- Open-loop constant-arrival-rate mode that corrects for coordinated omission
+- Ramp, step and spike load profiles, and automatic saturation knee search
+- Adaptive (AIMD or gradient) per-method concurrency limits that find how much concurrency a node takes
 - Includes circuit breaker for error rate monitoring
+- Rate-limit aware: HTTP 429 and JSON-RPC limit errors counted apart, Retry-After honored with
+  jittered backoff, and the sustained request ceiling detected per endpoint and per method
+- Proxy cache measurement: cacheable and cache-busting eth_calls mixed at a target hit ratio, with
+  hit and miss latency told apart by proxy headers or latency clustering
+- Soak mode: rolling windows, crash-safe checkpoints and p99/error-rate drift detection per hour
+- Live terminal dashboard (rich): throughput, rolling p50/p99 per call type, errors, circuit breaker
+  state and latency sparklines, redrawn once per interval
 """
 
 import asyncio
-import aiohttp
 import argparse
+import cProfile
+import csv
+import hashlib
+import hmac
+import ipaddress
 import json
+import platform
+import pstats
+import socket
+import sqlite3
+import tempfile
+import threading
 import time
-import statistics
+import math
+import bisect
 import random
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
-from collections import defaultdict, deque
+import multiprocessing
+import os
+import queue
+import re
+from dataclasses import asdict, dataclass, field, fields, replace
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from statistics import NormalDist
+from typing import Any, Callable, List, Dict, Optional, Tuple
+from collections import OrderedDict, defaultdict, deque
 import logging
 import sys
 
+import aiohttp
+from aiohttp import web
+
+try:
+    import yaml  # Optional: only needed for YAML workload files
+except ImportError:
+    yaml = None
+
+try:
+    import yappi  # Optional: coroutine-aware profiling for --client-profiler yappi
+except ImportError:
+    yappi = None
+
+try:
+    import orjson  # Optional: faster response parsing at high call rates
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+
+try:
+    from rich.console import Group  # Optional: live terminal dashboard for --dashboard
+    from rich.live import Live
+    from rich.table import Table
+    from rich.text import Text
+except ImportError:
+    Live = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -46,6 +121,11 @@ class RPCCallConfig:
     data: str = ""
     description: str = ""
     supports_historical: bool = True  # Whether this call can be made at historical blocks
+    params: Optional[List] = None  # Explicit params for non-eth_call methods; "${block}" is filled per request
+    weight: float = 1.0  # Relative share of the call mix
+    block_range: int = 0  # Range calls (eth_getLogs): blocks from "${from_block}" to "${block}" inclusive
+    timeout: Optional[float] = None  # Seconds before the call counts as a timeout (default: 10)
+    cache_bust: bool = False  # --cache-hit-ratio variant: every request unique, so no cache can answer it
 
 @dataclass
 class RPCResult:
@@ -56,6 +136,595 @@ class RPCResult:
     error: Optional[str] = None
     response_size: int = 0
     block_number: Optional[int] = None  # Block number for historical calls
+    corrected_latency: Optional[float] = None  # Open-loop only: completion minus intended send time
+    phase: Optional[str] = None  # Load profile phase the call was scheduled in
+    rate_limited: bool = False  # HTTP 429 or a JSON-RPC rate-limit error
+    limited_method: Optional[str] = None  # JSON-RPC rate-limit error on one call: its method's own limit was hit
+    cache_busted: Optional[bool] = None  # --cache-hit-ratio only: sent as a unique variant, None if not variable
+    cache_status: Optional[str] = None  # --cache-hit-ratio only: "hit" or "miss" per the proxy's response header
+
+class AliasSampler:
+    """Weighted random choice in O(1) per sample (Vose's alias method)"""
+    
+    def __init__(self, weights: List[float]):
+        if not weights or any(w < 0 for w in weights) or sum(weights) <= 0:
+            raise ValueError("Weights must be non-negative with a positive total")
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Leftovers are 1.0 up to rounding error and keep their defaults
+    
+    def sample(self, rng=random) -> int:
+        index = int(rng.random() * len(self.probability))
+        return index if rng.random() < self.probability[index] else self.alias[index]
+
+class PayloadTemplate:
+    """A call's JSON-RPC request pre-encoded as bytes, with slots for the per-request values.
+    
+    Slots are the quoted placeholder strings ("${id}", "${block}", ...) of the
+    skeleton payload; render() joins the fixed parts with pre-encoded JSON values.
+    """
+    
+    SLOT_PATTERN = re.compile(r'("\$\{[a-z_]+\}")')
+    
+    def __init__(self, payload: Dict):
+        parts = self.SLOT_PATTERN.split(json.dumps(payload, separators=(",", ":")))
+        self.parts = [part.encode() for part in parts]
+        # Odd parts are slots: (position, placeholder name)
+        self.slots = [(i, parts[i][3:-2]) for i in range(1, len(parts), 2)]
+        self.names = {name for _, name in self.slots}
+    
+    def render(self, values: Dict[str, bytes]) -> bytes:
+        parts = self.parts[:]
+        for i, name in self.slots:
+            parts[i] = values[name]
+        return b"".join(parts)
+
+def cache_status(headers) -> Optional[str]:
+    """"hit" or "miss" from a caching proxy's response headers, or None if no known header is present"""
+    for name in CACHE_STATUS_HEADERS:
+        value = headers.get(name)
+        if value:
+            return "hit" if CACHE_HIT_PATTERN.match(value) else "miss"
+    return None
+
+def parse_response(body: bytes, need_result: bool = True):
+    """Parse a JSON-RPC response body.
+    
+    Without need_result, a single successful response is not parsed at all: its
+    first top-level key is "result" rather than "error" (nested keys always come
+    after it), and it comes back as {"result": None}.
+    """
+    if not need_result and body[:1] == b"{":
+        result_at = body.find(b'"result"')
+        if result_at != -1 and body.find(b'"error"', 0, result_at) == -1:
+            return {"result": None}
+    return json_loads(body)
+
+# Phases of an HTTP request, in order, as recorded by --connection-phases
+CONNECTION_PHASES = ("pool_wait", "dns", "connect", "send", "ttfb", "body")
+CONNECTION_PHASE_LABELS = {"pool_wait": "Pool wait", "dns": "DNS lookup", "connect": "Connect (TCP+TLS)",
+                           "send": "Send request", "ttfb": "Time to first byte", "body": "Body read"}
+
+def connection_trace_config() -> aiohttp.TraceConfig:
+    """aiohttp tracing that timestamps each request event into the dict passed as trace_request_ctx"""
+    config = aiohttp.TraceConfig()
+    
+    def mark(name: str):
+        async def handler(session, context, params):
+            if isinstance(context.trace_request_ctx, dict):
+                context.trace_request_ctx[name] = time.perf_counter()
+        return handler
+    
+    for signal, name in ((config.on_request_start, "start"),
+                         (config.on_connection_queued_start, "queued_start"),
+                         (config.on_connection_queued_end, "queued_end"),
+                         (config.on_connection_create_start, "create_start"),
+                         (config.on_connection_create_end, "create_end"),
+                         (config.on_connection_reuseconn, "reused"),
+                         (config.on_dns_resolvehost_start, "dns_start"),
+                         (config.on_dns_resolvehost_end, "dns_end"),
+                         (config.on_request_headers_sent, "sent"),
+                         (config.on_request_chunk_sent, "sent"),
+                         (config.on_request_end, "headers")):
+        signal.append(mark(name))
+    return config
+
+def connection_phases(marks: Dict[str, float], finished: float) -> Dict[str, float]:
+    """Durations of the phases one request went through, from its trace timestamps.
+    
+    DNS and connect only appear when the request opened a new connection;
+    aiohttp does not separate the TLS handshake from the TCP connect.
+    """
+    phases = {"pool_wait": marks["queued_end"] - marks["queued_start"] if "queued_end" in marks else 0.0}
+    if "create_end" in marks:
+        dns = marks["dns_end"] - marks["dns_start"] if "dns_end" in marks else 0.0
+        if "dns_end" in marks:
+            phases["dns"] = dns
+        phases["connect"] = marks["create_end"] - marks["create_start"] - dns
+    acquired = marks.get("create_end") or marks.get("reused") or marks.get("queued_end") or marks["start"]
+    sent = marks.get("sent", acquired)
+    phases["send"] = max(0.0, sent - acquired)
+    phases["ttfb"] = marks["headers"] - sent
+    phases["body"] = finished - marks["headers"]
+    return phases
+
+NETWORKS = {
+    "mainnet": "https://rpc.berachain.com/",
+    "bepolia": "https://bepolia.rpc.berachain.com/",
+}
+DEFAULT_WORKLOAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workloads", "default.json")
+LOGS_WORKLOAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workloads", "logs.json")
+# Filled per request rather than when the workload is loaded
+RUNTIME_PLACEHOLDERS = ("block", "from_block", "tx_hash", "tx_block")
+TRACE_METHOD_PREFIXES = ("debug_", "trace_")
+# Results at these tags depend on when the node answered, so endpoint comparisons skip them
+MOVING_BLOCK_TAGS = ('"latest"', '"pending"', '"safe"', '"finalized"')
+MAX_RESPONSE_DIGESTS = 200_000
+# Requests are posted as pre-encoded bytes, so every session must declare the JSON content type
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Client overhead: the tester is the bottleneck when a process nears one full core, or when the
+# p99 of event-loop lag or task-to-send delay reaches this fraction of the median call latency (and
+# the floor), sustained: the p90 is over the bar too, or CPU is saturated. Spikes alone don't count
+LOOP_PROBE_INTERVAL = 0.01
+CLIENT_CPU_LIMIT = 0.9
+CLIENT_DELAY_FRACTION = 0.25
+CLIENT_DELAY_FLOOR = 0.010
+CLIENT_DELAY_SUSTAINED_PERCENTILE = 90
+# Adaptive concurrency (--concurrency-limit): algorithms, starting limit per method, and
+# seconds of once-per-second limit samples kept to judge where the limit converged
+CONCURRENCY_LIMITS = ("fixed", "aimd", "gradient")
+INITIAL_CONCURRENCY_LIMIT = 4
+LIMIT_HISTORY_SECONDS = 600
+# Rate limiting: JSON-RPC errors that mean "slow down" (EIP-1474 -32005 "limit exceeded" is also
+# used for non-rate limits such as log result caps, so the message decides), backoff without
+# Retry-After (exponential with full jitter), and the extra jitter on top of Retry-After, drawn
+# per waiting call so that a pause doesn't end in one burst
+RATE_LIMIT_PATTERN = re.compile(r"rate.?limit|too many requests|request limit|throttl|capacity exceeded|"
+                                r"compute units|exceeded .*(rate|quota|requests per)", re.IGNORECASE)
+RATE_LIMIT_BASE_BACKOFF = 0.1
+RATE_LIMIT_MAX_BACKOFF = 10.0
+RETRY_AFTER_JITTER = 0.2
+MAX_RETRY_AFTER = 60.0
+# A ceiling is only reported once the endpoint or a method was throttled in this many seconds
+MIN_CEILING_SECONDS = 3
+# Proxy cache measurement (--cache-hit-ratio): response headers in which caching proxies say whether
+# they answered from cache, eth_call data that is a selector plus one address argument (balanceOf and
+# the like), and where busted calls get their addresses from: senders and recipients in recent blocks
+CACHE_STATUS_HEADERS = ("X-ERPC-Cache", "X-Cache-Status", "X-Cache", "CF-Cache-Status", "X-Proxy-Cache")
+CACHE_HIT_PATTERN = re.compile(r"\s*(hit|stale)", re.IGNORECASE)
+ADDRESS_ARGUMENT_PATTERN = re.compile(r"0x[0-9a-fA-F]{8}0{24}[0-9a-fA-F]{40}")
+CACHE_ADDRESS_BLOCKS = 100
+CACHE_ADDRESS_SET = 10_000
+# Timing clusters count as separate (hits vs misses) when their centres are this many times apart
+CACHE_CLUSTER_SEPARATION = 2.0
+# Soak mode (--soak): window summaries kept (the oldest are dropped beyond this, about a month of
+# 5 minute windows), windows after the warm-up one needed to judge drift, successful calls a type
+# needs in every window for its p99 trend (with fewer, a window's p99 is little more than its
+# max), how many standard errors a slope must clear, and the error-rate rise per hour that counts
+# as drift. Distinct error messages are capped for every run, so unique messages can't grow the
+# statistics without bound
+SOAK_MAX_WINDOWS = 10_000
+SOAK_MIN_WINDOWS = 4
+SOAK_MIN_TYPE_CALLS = 100
+DRIFT_MIN_T = 2.0
+ERROR_DRIFT_PER_HOUR = 0.001
+MAX_ERROR_TYPES = 100
+# Live dashboard (--dashboard): intervals behind the per-type percentiles, intervals shown in the
+# sparklines, and how many call types and error messages get a row
+DASHBOARD_WINDOW = 10
+DASHBOARD_SPARKLINE = 60
+DASHBOARD_MAX_TYPES = 15
+DASHBOARD_MAX_ERRORS = 5
+SPARKLINE_BLOCKS = "▁▂▃▄▅▆▇█"
+# Worker agents (--worker-listen) build testers only from these coordinator settings. Output files
+# (time series, profiles, depth exports, checkpoints) stay with the coordinator, and the workload
+# file travels with the job, so a peer can't make an agent write or read files of its choosing
+AGENT_TESTER_KWARGS = frozenset({
+    "rpc_url", "max_concurrent", "test_archive", "archive_blocks", "rate", "hdr_precision", "batch_size",
+    "transport", "ws_url", "ws_connections", "head_latency", "load_profile", "interval", "stream_intervals",
+    "metrics_port", "metrics_host", "network", "block_distribution", "seed", "archive_head", "block_range",
+    "trace_blocks", "trace_timeout", "trace_connections", "keepalive", "concurrency_limit", "latency_target",
+    "honor_retry_after", "cache_hit_ratio",
+})
+TEMPLATE_PATTERN = re.compile(r"\$\{(?:(word):)?([A-Za-z_][A-Za-z0-9_]*)\}")
+
+def load_workload(path: str, network: str) -> Dict:
+    """Load a JSON or YAML workload file and resolve its calls for one network.
+    
+    `${NAME}` in `to`, `data` or `params` is replaced with the network's contract
+    address, `${word:NAME}` with the address as a 32-byte ABI word (for calldata
+    arguments), and `${block}` is left for the block tag chosen per request.
+    Range calls set `block_range` and use `${from_block}` for the window start.
+    `${tx_hash}` and `${tx_block}` are a transaction sampled from recent blocks.
+    Calls with a `networks` list are skipped on other networks.
+    """
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ValueError("YAML workloads need PyYAML: pip install pyyaml")
+            try:
+                spec = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Could not parse {path}: {e}")
+        else:
+            spec = json.load(f)
+    
+    networks = spec.get("networks", {})
+    if networks and network not in networks:
+        raise ValueError(f"Workload {path} does not define network '{network}' "
+                         f"(has: {', '.join(networks)})")
+    contracts = networks.get(network, {}).get("contracts", {})
+    
+    def resolve(value, call_name):
+        if isinstance(value, list):
+            return [resolve(item, call_name) for item in value]
+        if isinstance(value, dict):
+            return {key: resolve(item, call_name) for key, item in value.items()}
+        if not isinstance(value, str):
+            return value
+        
+        def substitute(match):
+            word, name = match.groups()
+            if name in RUNTIME_PLACEHOLDERS and not word:
+                return match.group(0)
+            if name not in contracts:
+                raise ValueError(f"Call '{call_name}' uses ${{{name}}}, which is not a contract "
+                                 f"of network '{network}'")
+            address = contracts[name]
+            return address[2:].lower().rjust(64, "0") if word else address
+        return TEMPLATE_PATTERN.sub(substitute, value)
+    
+    calls = []
+    for entry in spec.get("calls", []):
+        if "name" not in entry:
+            raise ValueError("Every workload call needs a name")
+        name = entry["name"]
+        if "networks" in entry and network not in entry["networks"]:
+            continue
+        if any(call.name == name for call in calls):
+            raise ValueError(f"Duplicate call name '{name}'")
+        method = entry.get("method", "eth_call")
+        params = resolve(entry["params"], name) if "params" in entry else None
+        historical = entry.get("historical")
+        if historical is None:
+            # Historical by default when the call takes a block tag
+            historical = method == "eth_call" or "${block}" in json.dumps(params)
+        weight = float(entry.get("weight", 1.0))
+        if weight <= 0:
+            raise ValueError(f"Call '{name}' needs a positive weight")
+        block_range = int(entry.get("block_range", 0))
+        if ("${from_block}" in json.dumps(params)) != (block_range > 0):
+            raise ValueError(f"Call '{name}' needs both a positive block_range and ${{from_block}} in params")
+        timeout = entry.get("timeout")
+        if timeout is not None and float(timeout) <= 0:
+            raise ValueError(f"Call '{name}' needs a positive timeout")
+        calls.append(RPCCallConfig(
+            name=name,
+            method=method,
+            to=resolve(entry.get("to", ""), name),
+            data=resolve(entry.get("data", ""), name),
+            description=entry.get("description", ""),
+            supports_historical=historical,
+            params=params,
+            weight=weight,
+            block_range=block_range,
+            timeout=float(timeout) if timeout is not None else None
+        ))
+    
+    if not calls:
+        raise ValueError(f"Workload {path} has no calls for network '{network}'")
+    return {
+        "name": spec.get("name", os.path.splitext(os.path.basename(path))[0]),
+        "description": spec.get("description", ""),
+        "chain_id": networks.get(network, {}).get("chain_id"),
+        "calls": calls,
+    }
+
+@dataclass
+class LoadProfile:
+    """Offered load in calls/second as a function of time since the test started"""
+    kind: str = "constant"  # constant, ramp, step, spike
+    rate: float = 100.0  # Constant rate, or the starting/base rate
+    end_rate: Optional[float] = None  # ramp: final rate; step: cap
+    step_rate: float = 0.0  # step: rate added at every step
+    step_seconds: float = 30.0
+    spike_rate: float = 0.0  # spike: rate during the spike
+    spike_at: float = 0.0  # spike: seconds into the test
+    spike_seconds: float = 10.0
+    
+    RAMP_PHASES = 10
+    
+    def rate_at(self, elapsed: float, duration: float) -> float:
+        if self.kind == "ramp":
+            end_rate = self.end_rate if self.end_rate is not None else self.rate
+            return self.rate + (end_rate - self.rate) * min(elapsed / duration, 1.0)
+        if self.kind == "step":
+            rate = self.rate + self.step_rate * int(elapsed // self.step_seconds)
+            return min(rate, self.end_rate) if self.end_rate else rate
+        if self.kind == "spike" and self.spike_at <= elapsed < self.spike_at + self.spike_seconds:
+            return self.spike_rate
+        return self.rate
+    
+    def phase_index(self, elapsed: float, duration: float) -> Optional[int]:
+        """Which reporting phase a send time falls into (None for a constant rate)"""
+        if self.kind == "ramp":
+            return min(int(elapsed / duration * self.RAMP_PHASES), self.RAMP_PHASES - 1)
+        if self.kind == "step":
+            return int(elapsed // self.step_seconds)
+        if self.kind == "spike":
+            if elapsed < self.spike_at:
+                return 0
+            return 1 if elapsed < self.spike_at + self.spike_seconds else 2
+        return None
+    
+    def phase_bounds(self, index: int, duration: float) -> Tuple[float, float]:
+        if self.kind == "ramp":
+            width = duration / self.RAMP_PHASES
+            return index * width, (index + 1) * width
+        if self.kind == "step":
+            return index * self.step_seconds, min((index + 1) * self.step_seconds, duration)
+        edges = [0.0, self.spike_at, min(self.spike_at + self.spike_seconds, duration), duration]
+        return edges[index], edges[index + 1]
+    
+    def scaled(self, factor: float) -> "LoadProfile":
+        """Same shape with every rate multiplied by factor (for sharding across workers)"""
+        return replace(
+            self,
+            rate=self.rate * factor,
+            end_rate=self.end_rate * factor if self.end_rate is not None else None,
+            step_rate=self.step_rate * factor,
+            spike_rate=self.spike_rate * factor
+        )
+    
+    def describe(self) -> str:
+        if self.kind == "ramp":
+            return f"linear ramp {self.rate:g} -> {self.end_rate:g} calls/second"
+        if self.kind == "step":
+            cap = f" up to {self.end_rate:g}" if self.end_rate else ""
+            return (f"step ladder from {self.rate:g} calls/second, +{self.step_rate:g} "
+                    f"every {self.step_seconds:g} seconds{cap}")
+        if self.kind == "spike":
+            return (f"{self.rate:g} calls/second with a {self.spike_rate:g} calls/second spike "
+                    f"at {self.spike_at:g}s for {self.spike_seconds:g}s")
+        return f"{self.rate:g} calls/second"
+
+@dataclass
+class BlockDistribution:
+    """How archive mode picks historical blocks.
+    
+    - uniform: any block in the archive range, equally likely (defeats every cache)
+    - recent:  block age drawn from an exponential with mean `recent_mean` blocks
+    - zipf:    `hot_blocks` blocks from the archive range, the k-th hottest with
+               weight 1/k^`zipf_exponent`
+    - replay:  `replay_blocks` in order, cycling, starting `replay_start` of the way in
+    """
+    kind: str = "uniform"
+    recent_mean: float = 10_000
+    zipf_exponent: float = 1.1
+    hot_blocks: int = 1_000
+    replay_blocks: List[int] = field(default_factory=list)
+    replay_start: float = 0.0  # Lets parallel workers replay different parts of the list
+    
+    def prepare(self, current_block: int, min_block: int, rng: random.Random):
+        """Fix the archive range; zipf also picks its hot set here"""
+        self.current_block = current_block
+        self.min_block = min_block
+        if self.kind == "zipf":
+            span = max(1, current_block - min_block)
+            self.hot = rng.sample(range(min_block, current_block), min(self.hot_blocks, span))
+            self.hot_sampler = AliasSampler([1 / rank ** self.zipf_exponent for rank in range(1, len(self.hot) + 1)])
+        elif self.kind == "replay":
+            self.replay_index = int(self.replay_start * len(self.replay_blocks))
+    
+    def sample(self, rng: random.Random) -> int:
+        if self.kind == "recent":
+            age = 1 + int(rng.expovariate(1 / self.recent_mean))
+            return max(self.min_block, self.current_block - age)
+        if self.kind == "zipf":
+            return self.hot[self.hot_sampler.sample(rng)]
+        if self.kind == "replay":
+            block = self.replay_blocks[self.replay_index % len(self.replay_blocks)]
+            self.replay_index += 1
+            return block
+        return rng.randint(self.min_block, self.current_block - 100)
+    
+    def describe(self) -> str:
+        if self.kind == "recent":
+            return f"recency-weighted, mean age {self.recent_mean:,.0f} blocks"
+        if self.kind == "zipf":
+            return f"Zipf (s={self.zipf_exponent:g}) over {self.hot_blocks:,} hot blocks"
+        if self.kind == "replay":
+            return f"replay of {len(self.replay_blocks):,} listed blocks"
+        return "uniform over the archive range"
+
+def load_block_list(path: str) -> List[int]:
+    """Block numbers from a file: one per line (decimal or 0x hex), first CSV column, # comments"""
+    blocks = []
+    with open(path) as f:
+        for line in f:
+            value = line.split("#")[0].split(",")[0].strip()
+            if not value:
+                continue
+            try:
+                blocks.append(int(value, 0))
+            except ValueError:
+                if blocks:
+                    raise ValueError(f"Not a block number: {value}")
+                # Tolerate a CSV header line
+    return blocks
+
+class LatencyHistogram:
+    """Log-bucketed (HDR-style) latency histogram with constant memory.
+    
+    Values are recorded in microseconds. Bucket width grows with magnitude so
+    every value is kept to `significant_figures` decimal digits of precision,
+    and the number of buckets is bounded by `highest_trackable_seconds` rather
+    than by how many samples were recorded. Only non-empty buckets are stored.
+    """
+    
+    def __init__(self, significant_figures: int = 3, highest_trackable_seconds: float = 3600.0):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.significant_figures = significant_figures
+        self.highest_trackable_seconds = highest_trackable_seconds
+        self.highest_trackable = int(highest_trackable_seconds * 1_000_000)
+        
+        # Smallest power of two that resolves 10^figures values within one bucket
+        sub_bucket_count = 1 << math.ceil(math.log2(2 * 10 ** significant_figures))
+        self._half_count_magnitude = sub_bucket_count.bit_length() - 2
+        self._half_count = sub_bucket_count >> 1
+        self._mask = sub_bucket_count - 1
+        
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.min_value = 0
+        self.max_value = 0
+        self.sum_value = 0
+        self.sum_squares = 0
+    
+    def __len__(self) -> int:
+        return self.total_count
+    
+    def _index_for(self, value: int) -> int:
+        bucket_index = (value | self._mask).bit_length() - (self._half_count_magnitude + 1)
+        sub_bucket_index = value >> bucket_index
+        return ((bucket_index + 1) << self._half_count_magnitude) + (sub_bucket_index - self._half_count)
+    
+    def _highest_equivalent_value(self, index: int) -> int:
+        bucket_index = (index >> self._half_count_magnitude) - 1
+        sub_bucket_index = (index & (self._half_count - 1)) + self._half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self._half_count
+            bucket_index = 0
+        return (sub_bucket_index << bucket_index) + (1 << bucket_index) - 1
+    
+    def record(self, latency: float, count: int = 1):
+        """Record a latency given in seconds"""
+        value = min(max(int(latency * 1_000_000), 0), self.highest_trackable)
+        index = self._index_for(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        
+        if self.total_count == 0 or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+        self.total_count += count
+        self.sum_value += value * count
+        self.sum_squares += value * value * count
+    
+    def merge(self, other: "LatencyHistogram"):
+        """Add all samples from another histogram with the same precision"""
+        if other.significant_figures != self.significant_figures:
+            raise ValueError("Cannot merge histograms with different precision")
+        if other.total_count == 0:
+            return
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        if self.total_count == 0 or other.min_value < self.min_value:
+            self.min_value = other.min_value
+        self.max_value = max(self.max_value, other.max_value)
+        self.total_count += other.total_count
+        self.sum_value += other.sum_value
+        self.sum_squares += other.sum_squares
+    
+    def percentile(self, pct: float) -> float:
+        """Latency in seconds at or below which pct (0-100) of samples fall"""
+        if self.total_count == 0:
+            return 0.0
+        target = max(1, math.ceil(pct / 100 * self.total_count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                value = min(self._highest_equivalent_value(index), self.max_value)
+                return max(value, self.min_value) / 1_000_000
+        return self.max_value / 1_000_000
+    
+    def mean(self) -> float:
+        return self.sum_value / self.total_count / 1_000_000 if self.total_count else 0.0
+    
+    def stdev(self) -> float:
+        """Sample standard deviation in seconds"""
+        if self.total_count < 2:
+            return 0.0
+        n = self.total_count
+        variance = (self.sum_squares - self.sum_value * self.sum_value / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0)) / 1_000_000
+    
+    def min(self) -> float:
+        return self.min_value / 1_000_000
+    
+    def max(self) -> float:
+        return self.max_value / 1_000_000
+    
+    def split_clusters(self, min_separation: float = 2.0) -> Optional[Tuple[float, "LatencyHistogram", "LatencyHistogram"]]:
+        """Split two latency modes (e.g. cache hits and misses) at Otsu's threshold on log latency.
+        
+        Returns (threshold in seconds, fast histogram, slow histogram), or None
+        when the two clusters' mean log latencies are less than min_separation
+        times apart, i.e. there is no clear second mode.
+        """
+        indexes = sorted(self.counts)
+        if len(indexes) < 2:
+            return None
+        values = [max(min(self._highest_equivalent_value(i), self.max_value), self.min_value, 1) for i in indexes]
+        logs = [math.log(value) for value in values]
+        counts = [self.counts[i] for i in indexes]
+        total, total_sum = self.total_count, sum(c * x for c, x in zip(counts, logs))
+        
+        best = None
+        weight, partial = 0, 0.0
+        for k in range(len(indexes) - 1):
+            weight += counts[k]
+            partial += counts[k] * logs[k]
+            low, high = partial / weight, (total_sum - partial) / (total - weight)
+            between = weight * (total - weight) * (high - low) ** 2
+            if best is None or between > best[0]:
+                best = (between, k, high - low)
+        _, split, separation = best
+        if separation < math.log(min_separation):
+            return None
+        
+        fast = LatencyHistogram(self.significant_figures, self.highest_trackable_seconds)
+        slow = LatencyHistogram(self.significant_figures, self.highest_trackable_seconds)
+        for k, (value, count) in enumerate(zip(values, counts)):
+            (fast if k <= split else slow).record(value / 1_000_000, count)
+        return values[split] / 1_000_000, fast, slow
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable representation"""
+        return {
+            "significant_figures": self.significant_figures,
+            "highest_trackable_seconds": self.highest_trackable_seconds,
+            "total_count": self.total_count,
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "sum_value": self.sum_value,
+            "sum_squares": self.sum_squares,
+            "counts": sorted(self.counts.items()),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        histogram = cls(data["significant_figures"], data["highest_trackable_seconds"])
+        histogram.counts = {int(index): int(count) for index, count in data["counts"]}
+        histogram.total_count = data["total_count"]
+        histogram.min_value = data["min_value"]
+        histogram.max_value = data["max_value"]
+        histogram.sum_value = data["sum_value"]
+        histogram.sum_squares = data["sum_squares"]
+        return histogram
 
 @dataclass
 class TestStats:
@@ -64,13 +733,952 @@ class TestStats:
     successful_calls: int = 0
     failed_calls: int = 0
     total_time: float = 0.0
-    latencies: List[float] = field(default_factory=list)
     error_types: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
     calls_by_type: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
     successful_by_type: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
     historical_calls: int = 0
     historical_successful: int = 0
-    historical_latencies: List[float] = field(default_factory=list)
+    # Response body bytes of successful calls
+    response_bytes: int = 0
+    max_response_size: int = 0
+    response_bytes_by_type: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    # Open-loop (--rate) mode only
+    target_rate: Optional[float] = None
+    max_schedule_lag: float = 0.0
+    # Latency histograms (successful calls only), all with the same precision
+    hdr_precision: int = 3
+    latencies: LatencyHistogram = None
+    historical_latencies: LatencyHistogram = None
+    latest_latencies: LatencyHistogram = None
+    corrected_latencies: LatencyHistogram = None
+    latencies_by_type: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    historical_latencies_by_type: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    # Multi-process (--workers) mode only: peak CPU fraction per worker
+    worker_cpu: Dict[str, float] = field(default_factory=dict)
+    # Batch (--batch-size > 1) mode only: one sample per HTTP request
+    batches_sent: int = 0
+    batch_latencies: LatencyHistogram = None
+    # Head latency probe (--head-latency) only: block timestamp to newHeads delivery
+    heads_received: int = 0
+    heads_missed: int = 0
+    head_latencies: LatencyHistogram = None
+    # Load profile (--load-profile) only: per-phase counters and corrected latency
+    phase_calls: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    phase_errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    phase_latencies: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    # Archive (--archive) mode only: historical calls keyed by block age bucket
+    depth_calls: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    depth_errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    depth_latencies: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    # Client overhead: event-loop lag probes, task creation to send, and tester process CPU
+    loop_lags: LatencyHistogram = None
+    dispatch_delays: LatencyHistogram = None
+    client_cpu_time: float = 0.0
+    client_cpu_peak: float = 0.0  # Busiest second of the busiest process, as a fraction of one core
+    client_processes: int = 0
+    # Connection phases (--connection-phases) only: HTTP requests by phase, and connections opened
+    connection_phases: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    traced_requests: int = 0
+    new_connections: int = 0
+    # Adaptive concurrency (--concurrency-limit aimd/gradient) only: converged limit, cuts and requests
+    # held back by their own method's limit, per method and node-wide under "all"
+    concurrency_limits: Dict[str, float] = field(default_factory=dict)
+    concurrency_backoffs: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    concurrency_throttled: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    # Rate limiting: limited calls (also counted as failed), time paused for Retry-After and
+    # backoff, open-loop calls shed while too many waited out a pause, and the sustained ceiling
+    # in calls/s per JSON-RPC method and endpoint-wide under "all" (summed over workers)
+    rate_limited_calls: int = 0
+    http_429s: int = 0
+    rate_limited_by_type: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    backoff_time: float = 0.0
+    backoff_shed: int = 0
+    max_retry_after: float = 0.0
+    rate_limit_ceilings: Dict[str, float] = field(default_factory=dict)
+    # Proxy cache measurement (--cache-hit-ratio) only: successful calls by how they were sent
+    # ("repeated" or "busted") and by the proxy's cache status header ("hit" or "miss")
+    cache_latencies: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    
+    _histogram_fields = ("latencies", "historical_latencies", "latest_latencies", "corrected_latencies",
+                         "batch_latencies", "head_latencies", "loop_lags", "dispatch_delays")
+    _histogram_map_fields = ("latencies_by_type", "historical_latencies_by_type", "phase_latencies",
+                             "depth_latencies", "connection_phases", "cache_latencies")
+    _max_fields = ("total_time", "max_schedule_lag", "max_response_size", "client_cpu_peak", "backoff_time",
+                   "max_retry_after")
+    
+    def __post_init__(self):
+        self.latencies = self.new_histogram()
+        self.historical_latencies = self.new_histogram()
+        self.latest_latencies = self.new_histogram()
+        self.corrected_latencies = self.new_histogram()
+        self.batch_latencies = self.new_histogram()
+        self.head_latencies = self.new_histogram()
+        self.loop_lags = self.new_histogram()
+        self.dispatch_delays = self.new_histogram()
+    
+    def new_histogram(self) -> LatencyHistogram:
+        return LatencyHistogram(self.hdr_precision)
+    
+    def record_latency(self, result: "RPCResult"):
+        """Record a successful call in the overall, per-type and historical/latest histograms"""
+        self.latencies.record(result.latency)
+        if result.corrected_latency is not None:
+            self.corrected_latencies.record(result.corrected_latency)
+        
+        if result.call_name not in self.latencies_by_type:
+            self.latencies_by_type[result.call_name] = self.new_histogram()
+        self.latencies_by_type[result.call_name].record(result.latency)
+        
+        if result.block_number is not None:
+            self.historical_latencies.record(result.latency)
+            if result.call_name not in self.historical_latencies_by_type:
+                self.historical_latencies_by_type[result.call_name] = self.new_histogram()
+            self.historical_latencies_by_type[result.call_name].record(result.latency)
+        else:
+            self.latest_latencies.record(result.latency)
+        
+        if result.cache_busted is not None:
+            for key in ("busted" if result.cache_busted else "repeated", result.cache_status):
+                if key is not None:
+                    if key not in self.cache_latencies:
+                        self.cache_latencies[key] = self.new_histogram()
+                    self.cache_latencies[key].record(result.latency)
+    
+    def client_bound_reasons(self) -> List[str]:
+        """Why the tester itself, rather than the node, may have limited these results"""
+        reasons = []
+        cpu_saturated = self.client_cpu_peak >= CLIENT_CPU_LIMIT
+        if cpu_saturated:
+            reasons.append(f"a tester process peaked at {self.client_cpu_peak:.0%} of a CPU core")
+        median = self.latencies.percentile(50)
+        if median <= 0:
+            return reasons
+        bar = max(CLIENT_DELAY_FRACTION * median, CLIENT_DELAY_FLOOR)
+        for label, histogram in (("event loop lag", self.loop_lags), ("task-to-send delay", self.dispatch_delays)):
+            p99 = histogram.percentile(99)
+            sustained = histogram.percentile(CLIENT_DELAY_SUSTAINED_PERCENTILE) >= bar
+            if p99 >= bar and (sustained or cpu_saturated):
+                reasons.append(f"{label} p99 {p99*1000:.1f} ms is {p99 / median:.0%} of the median call latency")
+        return reasons
+    
+    def merge(self, other: "TestStats"):
+        """Fold another run's statistics (e.g. from a parallel worker) into this one"""
+        for f in fields(self):
+            name = f.name
+            mine, theirs = getattr(self, name), getattr(other, name)
+            if name == "hdr_precision":
+                continue
+            elif name in self._histogram_fields:
+                mine.merge(theirs)
+            elif name in self._histogram_map_fields:
+                for key, histogram in theirs.items():
+                    if key not in mine:
+                        mine[key] = self.new_histogram()
+                    mine[key].merge(histogram)
+            elif name in self._max_fields:
+                setattr(self, name, max(mine, theirs))
+            elif isinstance(mine, dict):
+                for key, value in theirs.items():
+                    mine[key] = mine.get(key, 0) + value
+            elif mine is None or theirs is None:
+                setattr(self, name, theirs if mine is None else mine)
+            else:
+                setattr(self, name, mine + theirs)
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable snapshot of all counters and histograms"""
+        data = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if f.name in self._histogram_fields:
+                value = value.to_dict()
+            elif f.name in self._histogram_map_fields:
+                value = {key: histogram.to_dict() for key, histogram in value.items()}
+            elif isinstance(value, dict):
+                value = dict(value)
+            data[f.name] = value
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TestStats":
+        stats = cls(hdr_precision=data.get("hdr_precision", 3))
+        for f in fields(stats):
+            if f.name not in data or f.name == "hdr_precision":
+                continue
+            value = data[f.name]
+            if f.name in cls._histogram_fields:
+                value = LatencyHistogram.from_dict(value)
+            elif f.name in cls._histogram_map_fields:
+                value = {key: LatencyHistogram.from_dict(histogram) for key, histogram in value.items()}
+            elif isinstance(getattr(stats, f.name), defaultdict):
+                getattr(stats, f.name).update(value)
+                continue
+            setattr(stats, f.name, value)
+        return stats
+
+def latency_summary(histogram: LatencyHistogram, prefix: str = "") -> Dict[str, float]:
+    """p50/p90/p99 in milliseconds, for time-series and metrics output"""
+    return {
+        f"{prefix}p50_ms": round(histogram.percentile(50) * 1000, 3),
+        f"{prefix}p90_ms": round(histogram.percentile(90) * 1000, 3),
+        f"{prefix}p99_ms": round(histogram.percentile(99) * 1000, 3),
+    }
+
+# Block age bucket edges (blocks behind head), roughly log-scaled in 1-3-10 steps
+DEPTH_BUCKET_EDGES = (0, 100, 300, 1_000, 3_000, 10_000, 30_000, 100_000, 300_000,
+                      1_000_000, 3_000_000, 10_000_000)
+
+def format_block_count(blocks: int) -> str:
+    if blocks >= 1_000_000:
+        return f"{blocks / 1_000_000:g}M"
+    if blocks >= 1_000:
+        return f"{blocks / 1_000:g}k"
+    return str(blocks)
+
+DEPTH_BUCKET_LABELS = [
+    f"{format_block_count(low)}-{format_block_count(high)}"
+    for low, high in zip(DEPTH_BUCKET_EDGES, DEPTH_BUCKET_EDGES[1:])
+] + [f"{format_block_count(DEPTH_BUCKET_EDGES[-1])}+"]
+
+def depth_bucket(age: int) -> str:
+    """Label of the block age bucket that `age` blocks behind head falls into"""
+    index = bisect.bisect_right(DEPTH_BUCKET_EDGES, max(age, 0)) - 1
+    return DEPTH_BUCKET_LABELS[index]
+
+class IntervalRecorder:
+    """Counters and histograms for the current interval only, reset on every flush.
+    
+    Memory is bounded by the number of call types, not by run length.
+    """
+    
+    def __init__(self, hdr_precision: int = 3):
+        self.hdr_precision = hdr_precision
+        self._reset()
+    
+    def _reset(self):
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.latencies = LatencyHistogram(self.hdr_precision)
+        self.corrected_latencies = LatencyHistogram(self.hdr_precision)
+        self.loop_lags = LatencyHistogram(self.hdr_precision)
+        self.by_type: Dict[str, Dict] = {}
+    
+    def record(self, result: "RPCResult"):
+        self.calls += 1
+        entry = self.by_type.get(result.call_name)
+        if entry is None:
+            entry = self.by_type[result.call_name] = {
+                "calls": 0, "errors": 0, "latencies": LatencyHistogram(self.hdr_precision)
+            }
+        entry["calls"] += 1
+        if result.success:
+            self.latencies.record(result.latency)
+            entry["latencies"].record(result.latency)
+            if result.corrected_latency is not None:
+                self.corrected_latencies.record(result.corrected_latency)
+        else:
+            self.errors += 1
+            entry["errors"] += 1
+            if result.rate_limited:
+                self.rate_limited += 1
+    
+    def flush(self, index: int, elapsed: float, duration: float, in_flight: int, client_cpu: float = 0.0,
+              concurrency_limit: Optional[float] = None, circuit_open: bool = False) -> Dict:
+        """Return the finished interval as a snapshot and start a new one"""
+        snapshot = {
+            "index": index,
+            "timestamp": time.time(),
+            "elapsed": elapsed,
+            "duration": duration,
+            "in_flight": in_flight,
+            "concurrency_limit": concurrency_limit,
+            "circuit_open": int(circuit_open),  # Processes whose circuit breaker is open at the flush
+            "calls": self.calls,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "latencies": self.latencies,
+            "corrected_latencies": self.corrected_latencies,
+            "client_cpu": client_cpu,
+            "loop_lags": self.loop_lags,
+            "by_type": self.by_type,
+        }
+        self._reset()
+        return snapshot
+
+def merge_interval_snapshots(snapshots: List[Dict]) -> Dict:
+    """Combine the same interval as seen by several workers"""
+    merged = dict(snapshots[0], by_type={})
+    merged["latencies"] = LatencyHistogram(snapshots[0]["latencies"].significant_figures)
+    merged["corrected_latencies"] = LatencyHistogram(snapshots[0]["latencies"].significant_figures)
+    merged["loop_lags"] = LatencyHistogram(snapshots[0]["latencies"].significant_figures)
+    merged["calls"] = merged["errors"] = merged["rate_limited"] = merged["in_flight"] = merged["circuit_open"] = 0
+    merged["concurrency_limit"] = None
+    for snapshot in snapshots:
+        for key in ("calls", "errors", "rate_limited", "in_flight", "circuit_open"):
+            merged[key] += snapshot[key]
+        merged["elapsed"] = max(merged["elapsed"], snapshot["elapsed"])
+        merged["timestamp"] = min(merged["timestamp"], snapshot["timestamp"])
+        merged["latencies"].merge(snapshot["latencies"])
+        merged["corrected_latencies"].merge(snapshot["corrected_latencies"])
+        # Busiest worker, since each process is limited to one core
+        merged["client_cpu"] = max(merged["client_cpu"], snapshot["client_cpu"])
+        merged["loop_lags"].merge(snapshot["loop_lags"])
+        if snapshot["concurrency_limit"] is not None:
+            merged["concurrency_limit"] = (merged["concurrency_limit"] or 0) + snapshot["concurrency_limit"]
+        for call_type, entry in snapshot["by_type"].items():
+            target = merged["by_type"].setdefault(call_type, {
+                "calls": 0, "errors": 0,
+                "latencies": LatencyHistogram(entry["latencies"].significant_figures)
+            })
+            target["calls"] += entry["calls"]
+            target["errors"] += entry["errors"]
+            target["latencies"].merge(entry["latencies"])
+    return merged
+
+class TimeSeriesWriter:
+    """Streams one record per interval to a JSON-lines or CSV file as the test runs.
+    
+    JSON lines get one object per interval with a nested by_type map. CSV is
+    long-format: one row per interval for "all" plus one per call type.
+    """
+    
+    CSV_COLUMNS = ["timestamp", "elapsed", "call_type", "calls", "errors", "rate_limited", "throughput", "in_flight",
+                   "p50_ms", "p90_ms", "p99_ms", "corrected_p50_ms", "corrected_p90_ms", "corrected_p99_ms",
+                   "client_cpu", "loop_lag_p99_ms", "loop_lag_max_ms", "concurrency_limit"]
+    
+    def __init__(self, path: str, output_format: Optional[str] = None):
+        self.path = path
+        self.format = output_format or ("csv" if path.endswith(".csv") else "jsonl")
+        self.file = open(path, "w", newline="")
+        self.csv_writer = None
+        if self.format == "csv":
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=self.CSV_COLUMNS)
+            self.csv_writer.writeheader()
+    
+    def write(self, snapshot: Dict):
+        duration = snapshot["duration"] or 1.0
+        record = {
+            "timestamp": round(snapshot["timestamp"], 3),
+            "elapsed": round(snapshot["elapsed"], 3),
+            "calls": snapshot["calls"],
+            "errors": snapshot["errors"],
+            "rate_limited": snapshot["rate_limited"],
+            "throughput": round(snapshot["calls"] / duration, 3),
+            "in_flight": snapshot["in_flight"],
+            **latency_summary(snapshot["latencies"]),
+        }
+        if snapshot["corrected_latencies"]:
+            record.update(latency_summary(snapshot["corrected_latencies"], "corrected_"))
+        record["client_cpu"] = round(snapshot["client_cpu"], 3)
+        record["loop_lag_p99_ms"] = round(snapshot["loop_lags"].percentile(99) * 1000, 3)
+        record["loop_lag_max_ms"] = round(snapshot["loop_lags"].max() * 1000, 3)
+        if snapshot["concurrency_limit"] is not None:
+            record["concurrency_limit"] = round(snapshot["concurrency_limit"], 2)
+        by_type = {
+            call_type: {
+                "calls": entry["calls"],
+                "errors": entry["errors"],
+                "throughput": round(entry["calls"] / duration, 3),
+                **latency_summary(entry["latencies"]),
+            }
+            for call_type, entry in sorted(snapshot["by_type"].items())
+        }
+        
+        if self.csv_writer is None:
+            self.file.write(json.dumps(dict(record, by_type=by_type)) + "\n")
+        else:
+            self.csv_writer.writerow(dict(record, call_type="all"))
+            for call_type, entry in by_type.items():
+                self.csv_writer.writerow(dict(
+                    entry, call_type=call_type, timestamp=record["timestamp"],
+                    elapsed=record["elapsed"], in_flight=""
+                ))
+        self.file.flush()
+    
+    def close(self):
+        self.file.close()
+
+def format_elapsed(seconds: float) -> str:
+    """Run time as 1h05m or 4m30s"""
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    return f"{seconds // 60}m{seconds % 60:02d}s"
+
+def linear_trend(xs: List[float], ys: List[float]) -> Optional[Tuple[float, float, float]]:
+    """Least-squares (slope, intercept, standard error of the slope), or None with fewer than 3 points"""
+    n = len(xs)
+    if n < 3:
+        return None
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    intercept = mean_y - slope * mean_x
+    residual = sum((y - intercept - slope * x) ** 2 for x, y in zip(xs, ys))
+    return slope, intercept, math.sqrt(residual / (n - 2) / sxx)
+
+def corrected_min_t(tests: int) -> float:
+    """DRIFT_MIN_T raised so that `tests` one-sided tests together false-alarm as rarely as one (Bonferroni)"""
+    normal = NormalDist()
+    return normal.inv_cdf(1 - (1 - normal.cdf(DRIFT_MIN_T)) / max(tests, 1))
+
+class SoakMonitor:
+    """Rolling-window statistics, crash-safe checkpoints and drift detection for --soak runs.
+    
+    An interval sink: intervals are folded into windows of `window` seconds,
+    and each closed window is reduced to a small summary (throughput, errors,
+    percentiles, p99 per call type), so memory grows by a few hundred bytes
+    per window however long the run. After every window the cumulative
+    statistics and all summaries are written to the checkpoint file, replacing
+    it atomically, so a crash loses at most one window.
+    
+    Drift is a least-squares trend over the windows after the first (warm-up):
+    latency drifts when its p99 rises by more than `threshold` of its starting
+    value per hour, errors when the error rate rises by more than
+    ERROR_DRIFT_PER_HOUR, in both cases with the slope at least
+    DRIFT_MIN_T standard errors above zero. Only these overall trends decide
+    the verdict. p99 trends per call type are reported as a pointer to the
+    culprit, for types with SOAK_MIN_TYPE_CALLS in every window, and against
+    a bar corrected for testing every type at once.
+    """
+    
+    def __init__(self, tester: "BerachainRPCTester", window: float, checkpoint_path: Optional[str] = None,
+                 threshold: float = 0.10):
+        self.tester = tester
+        self.window = window
+        self.checkpoint_path = checkpoint_path
+        self.threshold = threshold
+        self.tester_kwargs: Optional[Dict] = None  # Saved in checkpoints so --from-checkpoint can rebuild the run
+        self.windows: deque = deque(maxlen=SOAK_MAX_WINDOWS)
+        self.closed = 0
+        self.elapsed = 0.0  # End of the last interval seen
+        self._reset(0.0)
+    
+    def _reset(self, start: float):
+        self.start = start
+        self.calls = self.errors = self.rate_limited = 0
+        self.latencies = LatencyHistogram(self.tester.hdr_precision)
+        self.by_type: Dict[str, Dict] = {}
+    
+    def add_interval(self, snapshot: Dict):
+        self.calls += snapshot["calls"]
+        self.errors += snapshot["errors"]
+        self.rate_limited += snapshot["rate_limited"]
+        self.latencies.merge(snapshot["latencies"])
+        self.elapsed = snapshot["elapsed"]
+        for call_type, entry in snapshot["by_type"].items():
+            target = self.by_type.setdefault(call_type, {
+                "calls": 0, "errors": 0, "latencies": LatencyHistogram(self.tester.hdr_precision)
+            })
+            target["calls"] += entry["calls"]
+            target["errors"] += entry["errors"]
+            target["latencies"].merge(entry["latencies"])
+        # Windows end on multiples of the window length, so late interval flushes don't shift them
+        if snapshot["elapsed"] >= (self.closed + 1) * self.window - 1e-6:
+            self.close_window(snapshot["elapsed"])
+    
+    def close_window(self, end: float):
+        duration = end - self.start
+        summary = {
+            "index": self.closed,
+            "start": round(self.start, 3),
+            "end": round(end, 3),
+            "timestamp": round(time.time(), 3),
+            "calls": self.calls,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "throughput": round(self.calls / duration, 3) if duration > 0 else 0.0,
+            "error_rate": self.errors / self.calls if self.calls else 0.0,
+            **latency_summary(self.latencies),
+            "by_type": {call_type: {"calls": entry["calls"], "errors": entry["errors"],
+                                    **latency_summary(entry["latencies"])}
+                        for call_type, entry in sorted(self.by_type.items())},
+        }
+        self.windows.append(summary)
+        self.closed += 1
+        logger.info(f"Soak window {summary['index'] + 1} ({format_elapsed(self.start)}-{format_elapsed(end)}): "
+                    f"{summary['throughput']:.1f} calls/s, p50 {summary['p50_ms']:.2f} ms, "
+                    f"p99 {summary['p99_ms']:.2f} ms, errors {summary['error_rate']:.2%}")
+        self._reset(end)
+        self.write_checkpoint()
+    
+    def finish(self):
+        """Close the last, partial window if it covers at least half a window, and write the final checkpoint"""
+        if self.calls and self.elapsed - self.start >= self.window / 2:
+            self.close_window(self.elapsed)
+        else:
+            self.write_checkpoint()
+    
+    def write_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        tester = self.tester
+        checkpoint = {
+            "written_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "started_at": getattr(tester, "test_start_time", None),
+            "duration": tester.duration,
+            "client_version": tester.client_version,
+            "window": self.window,
+            "threshold": self.threshold,
+            "tester_kwargs": encode_tester_kwargs(self.tester_kwargs) if self.tester_kwargs else None,
+            "stats": tester.stats.to_dict(),
+            "windows": list(self.windows),
+        }
+        # Write then rename, so a crash mid-write leaves the previous checkpoint intact
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False) as f:
+            json.dump(checkpoint, f)
+        os.replace(f.name, self.checkpoint_path)
+    
+    def trend(self, values: List[float], baseline_floor: float = 0.0) -> Optional[Dict]:
+        """Per-hour slope of one metric over the drift windows, with its t value and starting level"""
+        windows = list(self.windows)[1:]
+        hours = [(w["start"] + w["end"]) / 2 / 3600 for w in windows]
+        fit = linear_trend(hours, values)
+        if fit is None or len(windows) < SOAK_MIN_WINDOWS:
+            return None
+        slope, intercept, stderr = fit
+        t = slope / stderr if stderr > 0 else (math.inf if slope > 0 else 0.0)
+        start = max(intercept + slope * hours[0], baseline_floor)
+        return {"slope": slope, "t": t, "start": start, "relative": slope / start if start > 0 else 0.0}
+    
+    def drift(self) -> Dict[str, Optional[Dict]]:
+        """Trends for p50, p99, error rate and throughput, plus p99 per call type (keyed "p99_ms:<type>").
+        
+        Per-type trends carry the corrected t they were held to as "min_t".
+        """
+        windows = list(self.windows)[1:]
+        trends = {
+            "p50_ms": self.trend([w["p50_ms"] for w in windows]),
+            "p99_ms": self.trend([w["p99_ms"] for w in windows]),
+            "error_rate": self.trend([w["error_rate"] for w in windows]),
+            "throughput": self.trend([w["throughput"] for w in windows]),
+        }
+        call_types = set().union(*(w["by_type"] for w in windows)) if windows else set()
+        for call_type in sorted(call_types):
+            # A type's p99 comes from its successful calls
+            entries = [w["by_type"].get(call_type, {"calls": 0, "errors": 0}) for w in windows]
+            if all(entry["calls"] - entry["errors"] >= SOAK_MIN_TYPE_CALLS for entry in entries):
+                trends[f"p99_ms:{call_type}"] = self.trend([w["by_type"][call_type]["p99_ms"] for w in windows])
+        type_min_t = corrected_min_t(sum(1 for key in trends if key.startswith("p99_ms:")))
+        for key, trend in trends.items():
+            if trend is not None:
+                if key == "error_rate":
+                    trend["drifting"] = trend["t"] >= DRIFT_MIN_T and trend["slope"] >= ERROR_DRIFT_PER_HOUR
+                elif key == "p99_ms":
+                    trend["drifting"] = trend["t"] >= DRIFT_MIN_T and trend["relative"] >= self.threshold
+                elif key.startswith("p99_ms:"):
+                    trend["min_t"] = type_min_t
+                    trend["drifting"] = trend["t"] >= type_min_t and trend["relative"] >= self.threshold
+                else:
+                    trend["drifting"] = False  # Reported, not judged: open-loop throughput is fixed by --rate
+        return trends
+    
+    def drifting(self) -> List[str]:
+        """Overall trends that drift; the verdict and exit status rest on these alone"""
+        trends = self.drift()
+        return [key for key in ("p99_ms", "error_rate") if trends[key] is not None and trends[key]["drifting"]]
+    
+    def print_report(self):
+        windows = list(self.windows)
+        print(f"\nSOAK ({len(windows)} windows of {format_elapsed(self.window)}):")
+        if not windows:
+            print("No window completed")
+            return
+        print(f"{'Window':<18} {'Calls/s':>10} {'Errors':>8} {'p50 ms':>9} {'p99 ms':>9}")
+        print("-" * 58)
+        # At most 24 rows: every n-th window, and always the last
+        step = max(1, math.ceil(len(windows) / 24))
+        for i, w in enumerate(windows):
+            if i % step == 0 or i == len(windows) - 1:
+                label = f"{format_elapsed(w['start'])}-{format_elapsed(w['end'])}"
+                print(f"{label:<18} {w['throughput']:>10.1f} {w['error_rate']:>8.2%} {w['p50_ms']:>9.2f} {w['p99_ms']:>9.2f}")
+        
+        trends = self.drift()
+        if all(trend is None for trend in trends.values()):
+            print(f"Drift:                needs {SOAK_MIN_WINDOWS + 1} windows (the first is warm-up)")
+            return
+        print(f"\nDrift per hour (least-squares over windows 2-{len(windows)}; flagged when t >= {DRIFT_MIN_T:g}):")
+        rows = [("p50 latency", "p50_ms", "ms"), ("p99 latency", "p99_ms", "ms"),
+                ("Error rate", "error_rate", "pp"), ("Throughput", "throughput", "calls/s")]
+        for label, key, unit in rows:
+            trend = trends[key]
+            if trend is None:
+                continue
+            slope = trend["slope"] * 100 if unit == "pp" else trend["slope"]
+            relative = f" ({trend['relative']:+.1%} of start)" if unit != "pp" else ""
+            flag = "  <- DRIFT" if trend["drifting"] else ""
+            print(f"{label:<22}{slope:+.3f} {unit}/hour{relative}, t = {trend['t']:.1f}{flag}")
+        drifting_types = sorted(
+            ((key.split(":", 1)[1], trend) for key, trend in trends.items()
+             if key.startswith("p99_ms:") and trend is not None and trend["drifting"]),
+            key=lambda item: -item[1]["relative"])
+        if drifting_types:
+            print(f"Rising per call type (for information; t >= {drifting_types[0][1]['min_t']:.1f}, corrected "
+                  f"for the types tested):")
+        for call_type, trend in drifting_types[:10]:
+            print(f"  {call_type[:30]:<30} p99 {trend['slope']:+.2f} ms/hour ({trend['relative']:+.1%} of start), "
+                  f"t = {trend['t']:.1f}")
+        if self.drifting():
+            print(f"Verdict:              DRIFTING - latency or errors rise with run time "
+                  f"(threshold {self.threshold:.0%} of starting p99 per hour)")
+        else:
+            print(f"Verdict:              stable - no significant upward trend in p99 or errors")
+
+def sparkline(values: List[float]) -> str:
+    """One block character per value, scaled between the smallest and largest value"""
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    if high <= low:
+        return SPARKLINE_BLOCKS[0] * len(values)
+    top = len(SPARKLINE_BLOCKS) - 1
+    return "".join(SPARKLINE_BLOCKS[round((value - low) / (high - low) * top)] for value in values)
+
+class Dashboard:
+    """Live terminal dashboard for --dashboard, redrawn once per interval.
+    
+    An interval sink: it only reads the snapshots IntervalRecorder produces
+    anyway, so nothing is added per request, and with rich's auto-refresh off
+    it draws exactly once per interval, from whatever flushed it (the event
+    loop, or the parent's collector with --workers). Per-type percentiles are
+    over the last DASHBOARD_WINDOW intervals; the error breakdown covers the
+    whole run. Log lines print above the dashboard while it is shown.
+    """
+    
+    def __init__(self, tester: "BerachainRPCTester"):
+        self.tester = tester
+        self.intervals: deque = deque(maxlen=DASHBOARD_WINDOW)
+        self.throughput_history: deque = deque(maxlen=DASHBOARD_SPARKLINE)
+        self.p99_history: deque = deque(maxlen=DASHBOARD_SPARKLINE)
+        self.live = None  # rich Live display, from the first interval until stop()
+        self.log_streams: List[Tuple[logging.StreamHandler, Any]] = []
+    
+    def start(self):
+        self.live = Live(self.render(), auto_refresh=False, redirect_stdout=True, redirect_stderr=True)
+        self.live.start()
+        # Log handlers keep the stream they were created with, so point them at rich's redirect
+        for handler in logging.getLogger().handlers:
+            if type(handler) is logging.StreamHandler:
+                previous = handler.setStream(sys.stderr)
+                if previous is not None:
+                    self.log_streams.append((handler, previous))
+    
+    def stop(self):
+        """Leave the last frame on screen and restore logging"""
+        if self.live is None:
+            return
+        for handler, stream in self.log_streams:
+            handler.setStream(stream)
+        self.log_streams = []
+        self.live.stop()
+        self.live = None
+    
+    def add_interval(self, snapshot: Dict):
+        self.intervals.append(snapshot)
+        self.throughput_history.append(snapshot["calls"] / (snapshot["duration"] or 1.0))
+        self.p99_history.append(snapshot["latencies"].percentile(99) * 1000)
+        if self.live is None:
+            self.start()  # On the first interval, so start-up logging prints normally
+        else:
+            self.live.update(self.render(), refresh=True)
+    
+    def render(self) -> "Group":
+        tester = self.tester
+        intervals = list(self.intervals)
+        last = intervals[-1] if intervals else None
+        
+        header = Text()
+        header.append(tester.rpc_url, style="bold")
+        header.append(f"  {format_elapsed(last['elapsed'] if last else 0)}")
+        if tester.duration:
+            header.append(f" / {format_elapsed(tester.duration)}")
+        if last is not None:
+            header.append(f"  {self.throughput_history[-1]:,.1f} calls/s", style="bold cyan")
+            header.append(f"  in flight {last['in_flight']:,}")
+            if last["concurrency_limit"] is not None:
+                header.append(f"  limit {last['concurrency_limit']:.1f}")
+        header.append("\nCircuit breaker: ")
+        if last is not None and last["circuit_open"]:
+            workers = f" in {last['circuit_open']} workers" if last["circuit_open"] > 1 else ""
+            header.append(f"OPEN{workers}", style="bold red")
+        else:
+            header.append("closed", style="green")
+        rejected = tester.stats.error_types.get("Circuit breaker open", 0)
+        if rejected:
+            header.append(f" ({rejected:,} calls rejected)")
+        
+        sparklines = Table.grid(padding=(0, 1))
+        for label, history in (("Calls/s", self.throughput_history), ("p99 ms", self.p99_history)):
+            values = list(history)
+            scale = f"{min(values):,.1f} - {max(values):,.1f}" if values else ""
+            sparklines.add_row(label, Text(sparkline(values), style="cyan"), scale)
+        
+        # Rolling percentiles: the last DASHBOARD_WINDOW intervals merged per call type
+        seconds = sum(snapshot["duration"] for snapshot in intervals)
+        by_type: Dict[str, Dict] = {}
+        total = LatencyHistogram(tester.hdr_precision)
+        calls = errors = 0
+        for snapshot in intervals:
+            calls += snapshot["calls"]
+            errors += snapshot["errors"]
+            total.merge(snapshot["latencies"])
+            for call_type, entry in snapshot["by_type"].items():
+                target = by_type.setdefault(call_type, {
+                    "calls": 0, "errors": 0, "latencies": LatencyHistogram(tester.hdr_precision)
+                })
+                target["calls"] += entry["calls"]
+                target["errors"] += entry["errors"]
+                target["latencies"].merge(entry["latencies"])
+        
+        table = Table(title=f"Last {format_elapsed(seconds)}", title_justify="left", header_style="bold")
+        table.add_column("Call type")
+        for column in ("Calls/s", "Errors", "p50 ms", "p99 ms"):
+            table.add_column(column, justify="right")
+        
+        def add_row(label: str, row_calls: int, row_errors: int, latencies: LatencyHistogram, **style):
+            table.add_row(
+                label[:40], f"{row_calls / seconds:,.1f}" if seconds else "-",
+                Text(f"{row_errors / row_calls:.1%}" if row_calls else "-", style="red" if row_errors else ""),
+                f"{latencies.percentile(50) * 1000:.2f}" if latencies else "-",
+                f"{latencies.percentile(99) * 1000:.2f}" if latencies else "-",
+                **style)
+        
+        add_row("All", calls, errors, total, style="bold", end_section=True)
+        busiest = sorted(by_type.items(), key=lambda item: -item[1]["calls"])
+        for call_type, entry in busiest[:DASHBOARD_MAX_TYPES]:
+            add_row(call_type, entry["calls"], entry["errors"], entry["latencies"])
+        if len(busiest) > DASHBOARD_MAX_TYPES:
+            table.add_row(f"... {len(busiest) - DASHBOARD_MAX_TYPES} more", style="dim")
+        
+        stats = tester.stats
+        failures = Text(f"Errors: {stats.failed_calls:,} of {stats.total_calls:,} calls")
+        if stats.total_calls:
+            failures.append(f" ({stats.failed_calls / stats.total_calls:.2%})")
+        if stats.rate_limited_calls:
+            failures.append(f", {stats.rate_limited_calls:,} rate limited")
+        for error, count in sorted(stats.error_types.items(), key=lambda item: -item[1])[:DASHBOARD_MAX_ERRORS]:
+            failures.append(f"\n  {count:>8,}  {error[:100]}", style="red")
+        
+        return Group(header, sparklines, table, failures)
+
+class PrometheusExporter:
+    """Serves live tester metrics for Prometheus to scrape while a test runs.
+    
+    Uses the Prometheus text format, or OpenMetrics when the scraper asks for
+    it. Latency uses fixed Prometheus buckets (not the HDR histograms) so it
+    can be aggregated with histogram_quantile() across scrapes and workers.
+    """
+    
+    PREFIX = "berachain_rpc_tester"
+    LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    MAX_ERROR_LABELS = 50  # Error messages become labels; cap them to bound cardinality
+    
+    def __init__(self, tester: "BerachainRPCTester", host: str = "127.0.0.1", port: int = 9464):
+        self.tester = tester
+        self.host = host
+        self.port = port
+        self.runner: Optional[web.AppRunner] = None
+        self.requests: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self.errors: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.error_labels: set = set()
+        self.latency: Dict[Tuple[str, str], List] = {}
+        self.corrected_latency: Optional[List] = None
+    
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        logger.info(f"Serving Prometheus metrics on http://{self.host}:{self.port}/metrics")
+    
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+    
+    def _observe(self, series: List, value: float):
+        buckets, _, _ = series
+        index = bisect.bisect_left(self.LATENCY_BUCKETS, value)
+        buckets[index] += 1
+        series[1] += value
+        series[2] += 1
+    
+    def _new_series(self) -> List:
+        # [per-bucket counts (last is +Inf), sum, count]
+        return [[0] * (len(self.LATENCY_BUCKETS) + 1), 0.0, 0]
+    
+    def record(self, result: "RPCResult"):
+        block = "latest" if result.block_number is None else "historical"
+        outcome = "success" if result.success else ("rate_limited" if result.rate_limited else "error")
+        self.requests[(result.call_name, block, outcome)] += 1
+        
+        if result.success:
+            key = (result.call_name, block)
+            if key not in self.latency:
+                self.latency[key] = self._new_series()
+            self._observe(self.latency[key], result.latency)
+            if result.corrected_latency is not None:
+                if self.corrected_latency is None:
+                    self.corrected_latency = self._new_series()
+                self._observe(self.corrected_latency, result.corrected_latency)
+        else:
+            error = (result.error or "Unknown")[:80]
+            if error not in self.error_labels:
+                if len(self.error_labels) >= self.MAX_ERROR_LABELS:
+                    error = "other"
+                else:
+                    self.error_labels.add(error)
+            self.errors[(result.call_name, error)] += 1
+    
+    @staticmethod
+    def _escape(value: Any) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    
+    def _labels(self, **labels) -> str:
+        return "{" + ",".join(f'{name}="{self._escape(value)}"' for name, value in labels.items()) + "}"
+    
+    def _histogram_lines(self, name: str, series: List, **labels) -> List[str]:
+        buckets, total, count = series
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(list(self.LATENCY_BUCKETS) + ["+Inf"], buckets):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{self._labels(**labels, le=bound)} {cumulative}")
+        lines.append(f"{name}_sum{self._labels(**labels)} {total}")
+        lines.append(f"{name}_count{self._labels(**labels)} {count}")
+        return lines
+    
+    def render(self, openmetrics: bool = False) -> str:
+        p = self.PREFIX
+        tester = self.tester
+        
+        def header(name: str, kind: str, help_text: str) -> List[str]:
+            # OpenMetrics names the counter family without its _total suffix
+            family = name[:-len("_total")] if openmetrics and kind == "counter" else name
+            return [f"# HELP {family} {help_text}", f"# TYPE {family} {kind}"]
+        
+        lines = header(f"{p}_info", "gauge", "Test configuration")
+        mode = "open-loop" if tester.rate else "closed-loop"
+        lines.append(f"{p}_info{self._labels(rpc_url=tester.rpc_url, transport=tester.transport, mode=mode)} 1")
+        
+        lines += header(f"{p}_requests_total", "counter", "RPC calls by call name, block and outcome")
+        for (call_name, block, outcome), count in sorted(self.requests.items()):
+            lines.append(f"{p}_requests_total{self._labels(call_name=call_name, block=block, outcome=outcome)} {count}")
+        
+        lines += header(f"{p}_errors_total", "counter", "Failed RPC calls by call name and error")
+        for (call_name, error), count in sorted(self.errors.items()):
+            lines.append(f"{p}_errors_total{self._labels(call_name=call_name, error=error)} {count}")
+        
+        lines += header(f"{p}_latency_seconds", "histogram", "Latency of successful RPC calls")
+        for (call_name, block), series in sorted(self.latency.items()):
+            lines += self._histogram_lines(f"{p}_latency_seconds", series, call_name=call_name, block=block)
+        
+        if self.corrected_latency is not None:
+            lines += header(f"{p}_corrected_latency_seconds", "histogram",
+                            "Open-loop latency measured from intended send time")
+            lines += self._histogram_lines(f"{p}_corrected_latency_seconds", self.corrected_latency)
+        
+        lines += header(f"{p}_in_flight", "gauge", "Requests currently awaiting a response")
+        lines.append(f"{p}_in_flight {tester.in_flight}")
+        lines += header(f"{p}_circuit_breaker_open", "gauge", "1 while the circuit breaker is open")
+        lines.append(f"{p}_circuit_breaker_open {int(tester.circuit_breaker.is_open)}")
+        lines += header(f"{p}_target_rate", "gauge", "Offered load in calls/second (0 when closed-loop)")
+        lines.append(f"{p}_target_rate {tester.current_rate or 0}")
+        if tester.limiter is not None:
+            lines += header(f"{p}_concurrency_limit", "gauge", "Adaptive in-flight limit by call type")
+            lines.append(f"{p}_concurrency_limit{self._labels(call_name='all')} {tester.limiter.total.limit:.2f}")
+            for call_name, limit in sorted(tester.limiter.limits.items()):
+                lines.append(f"{p}_concurrency_limit{self._labels(call_name=call_name)} {limit.limit:.2f}")
+        
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+    
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        openmetrics = "application/openmetrics-text" in request.headers.get("Accept", "")
+        content_type = ("application/openmetrics-text; version=1.0.0; charset=utf-8" if openmetrics
+                        else "text/plain; version=0.0.4; charset=utf-8")
+        return web.Response(body=self.render(openmetrics).encode(), headers={"Content-Type": content_type})
+
+class RateLimitedError(Exception):
+    """HTTP 429 from the endpoint"""
+    
+    def __init__(self, retry_after: Optional[float]):
+        super().__init__("HTTP 429")
+        self.retry_after = retry_after  # Seconds, if the endpoint sent Retry-After
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header: delay in seconds, or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def is_rate_limit_error(error) -> bool:
+    """Whether a JSON-RPC error object says the caller is being rate limited"""
+    if not isinstance(error, dict):
+        return False
+    return error.get("code") == 429 or bool(RATE_LIMIT_PATTERN.search(str(error.get("message", ""))))
+
+class RateLimitTracker:
+    """Calls the endpoint accepted per second while it was rate limiting, per JSON-RPC method and overall.
+    
+    Limits are counted where they apply. The endpoint ("all") is throttled in
+    a second with an HTTP 429 or rejected batch, and every call past that
+    gate counts as accepted, whether or not its method then refused it. A
+    method is throttled in a second with a rate-limit error of its own, and
+    its successful calls count as accepted, summed over every call type that
+    uses the method. The median of the accepted counts over throttled seconds
+    is the sustained ceiling. It is a lower bound: the endpoint can only
+    accept what the tester offered, and backoff pauses offer less.
+    """
+    
+    def __init__(self, call_methods: Dict[str, str]):
+        self.call_methods = call_methods  # Call type name -> JSON-RPC method
+        self.second: Optional[int] = None
+        self.accepted: Dict[str, int] = defaultdict(int)
+        self.limited: Dict[str, int] = defaultdict(int)
+        # Accepted calls in each throttled second, for the last hour of throttling
+        self.samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=3600))
+    
+    def record(self, result: "RPCResult"):
+        second = int(time.monotonic())
+        if second != self.second:
+            self.close_second()
+            self.second = second
+        if result.rate_limited and result.limited_method is None:
+            self.limited["all"] += 1
+            return
+        self.accepted["all"] += 1
+        counts = self.limited if result.rate_limited else self.accepted
+        counts[self.call_methods.get(result.call_name, result.call_name)] += 1
+    
+    def close_second(self):
+        for key, limited in self.limited.items():
+            if limited:
+                self.samples[key].append(self.accepted.get(key, 0))
+        self.accepted.clear()
+        self.limited.clear()
+    
+    def ceilings(self) -> Dict[str, float]:
+        """Sustained ceiling in calls/second for every key throttled long enough to tell"""
+        ceilings = {}
+        for key, samples in self.samples.items():
+            if len(samples) >= MIN_CEILING_SECONDS:
+                ordered = sorted(samples)
+                ceilings[key] = float(ordered[len(ordered) // 2])
+        return ceilings
 
 class CircuitBreaker:
     """Simple circuit breaker to prevent overwhelming a failing node"""
@@ -106,170 +1714,491 @@ class CircuitBreaker:
         
         return False
 
+class AdaptiveLimit:
+    """A concurrency limit that adapts to latency and errors, after Netflix's concurrency-limits.
+    
+    aimd adds one permit per limit's worth of successful calls and cuts the
+    limit by BACKOFF on an error or on a call slower than the latency target.
+    gradient averages latency over short windows, compares each window with
+    the no-load latency (the lowest window seen) and shrinks the limit as
+    queueing raises latency above it, adding sqrt(limit) of headroom to keep
+    probing; errors cut it like aimd. (Gradient2's moving long-term average
+    would drift up with the limit over a run, so the answer would depend on
+    the run length.) Both cut at most once per round trip and only grow
+    while half the permits are in use.
+    """
+    
+    BACKOFF = 0.9
+    SMOOTHING = 0.2
+    TOLERANCE = 1.5  # Latency may reach this multiple of the no-load latency before the limit shrinks
+    WINDOW_SECONDS = 0.1
+    WINDOW_SAMPLES = 10
+    
+    def __init__(self, algorithm: str, initial: float, max_limit: float, latency_target: float):
+        self.algorithm = algorithm
+        self.max_limit = max_limit
+        self.limit = float(min(initial, max_limit))
+        self.latency_target = latency_target  # aimd only
+        self.in_flight = 0
+        self.backoffs = 0
+        self.window_start = time.perf_counter()
+        self.window_latency = 0.0
+        self.window_samples = 0
+        self.no_load_latency: Optional[float] = None
+        self.last_backoff = 0.0
+        self.history = deque(maxlen=LIMIT_HISTORY_SECONDS)
+        self.last_sample = time.perf_counter()
+    
+    def update(self, started: float, latency: float, dropped: bool):
+        """Adjust the limit for one completed request, sent at perf_counter time `started`"""
+        now = time.perf_counter()
+        if dropped or (self.algorithm == "aimd" and latency > self.latency_target):
+            # Requests sent before the last cut saw the old limit; don't cut again for them
+            if started >= self.last_backoff:
+                self.limit = max(1.0, self.limit * self.BACKOFF)
+                self.last_backoff = now
+                self.backoffs += 1
+        elif self.algorithm == "aimd":
+            if self.in_flight * 2 >= self.limit:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            self.window_latency += latency
+            self.window_samples += 1
+            if self.window_samples >= self.WINDOW_SAMPLES and now - self.window_start >= self.WINDOW_SECONDS:
+                self.end_window(now)
+        if now - self.last_sample >= 1.0:
+            self.history.append(self.limit)
+            self.last_sample = now
+    
+    def end_window(self, now: float):
+        """gradient: one limit update from the finished window's mean latency"""
+        latency = self.window_latency / self.window_samples
+        self.window_start, self.window_latency, self.window_samples = now, 0.0, 0
+        self.no_load_latency = min(latency, self.no_load_latency or latency)
+        if self.in_flight * 2 >= self.limit and latency > 0:
+            gradient = max(0.5, min(1.0, self.TOLERANCE * self.no_load_latency / latency))
+            target = self.limit * gradient + math.sqrt(self.limit)
+            self.limit = max(1.0, min(self.max_limit, self.limit * (1 - self.SMOOTHING) + target * self.SMOOTHING))
+    
+    def converged(self) -> float:
+        """Median limit over the later half of the samples, where the limit has settled"""
+        samples = sorted(list(self.history)[len(self.history) // 2:])
+        return samples[len(samples) // 2] if samples else self.limit
+
+class ConcurrencyLimiter:
+    """Adaptive concurrency limits for the node as a whole and per method, under --concurrent.
+    
+    A request needs a permit from both: the node-wide limit finds how many
+    requests the node serves at once, and a limit per call type (or "batch"
+    for batch requests) holds back methods that are expensive on their own,
+    like traces. Every completion updates both. Requests over either limit
+    wait in FIFO order per key. Freed permits go round-robin to the keys
+    with room under their own limit, so no call type starves another, and a
+    new request only skips the queue while nobody waits for a node-wide permit.
+    """
+    
+    def __init__(self, algorithm: str, max_concurrent: int, latency_target: float):
+        self.algorithm = algorithm
+        self.max_concurrent = max_concurrent
+        self.latency_target = latency_target
+        self.total = self.new_limit()
+        self.limits: Dict[str, AdaptiveLimit] = {}
+        self.waiters: "OrderedDict[str, deque]" = OrderedDict()  # Keys with queued requests, in turn order
+        self.released = asyncio.Event()  # Set whenever a permit is given back
+        # Requests that had to wait for their own method's limit rather than the node-wide one
+        self.throttled: Dict[str, int] = defaultdict(int)
+    
+    def new_limit(self) -> AdaptiveLimit:
+        return AdaptiveLimit(self.algorithm, INITIAL_CONCURRENCY_LIMIT, self.max_concurrent, self.latency_target)
+    
+    def _has_permit(self, limit: AdaptiveLimit) -> bool:
+        return limit.in_flight < limit.limit and self.total.in_flight < self.total.limit
+    
+    def _take(self, limit: AdaptiveLimit):
+        limit.in_flight += 1
+        self.total.in_flight += 1
+    
+    def _give_back(self, limit: AdaptiveLimit):
+        limit.in_flight -= 1
+        self.total.in_flight -= 1
+        self.released.set()
+        self._grant()
+    
+    def _waiting_on_total(self) -> bool:
+        """Whether a queued request has room under its own limit and only lacks a node-wide permit"""
+        return any(self.limits[key].in_flight < self.limits[key].limit for key in self.waiters)
+    
+    def try_acquire(self, key: str) -> Optional[AdaptiveLimit]:
+        """A permit for `key` if one is free without queueing, else None"""
+        limit = self.limits.get(key)
+        if limit is None:
+            limit = self.limits[key] = self.new_limit()
+        if key not in self.waiters and self._has_permit(limit) and not self._waiting_on_total():
+            self._take(limit)
+            return limit
+        if limit.in_flight >= limit.limit:
+            self.throttled[key] += 1
+        return None
+    
+    async def wait_released(self, timeout: float):
+        """Wait until a permit is given back, for at most `timeout` seconds"""
+        self.released.clear()
+        try:
+            await asyncio.wait_for(self.released.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def acquire(self, key: str) -> AdaptiveLimit:
+        """Wait for a permit for `key` and return its limit, to pass back to release()"""
+        limit = self.try_acquire(key)
+        if limit is not None:
+            return limit
+        limit = self.limits[key]
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(key, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as we were cancelled: give the permit back
+                self._give_back(limit)
+            elif waiter in self.waiters.get(key, ()):
+                self.waiters[key].remove(waiter)
+                if not self.waiters[key]:
+                    del self.waiters[key]
+            raise
+        return limit
+    
+    def release(self, limit: AdaptiveLimit, started: float, latency: float, dropped: bool):
+        self.total.update(started, latency, dropped)
+        limit.update(started, latency, dropped)
+        self._give_back(limit)
+    
+    def _grant(self):
+        """Hand free permits out one at a time, taking the waiting keys in turn"""
+        while self.total.in_flight < self.total.limit:
+            for key, waiters in list(self.waiters.items()):
+                while waiters and waiters[0].done():
+                    waiters.popleft()  # Cancelled, before its own cleanup ran
+                if not waiters:
+                    del self.waiters[key]
+                elif self.limits[key].in_flight < self.limits[key].limit:
+                    break
+            else:
+                return  # Every waiting key is at its own limit
+            self._take(self.limits[key])
+            waiters.popleft().set_result(None)
+            # The key that was just served goes to the back of the turn order
+            if waiters:
+                self.waiters.move_to_end(key)
+            else:
+                del self.waiters[key]
+
+class WebSocketRPCPool:
+    """Multiplexes JSON-RPC requests over a few persistent WebSocket connections.
+    
+    Requests are spread round-robin across connections and rewritten with a
+    pool-wide unique id; a reader task per connection routes each response
+    back to the waiting caller by that id, so many requests can be in flight
+    on one socket. eth_subscription notifications go to registered callbacks.
+    """
+    
+    def __init__(self, ws_url: str, connections: int = 4):
+        self.ws_url = ws_url
+        self.connection_count = connections
+        self.connections: List[aiohttp.ClientWebSocketResponse] = []
+        self.readers: List[asyncio.Task] = []
+        self.pending: Dict[int, Tuple[asyncio.Future, Any]] = {}
+        self.subscriptions: Dict[str, Callable[[Dict], None]] = {}
+        self.next_id = 0
+        self.next_connection = 0
+    
+    async def connect(self, session: aiohttp.ClientSession):
+        for _ in range(self.connection_count):
+            ws = await session.ws_connect(self.ws_url, max_msg_size=0, heartbeat=30)
+            self.connections.append(ws)
+            self.readers.append(asyncio.create_task(self._read(ws)))
+    
+    async def close(self):
+        for ws in self.connections:
+            await ws.close()
+        for reader in self.readers:
+            reader.cancel()
+        await asyncio.gather(*self.readers, return_exceptions=True)
+    
+    def _fail_pending(self, error: Exception):
+        for future, _ in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self.pending.clear()
+    
+    async def _read(self, ws: aiohttp.ClientWebSocketResponse):
+        async for message in ws:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                continue
+            data = json_loads(message.data)
+            
+            if isinstance(data, dict) and data.get("method") == "eth_subscription":
+                callback = self.subscriptions.get(data["params"]["subscription"])
+                if callback:
+                    callback(data["params"]["result"])
+                continue
+            
+            # Batches are routed by the id of their first element
+            first = data[0] if isinstance(data, list) and data else data
+            entry = self.pending.pop(first.get("id"), None) if isinstance(first, dict) else None
+            if entry is None:
+                continue
+            future, original_ids = entry
+            if isinstance(data, list):
+                for element in data:
+                    element["id"] = original_ids.get(element.get("id"), element.get("id"))
+            else:
+                data["id"] = original_ids
+            if not future.done():
+                future.set_result((message.data, data))
+        
+        # Connection went away: nothing in flight on it can complete
+        self._fail_pending(ConnectionError("WebSocket connection closed"))
+    
+    def _assign_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+    
+    async def request(self, payload, timeout: float = 10) -> Tuple[str, Any]:
+        """Send a JSON-RPC object or batch array; returns (raw text, parsed response)"""
+        if isinstance(payload, list):
+            original = payload
+            payload = [dict(element, id=self._assign_id()) for element in original]
+            original_ids = {element["id"]: source.get("id") for element, source in zip(payload, original)}
+            route_id = payload[0]["id"]
+        else:
+            original_ids = payload.get("id")
+            payload = dict(payload, id=self._assign_id())
+            route_id = payload["id"]
+        
+        future = asyncio.get_running_loop().create_future()
+        self.pending[route_id] = (future, original_ids)
+        ws = self.connections[self.next_connection % len(self.connections)]
+        self.next_connection += 1
+        try:
+            await ws.send_str(json.dumps(payload))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(route_id, None)
+    
+    async def subscribe(self, params: List, callback: Callable[[Dict], None]) -> str:
+        """eth_subscribe and deliver every notification to callback"""
+        _, response = await self.request({"jsonrpc": "2.0", "method": "eth_subscribe", "params": params, "id": 1})
+        if "error" in response:
+            raise RuntimeError(response["error"].get("message", "eth_subscribe failed"))
+        self.subscriptions[response["result"]] = callback
+        return response["result"]
+
+class ClientProfiler:
+    """cProfile or yappi capture of the tester's own code, saved in pstats format.
+    
+    yappi is coroutine-aware and counts CPU time only, so awaiting the node does
+    not show up as time spent in the awaiting function.
+    """
+    
+    def __init__(self, path: str, kind: str = "cprofile"):
+        self.path = path
+        self.kind = kind
+        self.profile: Optional[cProfile.Profile] = None
+    
+    def start(self):
+        if self.kind == "yappi":
+            yappi.set_clock_type("cpu")
+            yappi.start()
+        else:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+    
+    def stop(self):
+        if self.kind == "yappi":
+            yappi.stop()
+            yappi.get_func_stats().save(self.path, type="pstat")
+            yappi.clear_stats()
+        else:
+            self.profile.disable()
+            self.profile.dump_stats(self.path)
+    
+    @staticmethod
+    def print_top(path: str, limit: int = 15):
+        """Print the functions with the most own time from a saved profile"""
+        pstats.Stats(path, stream=sys.stdout).strip_dirs().sort_stats("tottime").print_stats(limit)
+
 class BerachainRPCTester:
     """Main RPC testing class"""
     
     def __init__(self, rpc_url: str, max_concurrent: int = 50, 
-                 test_archive: bool = False, archive_blocks: int = 3_000_000):
+                 test_archive: bool = False, archive_blocks: int = 3_000_000,
+                 rate: Optional[float] = None, hdr_precision: int = 3, batch_size: int = 1,
+                 transport: str = "http", ws_url: Optional[str] = None, ws_connections: int = 4,
+                 head_latency: bool = False, load_profile: Optional[LoadProfile] = None,
+                 timeseries_path: Optional[str] = None, timeseries_format: Optional[str] = None,
+                 interval: float = 1.0, stream_intervals: bool = False,
+                 metrics_port: Optional[int] = None, metrics_host: str = "127.0.0.1",
+                 workload: Optional[str] = None, network: str = "mainnet",
+                 depth_export_path: Optional[str] = None,
+                 block_distribution: Optional[BlockDistribution] = None, seed: Optional[int] = None,
+                 archive_head: Optional[int] = None, block_range: Optional[int] = None,
+                 trace_blocks: int = 50, trace_timeout: Optional[float] = None,
+                 client_profile_path: Optional[str] = None, client_profiler: str = "cprofile",
+                 trace_connections: bool = False, keepalive: bool = True,
+                 concurrency_limit: str = "fixed", latency_target: float = 0.5,
+                 honor_retry_after: bool = True, cache_hit_ratio: Optional[float] = None,
+                 soak_window: Optional[float] = None, checkpoint_path: Optional[str] = None,
+                 drift_threshold: float = 0.10, dashboard: bool = False):
         self.rpc_url = rpc_url
         self.max_concurrent = max_concurrent
         self.test_archive = test_archive
         self.archive_blocks = archive_blocks
-        self.stats = TestStats()
-        self.circuit_breaker = CircuitBreaker()
+        self.archive_head = archive_head  # Pins the head for archive ranges so block picks repeat
+        self.block_distribution = block_distribution or BlockDistribution()
+        # All call, historical and block choices come from this generator, so --seed makes them repeatable
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.rate = rate  # Calls/second for open-loop mode, None for closed-loop
+        if load_profile is None and rate:
+            load_profile = LoadProfile(rate=rate)
+        self.load_profile = load_profile  # Drives the open-loop schedule
+        self.duration: Optional[int] = None
+        self.batch_size = batch_size  # Calls packed into each JSON-RPC batch POST
+        self.transport = transport  # "http" or "ws"
+        self.ws_url = ws_url or derive_ws_url(rpc_url)
+        self.ws_connections = ws_connections
+        self.ws_pool: Optional[WebSocketRPCPool] = None
+        self.head_latency = head_latency
+        self.last_head: Optional[int] = None
+        self.timeseries_path = timeseries_path
+        self.timeseries_format = timeseries_format
+        self.interval = interval  # Seconds per time-series interval
+        self.stream_intervals = stream_intervals  # Worker: send intervals to the parent instead
+        self.in_flight = 0
+        self.current_rate: Optional[float] = rate  # Offered rate right now (follows the load profile)
+        self.metrics_port = metrics_port
+        self.metrics_host = metrics_host
+        self.depth_export_path = depth_export_path
+        # Extension points: called with every RPCResult, and with every finished interval snapshot
+        self.result_listeners: List[Callable[[RPCResult], None]] = []
+        self.interval_sinks: List[Callable[[Dict], None]] = []
+        self.interval_recorder: Optional[IntervalRecorder] = None  # Current interval, while intervals are recorded
+        self.client_profile_path = client_profile_path
+        self.client_profiler = client_profiler
+        self.trace_connections = trace_connections or not keepalive  # Phases are what --no-keepalive is for
+        self.keepalive = keepalive
+        self.hdr_precision = hdr_precision
+        self.stats = TestStats(target_rate=rate, hdr_precision=hdr_precision)
+        self.concurrency_limit = concurrency_limit  # "fixed" semaphore, or an adaptive algorithm
+        self.limiter: Optional[ConcurrencyLimiter] = None
+        if concurrency_limit != "fixed":
+            self.limiter = ConcurrencyLimiter(concurrency_limit, max_concurrent, latency_target)
+        # Rate limiting: after a 429 or limit error, sends pause until a point drawn per waiting call from
+        # backoff_until's (start, spread) window in perf_counter time, keyed by JSON-RPC method for limit
+        # errors and None for the whole endpoint (HTTP 429). Backoff jitter has its own generator so that
+        # --seed still fixes the call sequence
+        self.honor_retry_after = honor_retry_after
+        self.backoff_until: Dict[Optional[str], Tuple[float, float]] = {}
+        self.backoff_waiters = 0  # Calls currently sleeping out a pause
+        self.rate_limit_streaks: Dict[Optional[str], int] = defaultdict(int)  # Backoff episodes in a row
+        self.backoff_rng = random.Random()
+        self.rate_limits: Optional[RateLimitTracker] = None  # Started by the first rate-limited call
+        # The adaptive limiter backs off on errors itself, so its breaker never opens
+        self.circuit_breaker = CircuitBreaker(failure_threshold=0.5 if self.limiter is None else 1.0)
         self.current_block = None
         self.min_archive_block = None
+        self.client_version: Optional[str] = None  # web3_clientVersion of the node under test
         
-        # Berachain mainnet contract addresses and function calls
-        self.rpc_calls = [
-            # BGT Token calls
-            RPCCallConfig(
-                name="bgt_totalSupply",
-                to="0x656b95E550C07a9ffe548bd4085c72418Ceb1dba",
-                data="0x18160ddd",  # totalSupply()
-                description="BGT total supply"
-            ),
-            RPCCallConfig(
-                name="bgt_balanceOf_zero",
-                to="0x656b95E550C07a9ffe548bd4085c72418Ceb1dba",
-                data="0x70a082310000000000000000000000000000000000000000000000000000000000000000",  # balanceOf(0x0)
-                description="BGT balance of zero address"
-            ),
-            RPCCallConfig(
-                name="bgt_balanceOf_validator1",
-                to="0x656b95E550C07a9ffe548bd4085c72418Ceb1dba",
-                data="0x70a082310000000000000000000000004f4a5c2194b8e856b7a05b348f6ba3978fb6f6d5",  # balanceOf(governance)
-                description="BGT balance of governance address"
-            ),
-            RPCCallConfig(
-                name="bgt_balanceOf_validator2", 
-                to="0x656b95E550C07a9ffe548bd4085c72418Ceb1dba",
-                data="0x70a08231000000000000000000000000df960e8f3f19c481dde769ededd439ea1a63426a",  # balanceOf(berachef)
-                description="BGT balance of BeraChef address"
-            ),
-            RPCCallConfig(
-                name="bgt_minter",
-                to="0x656b95E550C07a9ffe548bd4085c72418Ceb1dba",
-                data="0x07546172",  # minter()
-                description="BGT minter address"
-            ),
-            
-            # HONEY Token calls
-            RPCCallConfig(
-                name="honey_totalSupply",
-                to="0xFCBD14DC51f0A4d49d5E53C2E0950e0bC26d0Dce",
-                data="0x18160ddd",  # totalSupply()
-                description="HONEY total supply"
-            ),
-            RPCCallConfig(
-                name="honey_name",
-                to="0xFCBD14DC51f0A4d49d5E53C2E0950e0bC26d0Dce",
-                data="0x06fdde03",  # name()
-                description="HONEY token name"
-            ),
-            RPCCallConfig(
-                name="honey_symbol",
-                to="0xFCBD14DC51f0A4d49d5E53C2E0950e0bC26d0Dce",
-                data="0x95d89b41",  # symbol()
-                description="HONEY token symbol"
-            ),
-            
-            # WBERA Token calls
-            RPCCallConfig(
-                name="wbera_totalSupply",
-                to="0x6969696969696969696969696969696969696969",
-                data="0x18160ddd",  # totalSupply()
-                description="WBERA total supply"
-            ),
-            RPCCallConfig(
-                name="wbera_name",
-                to="0x6969696969696969696969696969696969696969",
-                data="0x06fdde03",  # name()
-                description="WBERA token name"
-            ),
-            
-            # More BGT balance checks for various accounts
-            RPCCallConfig(
-                name="bgt_balanceOf_vault",
-                to="0x656b95E550C07a9ffe548bd4085c72418Ceb1dba",
-                data="0x70a082310000000000000000000000004be03f781c497a489e3cb0287833452ca9b9e80b",  # balanceOf(vault)
-                description="BGT balance of BEX Vault"
-            ),
-            RPCCallConfig(
-                name="bgt_balanceOf_honey",
-                to="0x656b95E550C07a9ffe548bd4085c72418Ceb1dba", 
-                data="0x70a08231000000000000000000000000fcbd14dc51f0a4d49d5e53c2e0950e0bc26d0dce",  # balanceOf(honey)
-                description="BGT balance of HONEY contract"
-            ),
-            RPCCallConfig(
-                name="bgt_balanceOf_wbera",
-                to="0x656b95E550C07a9ffe548bd4085c72418Ceb1dba",
-                data="0x70a082310000000000000000000000006969696969696969696969696969696969696969",  # balanceOf(wbera)
-                description="BGT balance of WBERA contract"
-            ),
-            
-            # BEX Vault calls
-            RPCCallConfig(
-                name="vault_getAuthorizer",
-                to="0x4Be03f781C497A489E3cB0287833452cA9b9E80B",
-                data="0xaaabadc5",  # getAuthorizer()
-                description="BEX Vault authorizer"
-            ),
-            RPCCallConfig(
-                name="vault_getProtocolFeesCollector",
-                to="0x4Be03f781C497A489E3cB0287833452cA9b9E80B",
-                data="0xd2946c2b",  # getProtocolFeesCollector()
-                description="BEX Vault protocol fees collector"
-            ),
-            
-            # Governance calls
-            RPCCallConfig(
-                name="gov_votingDelay",
-                to="0x4f4A5c2194B8e856b7a05B348F6ba3978FB6f6D5",
-                data="0x3932abb1",  # votingDelay()
-                description="Governance voting delay"
-            ),
-            RPCCallConfig(
-                name="gov_votingPeriod",
-                to="0x4f4A5c2194B8e856b7a05B348F6ba3978FB6f6D5",
-                data="0x02a251a3",  # votingPeriod()
-                description="Governance voting period"
-            ),
-            
-            # Additional working contract calls
-            RPCCallConfig(
-                name="honey_decimals",
-                to="0xFCBD14DC51f0A4d49d5E53C2E0950e0bC26d0Dce",
-                data="0x313ce567",  # decimals()
-                description="HONEY token decimals"
-            ),
-            RPCCallConfig(
-                name="wbera_decimals",
-                to="0x6969696969696969696969696969696969696969",
-                data="0x313ce567",  # decimals()
-                description="WBERA token decimals"
-            ),
-            
-            # Standard ETH calls
-            RPCCallConfig(
-                name="eth_blockNumber",
-                method="eth_blockNumber",
-                description="Latest block number",
-                supports_historical=False
-            ),
-            RPCCallConfig(
-                name="eth_gasPrice",
-                method="eth_gasPrice",
-                description="Current gas price",
-                supports_historical=False
-            ),
-            RPCCallConfig(
-                name="net_version",
-                method="net_version",
-                description="Network version",
-                supports_historical=False
-            ),
-        ]
+        # Call mix from the workload file (mainnet/bepolia contract calls by default)
+        self.network = network
+        self.workload = load_workload(workload or DEFAULT_WORKLOAD, network)
+        self.rpc_calls = self.workload["calls"]
+        if block_range:
+            # --logs-sweep: every range call scans this many blocks
+            self.rpc_calls = [replace(call, block_range=block_range) if call.block_range else call
+                              for call in self.rpc_calls]
+        if trace_timeout:
+            self.rpc_calls = [replace(call, timeout=trace_timeout) if call.method.startswith(TRACE_METHOD_PREFIXES)
+                              else call for call in self.rpc_calls]
+        # Transactions to trace, sampled from recent blocks when the workload uses ${tx_hash}/${tx_block}
+        self.trace_blocks = trace_blocks
+        self.tx_samples: List[Tuple[str, int]] = []
+        self.needs_tx_samples = any("${tx_" in json.dumps(call.params) for call in self.rpc_calls)
+        self.call_sampler = AliasSampler([call.weight for call in self.rpc_calls])
+        self.call_methods = {call.name: call.method for call in self.rpc_calls}
+        self.payload_templates = {call.name: PayloadTemplate(self.payload_skeleton(call)) for call in self.rpc_calls}
+        # --cache-hit-ratio: each eth_call also has a cache-busting variant, sent for the other 1 - ratio
+        # of its calls, with a random sender and, for balanceOf-style calls, an address from cache_addresses
+        self.cache_hit_ratio = cache_hit_ratio
+        self.cache_variants: Dict[str, RPCCallConfig] = {}
+        if cache_hit_ratio is not None:
+            self.cache_variants = {call.name: replace(call, cache_bust=True) for call in self.rpc_calls
+                                   if self.cache_bustable(call)}
+        self.cache_templates = {name: PayloadTemplate(self.payload_skeleton(call))
+                                for name, call in self.cache_variants.items()}
+        self.cache_addresses: List[bytes] = []  # 32-byte ABI words, sampled from recent blocks
+        # --soak: rolling windows, checkpoints and drift detection, fed by the (merged) intervals
+        self.soak: Optional[SoakMonitor] = None
+        if soak_window:
+            self.soak = SoakMonitor(self, soak_window, checkpoint_path, drift_threshold)
+            self.interval_sinks.append(self.soak.add_interval)
+        # --dashboard: live terminal view, also fed by the (merged) intervals
+        self.dashboard: Optional[Dashboard] = None
+        if dashboard:
+            self.dashboard = Dashboard(self)
+            self.interval_sinks.append(self.dashboard.add_interval)
+        # --compare only: request -> (call name, result digest) for results pinned to a block or transaction
+        self.response_digests: Optional[Dict[str, Tuple[str, str]]] = None
+    
+    async def post_payload(self, session: aiohttp.ClientSession, payload,
+                           timeout: float = 10, need_result: bool = True,
+                           response_info: Optional[Dict] = None, due: Optional[float] = None) -> Tuple[int, Any, int, float]:
+        """Send a JSON-RPC payload (object, batch array or encoded bytes) over the configured transport.
+        
+        Returns (HTTP status, parsed response, response size, latency). Over HTTP
+        the latency stops when response headers arrive; over WebSocket, when the
+        reply frame does. See parse_response for need_result. Raises
+        RateLimitedError on HTTP 429. A response_info dict gets the proxy's
+        "cache" status from the HTTP response headers. For workload requests,
+        `due` is when the request was due (perf_counter time), and the delay
+        from there to this send is recorded as task-to-send delay.
+        """
+        if due is not None:
+            self.stats.dispatch_delays.record(time.perf_counter() - due)
+        start_time = time.time()
+        if self.ws_pool is not None:
+            if isinstance(payload, bytes):
+                payload = json_loads(payload)
+            response_text, response_data = await self.ws_pool.request(payload, timeout)
+            return 200, response_data, len(response_text), time.time() - start_time
+        
+        marks = {} if self.trace_connections else None
+        async with session.post(
+            self.rpc_url,
+            data=payload if isinstance(payload, bytes) else json.dumps(payload).encode(),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            trace_request_ctx=marks
+        ) as response:
+            latency = time.time() - start_time
+            body = await response.read()
+            if marks is not None and "headers" in marks:
+                self.record_connection_phases(connection_phases(marks, time.perf_counter()))
+            if response_info is not None:
+                response_info["cache"] = cache_status(response.headers)
+            if response.status == 429:
+                raise RateLimitedError(retry_after_seconds(response.headers.get("Retry-After")))
+            return response.status, parse_response(body, need_result), len(body), latency
+    
+    def record_connection_phases(self, phases: Dict[str, float]):
+        self.stats.traced_requests += 1
+        if "connect" in phases:
+            self.stats.new_connections += 1
+        for name, duration in phases.items():
+            if name not in self.stats.connection_phases:
+                self.stats.connection_phases[name] = self.stats.new_histogram()
+            self.stats.connection_phases[name].record(duration)
     
     async def get_current_block(self, session: aiohttp.ClientSession) -> Optional[int]:
         """Get the current block number"""
@@ -281,25 +2210,192 @@ class BerachainRPCTester:
                 "id": 1
             }
             
-            async with session.post(self.rpc_url, json=payload, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if "result" in data:
-                        return int(data["result"], 16)
+            status, data, _, _ = await self.post_payload(session, payload, timeout=5)
+            if status == 200:
+                if "result" in data:
+                    return int(data["result"], 16)
         except Exception as e:
             logger.warning(f"Failed to get current block: {e}")
         
         return None
     
+    async def recent_blocks(self, session: aiohttp.ClientSession, blocks: int,
+                            full_transactions: bool = False) -> List[Dict]:
+        """The most recent `blocks` blocks that could be fetched, newest first"""
+        head = self.archive_head or self.current_block or await self.get_current_block(session)
+        if head is None:
+            return []
+        
+        async def fetch(number: int) -> Optional[Dict]:
+            payload = {"jsonrpc": "2.0", "method": "eth_getBlockByNumber",
+                       "params": [f"0x{number:x}", full_transactions], "id": 1}
+            try:
+                status, data, _, _ = await self.post_payload(session, payload, timeout=10)
+            except Exception as e:
+                logger.debug(f"Failed to fetch block {number}: {e}")
+                return None
+            return data.get("result") if status == 200 and isinstance(data, dict) else None
+        
+        numbers = list(range(head, max(0, head - blocks), -1))
+        found = []
+        for i in range(0, len(numbers), 10):
+            found.extend(block for block in await asyncio.gather(*(fetch(number) for number in numbers[i:i + 10]))
+                         if block)
+        return found
+    
+    async def sample_transactions(self, session: aiohttp.ClientSession, blocks: int) -> List[Tuple[str, int]]:
+        """(hash, block number) of every transaction in the most recent `blocks` blocks"""
+        return [(tx_hash, int(block["number"], 16))
+                for block in await self.recent_blocks(session, blocks)
+                for tx_hash in block.get("transactions", [])]
+    
+    async def sample_addresses(self, session: aiohttp.ClientSession, blocks: int) -> List[str]:
+        """Distinct senders and recipients of transactions in the most recent `blocks` blocks"""
+        addresses = set()
+        for block in await self.recent_blocks(session, blocks, full_transactions=True):
+            for tx in block.get("transactions", []):
+                if isinstance(tx, dict):
+                    addresses.update(address.lower() for address in (tx.get("from"), tx.get("to")) if address)
+        addresses = sorted(addresses)
+        return addresses if len(addresses) <= CACHE_ADDRESS_SET else self.rng.sample(addresses, CACHE_ADDRESS_SET)
+    
+    def record_response(self, call_name: str, payload: Dict, response_data: Dict):
+        """Keep a digest of a result every in-sync node must return identically"""
+        if not payload["params"] or len(self.response_digests) >= MAX_RESPONSE_DIGESTS:
+            return
+        key = json.dumps([payload["method"], payload["params"]], sort_keys=True)
+        if key in self.response_digests or any(tag in key for tag in MOVING_BLOCK_TAGS):
+            return
+        result = json.dumps(response_data.get("result"), sort_keys=True)
+        self.response_digests[key] = (call_name, hashlib.sha256(result.encode()).hexdigest()[:16])
+    
+    async def fetch_client_version(self, session: aiohttp.ClientSession) -> Optional[str]:
+        """The node's web3_clientVersion, e.g. reth/v1.3.12-..., or None if it doesn't say"""
+        try:
+            payload = {"jsonrpc": "2.0", "method": "web3_clientVersion", "params": [], "id": 1}
+            status, data, _, _ = await self.post_payload(session, payload, timeout=5)
+            if status == 200 and isinstance(data.get("result"), str):
+                return data["result"]
+        except Exception as e:
+            logger.debug(f"Failed to fetch client version: {e}")
+        return None
+    
+    async def check_chain_id(self, session: aiohttp.ClientSession):
+        """Warn when the endpoint is not on the workload's network"""
+        expected = self.workload["chain_id"]
+        if expected is None:
+            return
+        try:
+            payload = {"jsonrpc": "2.0", "method": "eth_chainId", "params": [], "id": 1}
+            status, data, _, _ = await self.post_payload(session, payload, timeout=5)
+            if status == 200 and "result" in data and int(data["result"], 16) != expected:
+                logger.warning(f"{self.rpc_url} chain ID {int(data['result'], 16)} does not match "
+                               f"{self.network} ({expected}); workload addresses may not exist there")
+        except Exception as e:
+            logger.warning(f"Failed to check chain ID: {e}")
+    
     def get_random_historical_block(self) -> Optional[int]:
         """Get a random historical block number for archive testing"""
         if self.min_archive_block is None or self.current_block is None:
             return None
         
-        return random.randint(self.min_archive_block, self.current_block - 100)
+        return self.block_distribution.sample(self.rng)
+    
+    def next_call(self) -> Tuple[RPCCallConfig, Optional[int]]:
+        """Pick the next call by workload weight and, in archive mode, maybe a historical block"""
+        call_config = self.rpc_calls[self.call_sampler.sample(self.rng)]
+        if call_config.name in self.cache_variants and self.rng.random() >= self.cache_hit_ratio:
+            call_config = self.cache_variants[call_config.name]
+        
+        # Determine if this should be a historical call
+        block_num = None
+        if (self.test_archive and call_config.supports_historical and 
+            self.rng.random() < 0.3):  # 30% chance for historical call
+            block_num = self.get_random_historical_block()
+        
+        return call_config, block_num
+    
+    def next_request(self) -> List[Tuple[RPCCallConfig, Optional[int]]]:
+        """Calls for the next HTTP request: one, or batch_size in batch mode"""
+        return [self.next_call() for _ in range(self.batch_size)]
+    
+    @staticmethod
+    def cache_bustable(call_config: RPCCallConfig) -> bool:
+        """Whether --cache-hit-ratio can vary the call: eth_calls, through their call object"""
+        if call_config.method != "eth_call":
+            return False
+        return call_config.params is None or bool(call_config.params) and isinstance(call_config.params[0], dict)
+    
+    @staticmethod
+    def payload_skeleton(call_config: RPCCallConfig) -> Dict:
+        """The call's JSON-RPC request with placeholders for the block tag, id and other per-request values"""
+        if call_config.method == "eth_call" and call_config.params is None:
+            params = [{"to": call_config.to, "data": call_config.data}, "${block}"]
+        else:
+            params = call_config.params or []
+        if call_config.cache_bust:
+            # A random sender makes every request unique without changing a view call's result
+            call_object = dict(params[0], **{"from": "${from}"})
+            if call_config.params is None and ADDRESS_ARGUMENT_PATTERN.fullmatch(call_config.data):
+                call_object["data"] = "${data}"
+            params = [call_object] + params[1:]
+        return {"jsonrpc": "2.0", "method": call_config.method, "params": params, "id": "${id}"}
+    
+    def encode_payload(self, call_config: RPCCallConfig, block_number: Optional[int] = None,
+                       request_id: int = 1) -> bytes:
+        """Encoded JSON-RPC request for a call: its template with this request's values filled in"""
+        template = (self.cache_templates if call_config.cache_bust else self.payload_templates)[call_config.name]
+        # Use specific block number for historical calls, otherwise "latest"
+        block_param = b"0x%x" % block_number if block_number is not None else b"latest"
+        values = {"id": b"%d" % request_id}
+        if call_config.block_range:
+            # Range window ends at the historical block, or at the head seen at test start
+            end = block_number if block_number is not None else self.current_block
+            block_param = b"0x%x" % end
+            values["from_block"] = b'"0x%x"' % max(0, end - call_config.block_range + 1)
+        values["block"] = b'"' + block_param + b'"'
+        if "tx_hash" in template.names or "tx_block" in template.names:
+            tx_hash, tx_block = self.rng.choice(self.tx_samples)
+            values["tx_hash"] = b'"' + tx_hash.encode() + b'"'
+            values["tx_block"] = b'"0x%x"' % tx_block
+        if call_config.cache_bust:
+            values["from"] = b'"0x%040x"' % self.rng.getrandbits(160)
+            if "data" in template.names:
+                # Same function, argument from the sampled address set (random when none were sampled)
+                word = (self.rng.choice(self.cache_addresses) if self.cache_addresses
+                        else b"%064x" % self.rng.getrandbits(160))
+                values["data"] = b'"' + call_config.data[:10].encode() + word + b'"'
+        return template.render(values)
+    
+    async def send_request(self, session: aiohttp.ClientSession,
+                           calls: List[Tuple[RPCCallConfig, Optional[int]]],
+                           due: Optional[float] = None) -> List[RPCResult]:
+        """Send one HTTP request carrying the given calls and return one result per call.
+        
+        `due` (perf_counter time) is when the request was created or scheduled,
+        moved on by any time it spent waiting for the node: a rate-limit pause
+        or a free slot. See post_payload.
+        """
+        self.in_flight += 1
+        try:
+            if len(calls) == 1:
+                call_config, block_num = calls[0]
+                return [await self.make_rpc_call(session, call_config, block_num, due)]
+            results = await self.make_batch_rpc_call(session, calls, due)
+        finally:
+            self.in_flight -= 1
+        
+        if any(result.success for result in results):
+            self.stats.batches_sent += 1
+            self.stats.batch_latencies.record(results[0].latency)
+        return results
+    
+    def cache_busted(self, call_config: RPCCallConfig) -> Optional[bool]:
+        """RPCResult.cache_busted for a call: whether it went out as its cache-busting variant"""
+        return call_config.cache_bust if call_config.name in self.cache_variants else None
     
     async def make_rpc_call(self, session: aiohttp.ClientSession, call_config: RPCCallConfig, 
-                           block_number: Optional[int] = None) -> RPCResult:
+                           block_number: Optional[int] = None, due: Optional[float] = None) -> RPCResult:
         """Make a single RPC call"""
         if not self.circuit_breaker.can_call():
             return RPCResult(
@@ -313,60 +2409,56 @@ class BerachainRPCTester:
         start_time = time.time()
         
         try:
-            if call_config.method == "eth_call":
-                # Use specific block number for historical calls, otherwise "latest"
-                block_param = f"0x{block_number:x}" if block_number is not None else "latest"
-                
-                payload = {
-                    "jsonrpc": "2.0",
-                    "method": "eth_call",
-                    "params": [
-                        {
-                            "to": call_config.to,
-                            "data": call_config.data
-                        },
-                        block_param
-                    ],
-                    "id": 1
-                }
-            else:
-                payload = {
-                    "jsonrpc": "2.0",
-                    "method": call_config.method,
-                    "params": [],
-                    "id": 1
-                }
+            payload = self.encode_payload(call_config, block_number)
+            response_info = {} if self.cache_hit_ratio is not None else None
             
-            async with session.post(
-                self.rpc_url,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                latency = time.time() - start_time
-                response_text = await response.text()
-                response_data = json.loads(response_text)
-                
-                if response.status == 200 and "error" not in response_data:
-                    result = RPCResult(
-                        success=True,
-                        latency=latency,
-                        call_name=call_config.name,
-                        response_size=len(response_text),
-                        block_number=block_number
-                    )
-                    self.circuit_breaker.record_call(True)
-                    return result
+            # Successful results are only parsed when --compare needs them
+            status, response_data, response_size, latency = await self.post_payload(
+                session, payload, timeout=call_config.timeout or 10,
+                need_result=self.response_digests is not None, response_info=response_info, due=due)
+            
+            if status == 200 and "error" not in response_data:
+                result = RPCResult(
+                    success=True,
+                    latency=latency,
+                    call_name=call_config.name,
+                    response_size=response_size,
+                    block_number=block_number,
+                    cache_busted=self.cache_busted(call_config),
+                    cache_status=response_info.get("cache") if response_info is not None else None
+                )
+                if self.response_digests is not None:
+                    self.record_response(call_config.name, json_loads(payload), response_data)
+                self.circuit_breaker.record_call(True)
+                return result
+            else:
+                error = response_data.get("error", {})
+                result = RPCResult(
+                    success=False,
+                    latency=latency,
+                    call_name=call_config.name,
+                    error=error.get("message", f"HTTP {status}"),
+                    block_number=block_number,
+                    rate_limited=is_rate_limit_error(error)
+                )
+                if result.rate_limited:
+                    result.limited_method = call_config.method
+                    self.on_rate_limited(None, call_config.method)
                 else:
-                    error_msg = response_data.get("error", {}).get("message", f"HTTP {response.status}")
-                    result = RPCResult(
-                        success=False,
-                        latency=latency,
-                        call_name=call_config.name,
-                        error=error_msg,
-                        block_number=block_number
-                    )
                     self.circuit_breaker.record_call(False)
-                    return result
+                return result
+        
+        except RateLimitedError as e:
+            # Capped, not broken: back off, but keep it out of the circuit breaker
+            self.on_rate_limited(e.retry_after)
+            return RPCResult(
+                success=False,
+                latency=time.time() - start_time,
+                call_name=call_config.name,
+                error="HTTP 429",
+                block_number=block_number,
+                rate_limited=True
+            )
         
         except asyncio.TimeoutError:
             latency = time.time() - start_time
@@ -392,40 +2484,254 @@ class BerachainRPCTester:
             self.circuit_breaker.record_call(False)
             return result
     
+    async def make_batch_rpc_call(self, session: aiohttp.ClientSession,
+                                  calls: List[Tuple[RPCCallConfig, Optional[int]]],
+                                  due: Optional[float] = None) -> List[RPCResult]:
+        """Send several calls as one JSON-RPC batch array and attribute each response element.
+        
+        Every element shares the latency of the whole POST. Elements are matched
+        to calls by id, since servers may return them in any order.
+        """
+        def fail_all(latency: float, error: str, rate_limited: bool = False) -> List[RPCResult]:
+            if not rate_limited:
+                for _ in calls:
+                    self.circuit_breaker.record_call(False)
+            return [
+                RPCResult(success=False, latency=latency, call_name=call_config.name,
+                          error=error, block_number=block_number, rate_limited=rate_limited)
+                for call_config, block_number in calls
+            ]
+        
+        if not self.circuit_breaker.can_call():
+            return fail_all(0.0, "Circuit breaker open")
+        
+        payload = b"[" + b",".join(
+            self.encode_payload(call_config, block_number, request_id)
+            for request_id, (call_config, block_number) in enumerate(calls)
+        ) + b"]"
+        start_time = time.time()
+        
+        try:
+            status, response_data, response_size, latency = await self.post_payload(
+                session, payload, timeout=max(call_config.timeout or 10 for call_config, _ in calls), due=due)
+        except RateLimitedError as e:
+            self.on_rate_limited(e.retry_after)
+            return fail_all(time.time() - start_time, "HTTP 429", rate_limited=True)
+        except asyncio.TimeoutError:
+            return fail_all(time.time() - start_time, "Timeout")
+        except Exception as e:
+            return fail_all(time.time() - start_time, str(e))
+        
+        if status != 200 or not isinstance(response_data, list):
+            # Whole-batch rejection, e.g. batch too large or batching unsupported
+            error = response_data.get("error", {}) if isinstance(response_data, dict) else {}
+            if is_rate_limit_error(error):
+                self.on_rate_limited(None)
+                return fail_all(latency, error.get("message"), rate_limited=True)
+            return fail_all(latency, error.get("message", f"HTTP {status}"))
+        
+        elements = {element.get("id"): element for element in response_data if isinstance(element, dict)}
+        element_size = response_size // len(calls)
+        results = []
+        for request_id, (call_config, block_number) in enumerate(calls):
+            element = elements.get(request_id)
+            rate_limited = False
+            if element is None:
+                error = "Missing batch response"
+            elif "error" in element:
+                error = element["error"].get("message", "Unknown")
+                rate_limited = is_rate_limit_error(element["error"])
+            else:
+                error = None
+            if not rate_limited:
+                self.circuit_breaker.record_call(error is None)
+            results.append(RPCResult(
+                success=error is None,
+                latency=latency,
+                call_name=call_config.name,
+                error=error,
+                response_size=element_size if error is None else 0,
+                block_number=block_number,
+                rate_limited=rate_limited,
+                limited_method=call_config.method if rate_limited else None,
+                cache_busted=self.cache_busted(call_config)
+            ))
+        for method in {result.limited_method for result in results if result.rate_limited}:
+            self.on_rate_limited(None, method)
+        return results
+    
+    def on_rate_limited(self, retry_after: Optional[float], key: Optional[str] = None):
+        """Pause new sends: for Retry-After plus up to 20% jitter, else exponential backoff with full jitter.
+        
+        HTTP 429s and whole-batch rejections (key None) pause the endpoint;
+        a JSON-RPC limit error pauses only its method. Concurrent rate-limited
+        calls extend one shared pause rather than stacking, and the backoff
+        only doubles for a limit hit after the previous pause ended. The
+        jitter is a window rather than one instant: each waiting call draws
+        its own point in it, so the endpoint sees the backlog spread out
+        instead of all at once. With --ignore-retry-after nothing pauses, so
+        the endpoint stays saturated and the ceiling is measured under
+        constant pressure.
+        """
+        now = time.perf_counter()
+        start, spread = self.backoff_until.get(key, (0.0, 0.0))
+        paused_until = start + spread
+        if now >= paused_until:
+            self.rate_limit_streaks[key] += 1
+        if retry_after is not None:
+            self.stats.max_retry_after = max(self.stats.max_retry_after, retry_after)
+        if not self.honor_retry_after:
+            return
+        if retry_after is not None:
+            retry_after = min(retry_after, MAX_RETRY_AFTER)
+            window = (now + retry_after, retry_after * RETRY_AFTER_JITTER)
+        else:
+            streak = self.rate_limit_streaks[key]
+            window = (now, min(RATE_LIMIT_MAX_BACKOFF, RATE_LIMIT_BASE_BACKOFF * 2 ** min(streak - 1, 10)))
+        until = window[0] + window[1]
+        if until > paused_until:
+            # The mean pause a call sees, counted once however many calls wait it out
+            self.stats.backoff_time += max(0.0, window[0] + window[1] / 2 - max(paused_until, now))
+            self.backoff_until[key] = window
+    
+    def backoff_delay(self, calls: List[Tuple[RPCCallConfig, Optional[int]]] = (),
+                      jitter: Optional[float] = None) -> float:
+        """Seconds until neither the endpoint nor any of these calls' methods is paused for this caller.
+        
+        `jitter` (0 to 1) places the caller in each pause's jitter window; a
+        waiter draws it once and keeps it, so a recheck doesn't push it later.
+        Without one a fresh draw is made, which lets a fraction of the calls
+        through as a window passes.
+        """
+        if jitter is None:
+            jitter = self.backoff_rng.random()
+        until = 0.0
+        for key in [None] + [call_config.method for call_config, _ in calls]:
+            if key in self.backoff_until:
+                start, spread = self.backoff_until[key]
+                until = max(until, start + jitter * spread)
+        return until - time.perf_counter()
+    
+    async def wait_for_backoff(self, calls: List[Tuple[RPCCallConfig, Optional[int]]], deadline: float,
+                               max_waiters: Optional[int] = None) -> bool:
+        """Sleep out any pause covering these calls; False if it lasts until `deadline` (perf_counter time).
+        
+        Pauses can be extended while sleeping, so the check is repeated. Calls
+        whose pause outlasts the test are not sent at all, and with
+        `max_waiters` neither is a call that would join that many others
+        already waiting: it is shed rather than added to the burst.
+        """
+        jitter = self.backoff_rng.random()
+        delay = self.backoff_delay(calls, jitter)
+        if delay <= 0:
+            return True
+        if max_waiters is not None and self.backoff_waiters >= max_waiters:
+            self.stats.backoff_shed += 1
+            return False
+        self.backoff_waiters += 1
+        try:
+            while delay > 0:
+                if time.perf_counter() + delay >= deadline:
+                    return False
+                await asyncio.sleep(delay)
+                delay = self.backoff_delay(calls, jitter)
+            return True
+        finally:
+            self.backoff_waiters -= 1
+    
+    @staticmethod
+    def limit_key(calls: List[Tuple[RPCCallConfig, Optional[int]]]) -> str:
+        """Adaptive limit a request counts against: its call type, or "batch" for batch requests"""
+        return calls[0][0].name if len(calls) == 1 else "batch"
+    
+    async def send_limited(self, session: aiohttp.ClientSession, calls: List[Tuple[RPCCallConfig, Optional[int]]],
+                           limit: AdaptiveLimit, due: Optional[float] = None) -> List[RPCResult]:
+        """send_request under a permit already acquired from the limiter, then feed the outcome back.
+        
+        Any failed call counts as a drop: errors are lost goodput whether the
+        node timed out, rate limited or failed under load.
+        """
+        started = time.perf_counter()
+        try:
+            results = await self.send_request(session, calls, due)
+        except BaseException:
+            self.limiter.release(limit, started, time.perf_counter() - started, True)
+            raise
+        self.limiter.release(limit, started, results[0].latency, not all(result.success for result in results))
+        return results
+    
+    async def run_adaptive_loop(self, session: aiohttp.ClientSession, duration: int):
+        """Closed loop under the adaptive limiter: each call goes out as soon as it gets a permit.
+        
+        Unlike the waves of run_test_batch, nothing waits for the slowest call
+        of a wave, so in-flight requests track the limits as they move. A call
+        type at its own limit (or paused by a rate limit) doesn't hold up the
+        rest: another call is drawn, so the node-wide permits go to the call
+        types that can use them.
+        """
+        end_time = time.perf_counter() + duration
+        in_flight = set()
+        
+        async def limited_call(calls, limit, created):
+            for result in await self.send_limited(session, calls, limit, created):
+                self.update_stats(result)
+        
+        skipped = 0
+        while time.perf_counter() < end_time:
+            if not await self.wait_for_backoff([], end_time):
+                break
+            total = self.limiter.total
+            if total.in_flight >= total.limit:
+                await self.limiter.wait_released(end_time - time.perf_counter())
+                continue
+            calls = self.next_request()
+            limit = self.limiter.try_acquire(self.limit_key(calls)) if self.backoff_delay(calls) <= 0 else None
+            if limit is None:
+                # After a whole mix's worth of held-back draws, wait for a permit rather than spin
+                skipped += 1
+                if skipped >= len(self.rpc_calls):
+                    skipped = 0
+                    await self.limiter.wait_released(0.01)
+                continue
+            skipped = 0
+            task = asyncio.create_task(limited_call(calls, limit, time.perf_counter()))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+    
     async def run_test_batch(self, session: aiohttp.ClientSession, duration: int):
         """Run a batch of tests for the specified duration"""
         start_time = time.time()
         end_time = start_time + duration
-        call_index = 0
+        deadline = time.perf_counter() + duration
         
         semaphore = asyncio.Semaphore(self.max_concurrent)
         
-        async def bounded_call(call_config, block_num=None):
+        async def bounded_call(calls, created):
+            # Rate-limit pauses are waited out before taking a slot, and calls they push past the end are dropped.
+            # Both waits are the node's doing, so they don't count towards the task-to-send delay
+            waited = time.perf_counter()
+            if not await self.wait_for_backoff(calls, deadline):
+                return []
             async with semaphore:
-                return await self.make_rpc_call(session, call_config, block_num)
+                return await self.send_request(session, calls, created + time.perf_counter() - waited)
         
         while time.time() < end_time:
             # Create a batch of concurrent calls
             tasks = []
             for _ in range(min(self.max_concurrent, len(self.rpc_calls))):
-                call_config = self.rpc_calls[call_index % len(self.rpc_calls)]
-                
-                # Determine if this should be a historical call
-                block_num = None
-                if (self.test_archive and call_config.supports_historical and 
-                    random.random() < 0.3):  # 30% chance for historical call
-                    block_num = self.get_random_historical_block()
-                
-                tasks.append(bounded_call(call_config, block_num))
-                call_index += 1
+                tasks.append(bounded_call(self.next_request(), time.perf_counter()))
             
             # Execute batch
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Process results
-            for result in results:
-                if isinstance(result, RPCResult):
-                    self.update_stats(result)
+            for request_results in results:
+                if isinstance(request_results, list):
+                    for result in request_results:
+                        self.update_stats(result)
                 else:
                     # Handle exceptions
                     self.stats.failed_calls += 1
@@ -434,6 +2740,81 @@ class BerachainRPCTester:
             # Brief pause to prevent overwhelming
             await asyncio.sleep(0.01)
     
+    async def run_open_loop(self, session: aiohttp.ClientSession, duration: int):
+        """Issue requests on a fixed arrival schedule, independent of completions.
+        
+        Each request is due 1/rate after the previous one, where the rate comes
+        from the load profile (constant unless --load-profile is used). A slow
+        response never delays later sends, and latency is also measured from the
+        intended send time so that time spent queued behind slow calls is not
+        hidden (coordinated omission). In batch mode the rate is still in
+        calls/second, so batches go out at rate/batch_size.
+        """
+        profile = self.load_profile
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        in_flight = set()
+        
+        async def scheduled_call(calls, intended_start, phase):
+            # Rate-limit pauses are waited out without holding a slot. Calls they push past the end are dropped,
+            # and so are calls due while --concurrent others already wait: the schedule keeps running in a pause.
+            # The task-to-send delay runs from the due time, less these waits and the wait for a free slot or
+            # permit, which are the node's doing: what remains is the event loop running late
+            waited = time.perf_counter()
+            if not await self.wait_for_backoff(calls, end_time, self.max_concurrent):
+                return
+            if self.limiter is None:
+                async with semaphore:
+                    due = intended_start + time.perf_counter() - waited
+                    results = await self.send_request(session, calls, due)
+            else:
+                limit = await self.limiter.acquire(self.limit_key(calls))
+                due = intended_start + time.perf_counter() - waited
+                results = await self.send_limited(session, calls, limit, due)
+            corrected_latency = time.perf_counter() - intended_start
+            for result in results:
+                result.corrected_latency = corrected_latency
+                result.phase = phase
+                self.update_stats(result)
+        
+        start_time = time.perf_counter()
+        end_time = start_time + duration
+        intended_start = start_time
+        
+        while intended_start < end_time:
+            delay = intended_start - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Behind schedule: send immediately, but let in-flight tasks progress
+                self.stats.max_schedule_lag = max(self.stats.max_schedule_lag, -delay)
+                await asyncio.sleep(0)
+            
+            elapsed = intended_start - start_time
+            phase = profile.phase_index(elapsed, duration)
+            task = asyncio.create_task(scheduled_call(
+                self.next_request(), intended_start, None if phase is None else str(phase)
+            ))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            self.current_rate = profile.rate_at(elapsed, duration)
+            intended_start += self.batch_size / self.current_rate
+        
+        # Let the tail of the schedule complete so slow calls are still counted
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+    
+    def on_new_head(self, header: Dict):
+        """newHeads callback: record delay between block timestamp and delivery"""
+        delay = time.time() - int(header["timestamp"], 16)
+        self.stats.heads_received += 1
+        # Block timestamps have one-second resolution; clock skew can push this negative
+        self.stats.head_latencies.record(max(delay, 0.0))
+        
+        number = int(header["number"], 16)
+        if self.last_head is not None and number > self.last_head + 1:
+            self.stats.heads_missed += number - self.last_head - 1
+        self.last_head = max(number, self.last_head or 0)
+    
     def update_stats(self, result: RPCResult):
         """Update test statistics with a result"""
         self.stats.total_calls += 1
@@ -446,51 +2827,558 @@ class BerachainRPCTester:
         if result.success:
             self.stats.successful_calls += 1
             self.stats.successful_by_type[result.call_name] += 1
-            self.stats.latencies.append(result.latency)
+            self.stats.record_latency(result)
+            self.stats.response_bytes += result.response_size
+            self.stats.response_bytes_by_type[result.call_name] += result.response_size
+            self.stats.max_response_size = max(self.stats.max_response_size, result.response_size)
             
             # Track historical success
             if result.block_number is not None:
                 self.stats.historical_successful += 1
-                self.stats.historical_latencies.append(result.latency)
         else:
             self.stats.failed_calls += 1
-            self.stats.error_types[result.error or "Unknown"] += 1
+            error = result.error or "Unknown"
+            if error not in self.stats.error_types and len(self.stats.error_types) >= MAX_ERROR_TYPES:
+                error = "Other errors"
+            self.stats.error_types[error] += 1
+        
+        if result.rate_limited:
+            self.stats.rate_limited_calls += 1
+            self.stats.rate_limited_by_type[result.call_name] += 1
+            if result.error == "HTTP 429":
+                self.stats.http_429s += 1
+            if self.rate_limits is None:
+                self.rate_limits = RateLimitTracker(self.call_methods)
+        else:
+            self.rate_limit_streaks.pop(None, None)
+            self.rate_limit_streaks.pop(self.call_methods.get(result.call_name), None)
+        if self.rate_limits is not None:
+            self.rate_limits.record(result)
+        
+        for listener in self.result_listeners:
+            listener(result)
+        
+        if result.block_number is not None and self.current_block is not None:
+            bucket = depth_bucket(self.current_block - result.block_number)
+            self.stats.depth_calls[bucket] += 1
+            if result.success:
+                if bucket not in self.stats.depth_latencies:
+                    self.stats.depth_latencies[bucket] = self.stats.new_histogram()
+                self.stats.depth_latencies[bucket].record(result.latency)
+            else:
+                self.stats.depth_errors[bucket] += 1
+        
+        if result.phase is not None:
+            self.stats.phase_calls[result.phase] += 1
+            if result.success:
+                if result.phase not in self.stats.phase_latencies:
+                    self.stats.phase_latencies[result.phase] = self.stats.new_histogram()
+                self.stats.phase_latencies[result.phase].record(result.corrected_latency)
+            else:
+                self.stats.phase_errors[result.phase] += 1
+    
+    async def record_intervals(self):
+        """Flush an IntervalRecorder every self.interval seconds into the interval sinks"""
+        recorder = IntervalRecorder(self.hdr_precision)
+        self.result_listeners.append(recorder.record)
+        self.interval_recorder = recorder
+        start_time = time.time()
+        index = 0
+        cpu_start = [time.time(), time.process_time()]
+        
+        def flush(duration: float):
+            now, cpu_now = time.time(), time.process_time()
+            client_cpu = (cpu_now - cpu_start[1]) / (now - cpu_start[0]) if now > cpu_start[0] else 0.0
+            cpu_start[:] = [now, cpu_now]
+            snapshot = recorder.flush(index, now - start_time, duration, self.in_flight, client_cpu,
+                                      self.limiter.total.limit if self.limiter is not None else None,
+                                      self.circuit_breaker.is_open)
+            for sink in self.interval_sinks:
+                sink(snapshot)
+        
+        try:
+            while True:
+                # Sleep to absolute deadlines so intervals don't drift
+                await asyncio.sleep(max(0.0, start_time + (index + 1) * self.interval - time.time()))
+                flush(self.interval)
+                index += 1
+        finally:
+            self.result_listeners.remove(recorder.record)
+            self.interval_recorder = None
+            partial = time.time() - start_time - index * self.interval
+            if recorder.calls and partial > 0:
+                flush(partial)
+    
+    async def monitor_client(self):
+        """Probe event-loop lag every LOOP_PROBE_INTERVAL and the tester's CPU every second.
+        
+        Lag is how long the probe waits to be resumed after yielding: the time a
+        ready callback queues behind other work, which delays sends and response
+        handling alike. (Timing a sleep instead would mostly measure the poller's
+        millisecond timeout rounding.)
+        """
+        cpu_wall, cpu_time = time.perf_counter(), time.process_time()
+        while True:
+            await asyncio.sleep(LOOP_PROBE_INTERVAL)
+            yielded = time.perf_counter()
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            lag = now - yielded
+            self.stats.loop_lags.record(lag)
+            if self.interval_recorder is not None:
+                self.interval_recorder.loop_lags.record(lag)
+            if now - cpu_wall >= 1.0:
+                cpu = (time.process_time() - cpu_time) / (now - cpu_wall)
+                self.stats.client_cpu_peak = max(self.stats.client_cpu_peak, cpu)
+                cpu_wall, cpu_time = now, time.process_time()
     
-    async def run_test(self, duration: int = 60):
+    async def run_test(self, duration: int = 60, report: bool = True):
         """Run the complete RPC test"""
         logger.info(f"Starting RPC throughput test against {self.rpc_url}")
         logger.info(f"Test duration: {duration} seconds")
+        self.duration = duration
         logger.info(f"Max concurrent requests: {self.max_concurrent}")
-        logger.info(f"Testing {len(self.rpc_calls)} different RPC call types")
+        if self.limiter is not None:
+            logger.info(f"Adaptive concurrency: {self.concurrency_limit} limit per call type, "
+                        f"starting at {INITIAL_CONCURRENCY_LIMIT}")
+        if self.rate:
+            logger.info(f"Open-loop mode: {self.load_profile.describe()} on a fixed schedule")
+        if self.batch_size > 1:
+            logger.info(f"Batch mode: {self.batch_size} calls per JSON-RPC batch request")
+        if self.transport == "ws":
+            logger.info(f"WebSocket transport: {self.ws_connections} connections to {self.ws_url}")
+        logger.info(f"Workload '{self.workload['name']}' on {self.network}: "
+                    f"{len(self.rpc_calls)} different RPC call types")
         
         if self.test_archive:
             logger.info(f"Archive node testing enabled - will query up to {self.archive_blocks:,} blocks back")
         
         start_time = time.time()
+        self.test_start_time = start_time
+        cpu_start = time.process_time()
+        
+        profiler = None
+        if self.client_profile_path:
+            profiler = ClientProfiler(self.client_profile_path, self.client_profiler)
+            profiler.start()
+        
+        exporter = None
+        if self.metrics_port:
+            exporter = PrometheusExporter(self, self.metrics_host, self.metrics_port)
+            await exporter.start()
+            self.result_listeners.append(exporter.record)
         
-        connector = aiohttp.TCPConnector(limit=self.max_concurrent * 2)
+        writer = None
+        if self.timeseries_path:
+            writer = TimeSeriesWriter(self.timeseries_path, self.timeseries_format)
+            self.interval_sinks.append(writer.write)
+            logger.info(f"Writing {self.interval:g}s time series to {self.timeseries_path}")
+        
+        # Without keep-alive every request pays for a new connection (DNS, TCP and TLS handshakes)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrent * 2, force_close=not self.keepalive)
         timeout = aiohttp.ClientTimeout(total=10)
+        if self.trace_connections:
+            logger.info(f"Recording connection phases, keep-alive {'on' if self.keepalive else 'off'}")
         
         async with aiohttp.ClientSession(
             connector=connector,
             timeout=timeout,
-            headers={"Content-Type": "application/json"}
+            headers=JSON_HEADERS,
+            trace_configs=[connection_trace_config()] if self.trace_connections else None
         ) as session:
+            if self.transport == "ws":
+                self.ws_pool = WebSocketRPCPool(self.ws_url, self.ws_connections)
+                await self.ws_pool.connect(session)
+            
+            head_probe = None
+            if self.head_latency:
+                # Dedicated connection so probe notifications never queue behind load traffic
+                head_probe = WebSocketRPCPool(self.ws_url, 1)
+                await head_probe.connect(session)
+                await head_probe.subscribe(["newHeads"], self.on_new_head)
+                logger.info(f"Subscribed to newHeads on {self.ws_url}")
+            
+            await self.check_chain_id(session)
+            self.client_version = await self.fetch_client_version(session)
+            if self.client_version:
+                logger.info(f"Node version: {self.client_version}")
+            
+            # Range calls need a head to count their window back from
+            if not self.test_archive and any(call.block_range for call in self.rpc_calls):
+                self.current_block = self.archive_head or await self.get_current_block(session)
+                if self.current_block is None:
+                    raise RuntimeError("Could not determine the current block for range calls")
+            
+            if self.needs_tx_samples:
+                self.tx_samples = await self.sample_transactions(session, self.trace_blocks)
+                if not self.tx_samples:
+                    raise RuntimeError(f"No transactions to trace in the last {self.trace_blocks} blocks; "
+                                       f"raise --trace-blocks")
+                logger.info(f"Sampled {len(self.tx_samples):,} transactions from the last "
+                            f"{self.trace_blocks} blocks to trace")
+            
+            if self.cache_variants:
+                logger.info(f"Proxy cache mode: {len(self.cache_variants)} eth_call types, "
+                            f"{1 - self.cache_hit_ratio:.0%} of their calls cache-busting")
+                if any("data" in self.cache_templates[name].names for name in self.cache_variants):
+                    addresses = await self.sample_addresses(session, CACHE_ADDRESS_BLOCKS)
+                    self.cache_addresses = [address[2:].rjust(64, "0").encode() for address in addresses]
+                    if addresses:
+                        logger.info(f"Sampled {len(addresses):,} addresses from the last {CACHE_ADDRESS_BLOCKS} "
+                                    f"blocks for address arguments")
+                    else:
+                        logger.warning("No addresses found in recent blocks - address arguments will be random")
+            
             # Initialize current block and archive range for historical testing
             if self.test_archive:
-                self.current_block = await self.get_current_block(session)
+                self.current_block = self.archive_head or await self.get_current_block(session)
                 if self.current_block:
                     self.min_archive_block = max(1, self.current_block - self.archive_blocks)
+                    self.block_distribution.prepare(self.current_block, self.min_archive_block, self.rng)
                     logger.info(f"Current block: {self.current_block:,}")
                     logger.info(f"Archive range: {self.min_archive_block:,} to {self.current_block:,}")
+                    logger.info(f"Block selection: {self.block_distribution.describe()}")
                 else:
                     logger.warning("Could not determine current block - disabling archive testing")
                     self.test_archive = False
             
-            await self.run_test_batch(session, duration)
+            interval_task = asyncio.create_task(self.record_intervals()) if self.interval_sinks else None
+            monitor_task = asyncio.create_task(self.monitor_client())
+            try:
+                if self.rate:
+                    await self.run_open_loop(session, duration)
+                elif self.limiter is not None:
+                    await self.run_adaptive_loop(session, duration)
+                else:
+                    await self.run_test_batch(session, duration)
+            finally:
+                if self.limiter is not None:
+                    limits = dict(self.limiter.limits, all=self.limiter.total)
+                    for key, limit in limits.items():
+                        self.stats.concurrency_limits[key] = limit.converged()
+                        self.stats.concurrency_backoffs[key] = limit.backoffs
+                    self.stats.concurrency_throttled.update(self.limiter.throttled)
+                if self.rate_limits is not None:
+                    # The unfinished last second is left out: it would understate the ceiling
+                    self.stats.rate_limit_ceilings = self.rate_limits.ceilings()
+                for task in (interval_task, monitor_task):
+                    if task is not None:
+                        task.cancel()
+                        await asyncio.gather(task, return_exceptions=True)
+                if writer is not None:
+                    self.interval_sinks.remove(writer.write)
+                    writer.close()
+                if self.dashboard is not None:
+                    self.dashboard.stop()
+                for pool in (self.ws_pool, head_probe):
+                    if pool is not None:
+                        await pool.close()
+                self.ws_pool = None
+                if exporter is not None:
+                    self.result_listeners.remove(exporter.record)
+                    await exporter.stop()
+                if profiler is not None:
+                    profiler.stop()
+                    logger.info(f"Client profile written to {self.client_profile_path}")
         
         self.stats.total_time = time.time() - start_time
-        self.print_results()
+        self.stats.client_cpu_time = time.process_time() - cpu_start
+        self.stats.client_processes = 1
+        if self.soak is not None:
+            self.soak.finish()
+        if report:
+            self.print_results()
+    
+    async def run_as_worker(self, duration: int, worker_id: int, results_queue, report_interval: float = 2.0):
+        """Run the test inside a worker process, streaming stats snapshots to the parent"""
+        self.test_start_time = time.time()
+        
+        def snapshot(final: bool) -> Dict:
+            # CPU travels in the stats (client_cpu_peak), sampled once per second by monitor_client
+            if not final:
+                self.stats.total_time = time.time() - self.test_start_time
+            return {"worker_id": worker_id, "final": final, "stats": self.stats.to_dict()}
+        
+        if self.stream_intervals:
+            self.interval_sinks.append(
+                lambda interval: results_queue.put({"worker_id": worker_id, "interval": interval})
+            )
+        
+        async def report_progress():
+            while True:
+                await asyncio.sleep(report_interval)
+                results_queue.put(snapshot(final=False))
+        
+        reporter = asyncio.create_task(report_progress())
+        try:
+            await self.run_test(duration, report=False)
+        finally:
+            reporter.cancel()
+        results_queue.put(snapshot(final=True))
+    
+    def probe_client_version(self) -> Optional[str]:
+        """fetch_client_version outside a running event loop, for runs whose load comes from other processes"""
+        async def probe():
+            async with aiohttp.ClientSession(headers=JSON_HEADERS) as session:
+                return await self.fetch_client_version(session)
+        return asyncio.run(probe())
+    
+    def run_multiprocess(self, duration: int, workers: int, tester_kwargs: Dict,
+                         cpu_warn_threshold: float = CLIENT_CPU_LIMIT):
+        """Shard the load across worker processes and merge their statistics into self.stats.
+        
+        Each worker runs its own event loop and connection pool with 1/N of the
+        rate and concurrency. Workers stream cumulative snapshots, so if the run
+        is interrupted self.stats still holds the latest merged view.
+        """
+        logger.info(f"Starting {workers} worker processes against {self.rpc_url}")
+        self.duration = duration
+        self.client_version = self.probe_client_version()
+        ctx = multiprocessing.get_context("spawn")
+        results_queue = ctx.Queue()
+        processes = []
+        for worker_id in range(workers):
+            process = ctx.Process(
+                target=run_worker_process,
+                args=(worker_id, shard_tester_kwargs(tester_kwargs, workers, worker_id),
+                      duration, results_queue, logging.getLogger().level),
+                daemon=True
+            )
+            process.start()
+            processes.append(process)
+        
+        completed = False
+        try:
+            self.collect_worker_results(results_queue, workers, lambda: any(p.is_alive() for p in processes),
+                                        cpu_warn_threshold)
+            completed = True
+        finally:
+            for process in processes:
+                if process.is_alive() and not completed:
+                    process.terminate()
+                process.join()
+    
+    def run_distributed(self, duration: int, hosts: List[str], processes: int, tester_kwargs: Dict,
+                        token: Optional[str] = None, start_delay: float = 5.0,
+                        cpu_warn_threshold: float = CLIENT_CPU_LIMIT):
+        """Shard the load across worker agents on other hosts and merge their statistics into self.stats.
+        
+        Every host (HOST:PORT of a --worker-listen agent) runs `processes`
+        shards, and all of them start at the same wall-clock time, start_delay
+        seconds from now, so host clocks should be NTP-synced. Agents stream
+        the same snapshots as local worker processes, so merging, time series
+        and interrupted runs work as with --workers.
+        """
+        workers = len(hosts) * processes
+        logger.info(f"Starting {workers} workers on {len(hosts)} hosts against {self.rpc_url}")
+        self.duration = duration
+        self.client_version = self.probe_client_version()
+        
+        # Agents may not have the workload file, so it travels with the job
+        workload = None
+        if tester_kwargs.get("workload"):
+            with open(tester_kwargs["workload"]) as f:
+                workload = {"name": os.path.basename(tester_kwargs["workload"]), "content": f.read()}
+        start_at = time.time() + start_delay
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        results_queue = queue.Queue()
+        
+        async def run_host(session: aiohttp.ClientSession, index: int, host: str):
+            job = {
+                "duration": duration,
+                "start_at": start_at,
+                "log_level": logging.getLogger().level,
+                "workload": workload,
+                "shards": [
+                    {"worker_id": worker_id,
+                     "kwargs": encode_tester_kwargs(remote_shard_kwargs(tester_kwargs, workers, worker_id))}
+                    for worker_id in range(index * processes, (index + 1) * processes)
+                ],
+            }
+            timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=start_delay + 120)
+            try:
+                async with session.post(f"http://{host}/run", json=job, headers=headers, timeout=timeout) as response:
+                    if response.status != 200:
+                        logger.error(f"Worker host {host} refused the job: HTTP {response.status} "
+                                     f"{(await response.text()).strip()}")
+                        return
+                    async for line in response.content:
+                        message = json_loads(line)
+                        if "interval" in message:
+                            message["interval"] = interval_from_dict(message["interval"])
+                        results_queue.put(message)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Lost worker host {host}: {e or type(e).__name__}")
+        
+        async def run_hosts():
+            async with aiohttp.ClientSession() as session:
+                await asyncio.gather(*(run_host(session, index, host) for index, host in enumerate(hosts)))
+        
+        # Streams run on their own thread and event loop; the collector below blocks on the queue
+        streams = threading.Thread(target=asyncio.run, args=(run_hosts(),), daemon=True)
+        streams.start()
+        if not self.collect_worker_results(results_queue, workers, streams.is_alive, cpu_warn_threshold):
+            raise RuntimeError("No worker host ran the job")
+    
+    def collect_worker_results(self, results_queue, workers: int, any_alive: Callable[[], bool],
+                               cpu_warn_threshold: float = CLIENT_CPU_LIMIT) -> int:
+        """Merge snapshot messages from workers into self.stats until every worker has finished.
+        
+        Workers stream cumulative snapshots, so if the run is interrupted
+        self.stats still holds the latest merged view. Returns how many
+        workers reported at all.
+        """
+        writer = TimeSeriesWriter(self.timeseries_path, self.timeseries_format) if self.timeseries_path else None
+        sinks = self.interval_sinks + ([writer.write] if writer is not None else [])
+        pending_intervals: Dict[int, List[Dict]] = defaultdict(list)
+        
+        def write_intervals(complete_only: bool):
+            # An interval is passed on once every worker has reported it
+            for index in sorted(pending_intervals):
+                if complete_only and len(pending_intervals[index]) < workers:
+                    break
+                merged = merge_interval_snapshots(pending_intervals.pop(index))
+                for sink in sinks:
+                    sink(merged)
+        
+        snapshots: Dict[int, TestStats] = {}
+        finished = set()
+        warned = set()
+        
+        def refresh_stats():
+            merged = TestStats(hdr_precision=self.hdr_precision)
+            for stats in snapshots.values():
+                merged.merge(stats)
+            # The same per-process samples as the overall peak, which is the largest of these
+            merged.worker_cpu = {f"worker-{worker_id}": stats.client_cpu_peak
+                                 for worker_id, stats in sorted(snapshots.items())}
+            self.stats = merged
+        
+        try:
+            while len(finished) < workers:
+                try:
+                    message = results_queue.get(timeout=1.0)
+                except queue.Empty:
+                    if not any_alive():
+                        break
+                    continue
+                
+                worker_id = message["worker_id"]
+                if "interval" in message:
+                    if sinks:
+                        pending_intervals[message["interval"]["index"]].append(message["interval"])
+                        write_intervals(complete_only=True)
+                    continue
+                
+                snapshots[worker_id] = TestStats.from_dict(message["stats"])
+                cpu = snapshots[worker_id].client_cpu_peak
+                if cpu >= cpu_warn_threshold and worker_id not in warned:
+                    warned.add(worker_id)
+                    logger.warning(f"Worker {worker_id} CPU at {cpu:.0%} - the load generator "
+                                   f"may be the bottleneck, consider adding workers")
+                if message["final"]:
+                    finished.add(worker_id)
+                refresh_stats()
+        finally:
+            if sinks:
+                write_intervals(complete_only=False)
+            if writer is not None:
+                writer.close()
+            if self.dashboard is not None:
+                self.dashboard.stop()
+        
+        missing = set(range(workers)) - finished
+        if missing:
+            logger.warning(f"Workers {sorted(missing)} did not finish - using their last snapshot")
+        refresh_stats()
+        if self.soak is not None:
+            self.soak.finish()
+        return len(snapshots)
+    
+    def print_cache_results(self):
+        """PROXY CACHE section: eth_call latency by how calls were sent, by proxy header and by timing cluster.
+        
+        Headers are the proxy's own word; without them, the split into a fast
+        and a slow latency cluster estimates hits and misses. Busted calls are
+        misses either way, so their latency is the node's.
+        """
+        cache = self.stats.cache_latencies
+        empty = self.stats.new_histogram()
+        print(f"\nPROXY CACHE (target hit ratio {self.cache_hit_ratio:.0%} of eth_calls):")
+        if not self.cache_variants:
+            print("The workload has no eth_call to vary")
+            return
+        
+        varied = self.stats.new_histogram()
+        for key in ("repeated", "busted"):
+            varied.merge(cache.get(key, empty))
+        headers = len(cache.get("hit", empty)) + len(cache.get("miss", empty))
+        clusters = varied.split_clusters(CACHE_CLUSTER_SEPARATION)
+        rows = [("Repeated (cacheable)", cache.get("repeated", empty), len(varied)),
+                ("Busted (unique)", cache.get("busted", empty), len(varied))]
+        if headers:
+            rows += [("Proxy header: hit", cache.get("hit", empty), headers),
+                     ("Proxy header: miss", cache.get("miss", empty), headers)]
+        if clusters:
+            threshold, fast, slow = clusters
+            rows += [(f"Fast cluster (<= {threshold * 1000:.2f} ms)", fast, len(varied)),
+                     ("Slow cluster", slow, len(varied))]
+        print(f"{'Calls':<30} {'Count':>9} {'Share':>8} {'p50 ms':>9} {'p99 ms':>9}")
+        print("-" * 69)
+        for label, histogram, total in rows:
+            share = len(histogram) / total if total else 0
+            print(f"{label:<30} {len(histogram):>9,} {share:>8.1%} {histogram.percentile(50) * 1000:>9.2f} "
+                  f"{histogram.percentile(99) * 1000:>9.2f}")
+        
+        # Misses are what the node behind the cache actually served
+        if headers:
+            hit_ratio, misses, source = len(cache.get("hit", empty)) / headers, len(cache.get("miss", empty)), "proxy header"
+        elif clusters:
+            hit_ratio, misses, source = len(clusters[1]) / len(varied), len(clusters[2]), "timing clusters"
+        else:
+            hit_ratio, misses, source = None, len(cache.get("busted", empty)), "busted calls only, a lower bound"
+        if hit_ratio is None:
+            print(f"Observed hit ratio:   unknown (no cache status header and no separate fast latency cluster)")
+        else:
+            print(f"Observed hit ratio:   {hit_ratio:.1%} (from {source})")
+        if self.stats.total_time > 0:
+            print(f"Reached the node:     {misses / self.stats.total_time:.1f} eth_calls/s ({source})")
+        print(f"Busted calls always miss, so their latency is the node's. Repeated calls also miss once per cache "
+              f"TTL,\nso the observed hit ratio can fall short of the target. Run --cache-hit-ratio 0 and raise "
+              f"--rate to find\nthe node's capacity behind the cache.")
+    
+    def depth_rows(self) -> List[Dict]:
+        """Per block age bucket: calls, throughput, error rate and latency percentiles"""
+        total_time = self.stats.total_time or 1.0
+        rows = []
+        for index, bucket in enumerate(DEPTH_BUCKET_LABELS):
+            calls = self.stats.depth_calls.get(bucket, 0)
+            if not calls:
+                continue
+            histogram = self.stats.depth_latencies.get(bucket) or self.stats.new_histogram()
+            upper = DEPTH_BUCKET_EDGES[index + 1] if index + 1 < len(DEPTH_BUCKET_EDGES) else None
+            rows.append({
+                "bucket": bucket,
+                "min_age": DEPTH_BUCKET_EDGES[index],
+                "max_age": upper,
+                "calls": calls,
+                "errors": self.stats.depth_errors.get(bucket, 0),
+                "error_rate": round(self.stats.depth_errors.get(bucket, 0) / calls, 6),
+                "throughput": round(calls / total_time, 3),
+                **latency_summary(histogram),
+            })
+        return rows
+    
+    @staticmethod
+    def export_depth_rows(rows: List[Dict], path: str):
+        """Write the block age table as CSV (.csv) or JSON"""
+        with open(path, "w", newline="") as f:
+            if path.endswith(".csv"):
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                json.dump(rows, f, indent=2)
     
     def print_results(self):
         """Print detailed test results"""
@@ -505,6 +3393,8 @@ class BerachainRPCTester:
         print(f"Failed calls:         {self.stats.failed_calls:,}")
         print(f"Success rate:         {(self.stats.successful_calls/self.stats.total_calls)*100:.2f}%")
         print(f"Total test time:      {self.stats.total_time:.2f} seconds")
+        if self.client_version:
+            print(f"Node version:         {self.client_version}")
         
         # Throughput metrics
         if self.stats.total_time > 0:
@@ -512,34 +3402,104 @@ class BerachainRPCTester:
             success_throughput = self.stats.successful_calls / self.stats.total_time
             print(f"Overall throughput:   {overall_throughput:.2f} calls/second")
             print(f"Success throughput:   {success_throughput:.2f} calls/second")
+        if self.load_profile and self.load_profile.kind != "constant":
+            print(f"Load profile:         {self.load_profile.describe()} (open-loop)")
+        elif self.stats.target_rate:
+            print(f"Target arrival rate:  {self.stats.target_rate:.2f} calls/second (open-loop)")
+            print(f"Max schedule lag:     {self.stats.max_schedule_lag*1000:.2f} ms")
         
         # Latency statistics
-        if self.stats.latencies:
+        latencies = self.stats.latencies
+        if latencies:
             print(f"\nLATENCY STATISTICS (successful calls only):")
-            print(f"Average latency:      {statistics.mean(self.stats.latencies)*1000:.2f} ms")
-            print(f"Median latency:       {statistics.median(self.stats.latencies)*1000:.2f} ms")
-            print(f"Min latency:          {min(self.stats.latencies)*1000:.2f} ms")
-            print(f"Max latency:          {max(self.stats.latencies)*1000:.2f} ms")
+            print(f"Average latency:      {latencies.mean()*1000:.2f} ms")
+            print(f"Median latency:       {latencies.percentile(50)*1000:.2f} ms")
+            print(f"Min latency:          {latencies.min()*1000:.2f} ms")
+            print(f"Max latency:          {latencies.max()*1000:.2f} ms")
             
-            if len(self.stats.latencies) > 1:
-                print(f"Std deviation:        {statistics.stdev(self.stats.latencies)*1000:.2f} ms")
+            if len(latencies) > 1:
+                print(f"Std deviation:        {latencies.stdev()*1000:.2f} ms")
                 
                 # Percentiles
-                sorted_latencies = sorted(self.stats.latencies)
-                p95_idx = int(0.95 * len(sorted_latencies))
-                p99_idx = int(0.99 * len(sorted_latencies))
-                print(f"95th percentile:      {sorted_latencies[p95_idx]*1000:.2f} ms")
-                print(f"99th percentile:      {sorted_latencies[p99_idx]*1000:.2f} ms")
+                print(f"95th percentile:      {latencies.percentile(95)*1000:.2f} ms")
+                print(f"99th percentile:      {latencies.percentile(99)*1000:.2f} ms")
+        
+        # Open-loop: service time vs latency seen by a client arriving on schedule
+        corrected = self.stats.corrected_latencies
+        if corrected:
+            print(f"\nCORRECTED LATENCY (open-loop, measured from intended send time):")
+            print(f"{'Percentile':<12} {'Uncorrected':>14} {'Corrected':>14}")
+            print("-" * 42)
+            for pct in (50, 90, 95, 99, 99.9):
+                print(f"{'p' + format(pct, 'g'):<12} {latencies.percentile(pct)*1000:>11.2f} ms "
+                      f"{corrected.percentile(pct)*1000:>11.2f} ms")
+            print(f"{'max':<12} {latencies.max()*1000:>11.2f} ms {corrected.max()*1000:>11.2f} ms")
+        
+        # Load profile phases
+        if self.stats.phase_calls and self.load_profile and self.duration:
+            print(f"\nLOAD PROFILE PHASES (latency corrected to intended send time):")
+            print(f"{'Window':<16} {'Offered/s':>10} {'Achieved/s':>11} {'Errors':>8} {'p50 ms':>9} {'p99 ms':>9}")
+            print("-" * 68)
+            for phase in sorted(self.stats.phase_calls, key=int):
+                start, end = self.load_profile.phase_bounds(int(phase), self.duration)
+                if end <= start:
+                    continue
+                calls = self.stats.phase_calls[phase]
+                errors = self.stats.phase_errors.get(phase, 0)
+                histogram = self.stats.phase_latencies.get(phase) or self.stats.new_histogram()
+                offered = self.load_profile.rate_at((start + end) / 2, self.duration)
+                print(f"{f'{start:g}-{end:g}s':<16} {offered:>10.1f} {calls / (end - start):>11.1f} "
+                      f"{errors / calls:>8.1%} {histogram.percentile(50)*1000:>9.2f} "
+                      f"{histogram.percentile(99)*1000:>9.2f}")
+        
+        # JSON-RPC batch statistics
+        if self.stats.batches_sent:
+            batches = self.stats.batch_latencies
+            calls_per_batch = self.stats.total_calls / self.stats.batches_sent
+            print(f"\nBATCH STATISTICS:")
+            print(f"Batches sent:         {self.stats.batches_sent:,} (~{calls_per_batch:.0f} calls each)")
+            if self.stats.total_time > 0:
+                print(f"Batch throughput:     {self.stats.batches_sent / self.stats.total_time:.2f} batches/second")
+            print(f"Batch median latency: {batches.percentile(50)*1000:.2f} ms")
+            print(f"Batch p99 latency:    {batches.percentile(99)*1000:.2f} ms")
         
         # Call type breakdown
         print(f"\nCALL TYPE BREAKDOWN:")
-        print(f"{'Call Type':<25} {'Total':<8} {'Success':<8} {'Rate':<8}")
-        print("-" * 50)
+        print(f"{'Call Type':<25} {'Total':<8} {'Success':<8} {'Rate':<8} {'p50 ms':>9} {'p99 ms':>9} {'Avg KB':>9}")
+        print("-" * 80)
         for call_type in sorted(self.stats.calls_by_type.keys()):
             total = self.stats.calls_by_type[call_type]
             success = self.stats.successful_by_type.get(call_type, 0)
             rate = (success / total * 100) if total > 0 else 0
-            print(f"{call_type:<25} {total:<8} {success:<8} {rate:<6.1f}%")
+            histogram = self.stats.latencies_by_type.get(call_type) or self.stats.new_histogram()
+            average_kb = self.stats.response_bytes_by_type.get(call_type, 0) / success / 1024 if success else 0
+            print(f"{call_type:<25} {total:<8} {success:<8} {rate:<6.1f}% "
+                  f"{histogram.percentile(50)*1000:>9.2f} {histogram.percentile(99)*1000:>9.2f} {average_kb:>9.2f}")
+        
+        # Trace and debug calls, labelled by tracer
+        trace_calls = [call for call in self.rpc_calls
+                       if call.method.startswith(TRACE_METHOD_PREFIXES) and self.stats.calls_by_type.get(call.name)]
+        if trace_calls:
+            print(f"\nTRACE CALLS:")
+            print(f"{'Call Type':<25} {'Method (tracer)':<54} {'Calls':<7} {'Errors':<8} "
+                  f"{'p50 ms':>9} {'p99 ms':>9} {'Max ms':>9} {'Avg KB':>9}")
+            print("-" * 136)
+            for call in trace_calls:
+                options = call.params[1] if call.params and len(call.params) > 1 else None
+                options = options if isinstance(options, dict) else {}
+                tracer = options.get("tracer") or ("struct logs" if call.method.startswith("debug_") else "parity")
+                tracer += "".join(f" {k}={json.dumps(v)}" for k, v in options.get("tracerConfig", {}).items())
+                label = f"{call.method} ({tracer})"
+                total = self.stats.calls_by_type[call.name]
+                success = self.stats.successful_by_type.get(call.name, 0)
+                histogram = self.stats.latencies_by_type.get(call.name) or self.stats.new_histogram()
+                average_kb = self.stats.response_bytes_by_type.get(call.name, 0) / success / 1024 if success else 0
+                error_rate = f"{(total - success) / total:.1%}"
+                print(f"{call.name:<25} {label:<54} {total:<7} {error_rate:<8} "
+                      f"{histogram.percentile(50)*1000:>9.1f} {histogram.percentile(99)*1000:>9.1f} "
+                      f"{histogram.max()*1000:>9.1f} {average_kb:>9.1f}")
+            timeouts = sorted({call.timeout or 10 for call in trace_calls})
+            print(f"Timeouts: {', '.join(f'{t:g} s' for t in timeouts)}; ERROR BREAKDOWN below counts the calls that hit them")
         
         # Archive node statistics
         if self.test_archive and self.stats.historical_calls > 0:
@@ -549,15 +3509,179 @@ class BerachainRPCTester:
             print(f"Historical success:   {self.stats.historical_successful:,}")
             print(f"Historical success rate: {historical_success_rate:.2f}%")
             
-            if self.stats.historical_latencies:
-                print(f"Historical avg latency: {statistics.mean(self.stats.historical_latencies)*1000:.2f} ms")
-                print(f"Historical median latency: {statistics.median(self.stats.historical_latencies)*1000:.2f} ms")
+            historical = self.stats.historical_latencies
+            if historical:
+                print(f"Historical avg latency: {historical.mean()*1000:.2f} ms")
+                print(f"Historical median latency: {historical.percentile(50)*1000:.2f} ms")
+                print(f"Historical p99 latency: {historical.percentile(99)*1000:.2f} ms")
+            latest = self.stats.latest_latencies
+            if latest:
+                print(f"Current median latency: {latest.percentile(50)*1000:.2f} ms")
+                print(f"Current p99 latency: {latest.percentile(99)*1000:.2f} ms")
             
             current_calls = self.stats.total_calls - self.stats.historical_calls
             current_success = self.stats.successful_calls - self.stats.historical_successful
             if current_calls > 0:
                 current_success_rate = (current_success / current_calls * 100)
                 print(f"Current calls success rate: {current_success_rate:.2f}%")
+            
+            depth_rows = self.depth_rows()
+            if depth_rows:
+                print(f"\nLatency by block age (blocks behind head at test start):")
+                print(f"{'Age':<12} {'Calls':<9} {'Calls/s':<9} {'Errors':<9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+                print("-" * 70)
+                for row in depth_rows:
+                    error_rate = f"{row['error_rate'] * 100:.2f}%"
+                    print(f"{row['bucket']:<12} {row['calls']:<9,} {row['throughput']:<9.1f} {error_rate:<9} "
+                          f"{row['p50_ms']:>9.2f} {row['p90_ms']:>9.2f} {row['p99_ms']:>9.2f}")
+                if self.depth_export_path:
+                    self.export_depth_rows(depth_rows, self.depth_export_path)
+                    print(f"Block age table written to {self.depth_export_path}")
+        
+        # Head propagation (eth_subscribe newHeads)
+        if self.stats.heads_received:
+            heads = self.stats.head_latencies
+            print(f"\nHEAD PROPAGATION (newHeads delivery after block timestamp):")
+            print(f"Heads received:       {self.stats.heads_received:,}")
+            print(f"Heads missed:         {self.stats.heads_missed:,}")
+            print(f"Median delay:         {heads.percentile(50)*1000:.0f} ms")
+            print(f"90th percentile:      {heads.percentile(90)*1000:.0f} ms")
+            print(f"99th percentile:      {heads.percentile(99)*1000:.0f} ms")
+            print(f"Max delay:            {heads.max()*1000:.0f} ms")
+            print("Block timestamps have 1 s resolution and depend on clock sync (NTP) with the node.")
+        
+        # Multi-process load generator health
+        if self.stats.worker_cpu:
+            print(f"\nLOAD GENERATOR WORKERS (peak CPU, busiest second):")
+            for worker, cpu in self.stats.worker_cpu.items():
+                flag = "  <- CPU bound, results may understate node capacity" if cpu >= CLIENT_CPU_LIMIT else ""
+                print(f"{worker:<12} {cpu:>6.0%}{flag}")
+        
+        # Where HTTP request time goes, per connection phase
+        if self.stats.traced_requests:
+            stats = self.stats
+            print(f"\nCONNECTION PHASES (keep-alive {'on' if self.keepalive else 'off'}):")
+            print(f"{'Phase':<20} {'Requests':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'Max ms':>9} {'Mean ms':>9}")
+            print("-" * 80)
+            for name in CONNECTION_PHASES:
+                histogram = stats.connection_phases.get(name)
+                if histogram is None or not len(histogram):
+                    continue
+                print(f"{CONNECTION_PHASE_LABELS[name]:<20} {len(histogram):>9,} "
+                      f"{histogram.percentile(50)*1000:>9.2f} {histogram.percentile(90)*1000:>9.2f} "
+                      f"{histogram.percentile(99)*1000:>9.2f} {histogram.max()*1000:>9.2f} "
+                      f"{histogram.mean()*1000:>9.2f}")
+            print(f"New connections:      {stats.new_connections:,} of {stats.traced_requests:,} requests "
+                  f"({stats.new_connections / stats.traced_requests:.1%})")
+            if stats.new_connections:
+                def total(histogram: LatencyHistogram) -> float:
+                    return histogram.mean() * len(histogram)
+                handshake = sum(total(stats.connection_phases[name]) for name in ("dns", "connect")
+                                if name in stats.connection_phases)
+                request = sum(total(histogram) for histogram in stats.connection_phases.values())
+                print(f"Handshake cost:       {handshake / stats.new_connections * 1000:.2f} ms per new connection, "
+                      f"{handshake / request if request else 0:.1%} of all request time")
+            print(f"DNS and connect count only requests that opened a connection; pool wait means "
+                  f"--concurrent exceeded the connection limit")
+        
+        # Adaptive concurrency: where the node-wide and per-method limits settled
+        if self.stats.concurrency_limits:
+            stats = self.stats
+            target = f", latency target {self.limiter.latency_target*1000:.0f} ms" if self.concurrency_limit == "aimd" else ""
+            print(f"\nADAPTIVE CONCURRENCY ({self.concurrency_limit}{target}):")
+            total = stats.concurrency_limits.get("all", 0.0)
+            goodput = stats.successful_calls / stats.total_time if stats.total_time else 0
+            print(f"Node-wide limit:      {total:.1f} requests in flight ({stats.concurrency_backoffs.get('all', 0):,} "
+                  f"backoffs), {goodput:.1f} successful calls/s")
+            if total >= self.max_concurrent * 0.95:
+                print(f"The limit reached the --concurrent cap of {self.max_concurrent}; raise it to find the node's limit")
+            print(f"\n{'Call Type':<30} {'Limit':>7} {'Backoffs':>9} {'Throttled':>10} {'Success/s':>10} "
+                  f"{'Errors':>8} {'P99 ms':>9}")
+            print("-" * 89)
+            methods = {key: limit for key, limit in stats.concurrency_limits.items() if key != "all"}
+            for key, limit in sorted(methods.items(), key=lambda item: item[1]):
+                if key == "batch":
+                    calls, successes, histogram = stats.batches_sent, stats.batches_sent, stats.batch_latencies
+                else:
+                    calls = stats.calls_by_type.get(key, 0)
+                    successes = stats.successful_by_type.get(key, 0)
+                    histogram = stats.latencies_by_type.get(key) or stats.new_histogram()
+                error_rate = f"{(calls - successes) / calls:.1%}" if calls else "n/a"
+                throttled = f"{stats.concurrency_throttled.get(key, 0) / calls:.1%}" if calls else "n/a"
+                print(f"{key[:30]:<30} {limit:>7.1f} {stats.concurrency_backoffs.get(key, 0):>9,} {throttled:>10} "
+                      f"{successes / stats.total_time if stats.total_time else 0:>10.1f} {error_rate:>8} "
+                      f"{histogram.percentile(99)*1000:>9.2f}")
+            print(f"Limits are medians over the later half of the run. Throttled is the share of requests held back "
+                  f"by their own\nmethod's limit; a method that is rarely throttled is limited by the node-wide "
+                  f"limit, not by its own cost.")
+        
+        # Client overhead: is the tester, rather than the node, the bottleneck?
+        if self.stats.client_processes:
+            stats = self.stats
+            average_cpu = stats.client_cpu_time / stats.total_time / stats.client_processes if stats.total_time else 0
+            print(f"\nCLIENT OVERHEAD:")
+            print(f"Tester CPU:           {average_cpu:.0%} average, {stats.client_cpu_peak:.0%} peak "
+                  f"(of one core, per process)")
+            for label, histogram in (("Event loop lag:", stats.loop_lags), ("Task to send delay:", stats.dispatch_delays)):
+                print(f"{label:<21} p50 {histogram.percentile(50)*1000:.2f} ms, "
+                      f"p99 {histogram.percentile(99)*1000:.2f} ms, max {histogram.max()*1000:.2f} ms")
+            reasons = stats.client_bound_reasons()
+            if reasons:
+                print(f"Verdict:              CLIENT-BOUND - latency and throughput partly measure the tester")
+                for reason in reasons:
+                    print(f"  - {reason}")
+                print(f"  Lower --concurrent or add --workers (or machines) and rerun")
+            else:
+                print(f"Verdict:              node-bound - client overhead is small next to call latency")
+            if self.client_profile_path and os.path.exists(self.client_profile_path):
+                print(f"\nClient profile ({self.client_profiler}): {self.client_profile_path} "
+                      f"(python -m pstats {self.client_profile_path}); top functions by own time:")
+                ClientProfiler.print_top(self.client_profile_path)
+        
+        # Rate limiting: capped rather than broken
+        if self.stats.rate_limited_calls:
+            stats = self.stats
+            print(f"\nRATE LIMITING:")
+            print(f"Rate-limited calls:   {stats.rate_limited_calls:,} ({stats.rate_limited_calls / stats.total_calls:.2%} "
+                  f"of calls; {stats.http_429s:,} HTTP 429, {stats.rate_limited_calls - stats.http_429s:,} JSON-RPC errors)")
+            retry_after = f", largest Retry-After {stats.max_retry_after:g} s" if stats.max_retry_after else ""
+            if self.honor_retry_after:
+                shed = f"; {stats.backoff_shed:,} scheduled calls shed while paused" if stats.backoff_shed else ""
+                print(f"Backoff:              {stats.backoff_time:.1f} s of pauses, summed over the endpoint and "
+                      f"each paused method{retry_after}{shed}")
+            else:
+                print(f"Backoff:              none (--ignore-retry-after){retry_after}")
+            ceilings = stats.rate_limit_ceilings
+            if "all" in ceilings:
+                print(f"Endpoint ceiling:     at least {ceilings['all']:.0f} calls/s let through while it returned HTTP 429")
+            elif stats.http_429s:
+                print(f"Endpoint ceiling:     not detected (limited in fewer than {MIN_CEILING_SECONDS} seconds)")
+            else:
+                print(f"Endpoint ceiling:     not reached (no HTTP 429s, only per-method limits)")
+            calls_by_method: Dict[str, int] = defaultdict(int)
+            limited_by_method: Dict[str, int] = defaultdict(int)
+            for call_type, calls in stats.calls_by_type.items():
+                calls_by_method[self.call_methods.get(call_type, call_type)] += calls
+            for call_type, limited in stats.rate_limited_by_type.items():
+                limited_by_method[self.call_methods.get(call_type, call_type)] += limited
+            print(f"\n{'Method':<30} {'Calls':>9} {'Limited':>9} {'Limited %':>10} {'Ceiling/s':>10}")
+            print("-" * 72)
+            for method, limited in sorted(limited_by_method.items(), key=lambda item: -item[1]):
+                calls = calls_by_method.get(method, 0)
+                ceiling = f">= {ceilings[method]:.1f}" if method in ceilings else "n/a"
+                print(f"{method[:30]:<30} {calls:>9,} {limited:>9,} {limited / calls if calls else 0:>10.1%} {ceiling:>10}")
+            print(f"Ceilings are the median rate accepted over seconds in which the endpoint or method was limiting. "
+                  f"They are\nlower bounds: only what the tester offered could be accepted, and backoff pauses "
+                  f"offer less. Limited\ncounts include HTTP 429s; a method's ceiling is set by its own limit "
+                  f"errors. Use --ignore-retry-after\nto measure a gateway's limits under constant pressure.")
+        
+        # Proxy cache: what the cache answered, and what reached the node behind it
+        if self.cache_hit_ratio is not None:
+            self.print_cache_results()
+        
+        # Soak: how the run changed over time
+        if self.soak is not None:
+            self.soak.print_report()
         
         # Error breakdown
         if self.stats.error_types:
@@ -568,68 +3692,1451 @@ class BerachainRPCTester:
         
         print("\n" + "="*80)
 
-def main():
-    """Main entry point"""
-    parser = argparse.ArgumentParser(
-        description="Berachain RPC Throughput Tester",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Test default mainnet RPC for 60 seconds
-  python berachain-rpc-tester.py
-  
-  # Test custom RPC with specific duration and concurrency
-  python berachain-rpc-tester.py --rpc-url https://rpc.berachain.com/ --duration 120 --concurrent 100
-  
-  # Quick 10-second test
-  python berachain-rpc-tester.py --duration 10
-        """
-    )
+def derive_ws_url(rpc_url: str) -> str:
+    """Guess the WebSocket endpoint for an HTTP RPC URL (http->ws, https->wss)"""
+    if rpc_url.startswith("https://"):
+        return "wss://" + rpc_url[len("https://"):]
+    if rpc_url.startswith("http://"):
+        return "ws://" + rpc_url[len("http://"):]
+    return rpc_url
+
+def shard_tester_kwargs(tester_kwargs: Dict, workers: int, worker_id: int) -> Dict:
+    """Split the target rate and concurrency of a tester config across workers"""
+    shard = dict(tester_kwargs)
+    shard["max_concurrent"] = max(1, math.ceil(tester_kwargs["max_concurrent"] / workers))
+    if tester_kwargs.get("rate"):
+        shard["rate"] = tester_kwargs["rate"] / workers
+    if tester_kwargs.get("load_profile"):
+        shard["load_profile"] = tester_kwargs["load_profile"].scaled(1 / workers)
+    # Each worker serves its own metrics endpoint; sum them in PromQL
+    if tester_kwargs.get("metrics_port"):
+        shard["metrics_port"] = tester_kwargs["metrics_port"] + worker_id
+    # The parent merges worker intervals into the single time-series file
+    shard["stream_intervals"] = bool(tester_kwargs.get("timeseries_path") or tester_kwargs.get("soak_window")
+                                     or tester_kwargs.get("dashboard"))
+    shard["timeseries_path"] = None
+    shard["soak_window"] = None  # Soak windows are built by the parent from the merged intervals
+    shard["checkpoint_path"] = None
+    shard["dashboard"] = False  # So is the dashboard
+    if tester_kwargs.get("ws_connections"):
+        shard["ws_connections"] = max(1, math.ceil(tester_kwargs["ws_connections"] / workers))
+    # Distinct but repeatable random streams, and different stretches of a replay list
+    if tester_kwargs.get("seed") is not None:
+        shard["seed"] = tester_kwargs["seed"] + worker_id
+    if tester_kwargs.get("block_distribution"):
+        shard["block_distribution"] = replace(tester_kwargs["block_distribution"], replay_start=worker_id / workers)
+    if tester_kwargs.get("client_profile_path"):
+        base, extension = os.path.splitext(tester_kwargs["client_profile_path"])
+        shard["client_profile_path"] = f"{base}-worker{worker_id}{extension}"
+    # One head probe is enough; N of them would just count every head N times
+    shard["head_latency"] = tester_kwargs.get("head_latency", False) and worker_id == 0
+    return shard
+
+def remote_shard_kwargs(tester_kwargs: Dict, workers: int, worker_id: int) -> Dict:
+    """shard_tester_kwargs for a worker on another host, limited to the settings agents accept.
     
-    parser.add_argument(
-        "--rpc-url",
-        default="https://rpc.berachain.com/",
-        help="Berachain RPC URL to test (default: https://rpc.berachain.com/)"
-    )
+    Local file outputs stay with the coordinator: the depth table is exported
+    from the merged statistics, and client profiles aren't taken remotely.
+    """
+    shard = shard_tester_kwargs(tester_kwargs, workers, worker_id)
+    return {name: value for name, value in shard.items() if name in AGENT_TESTER_KWARGS}
+
+def encode_tester_kwargs(tester_kwargs: Dict) -> Dict:
+    """JSON-serializable tester kwargs, for sending a shard to a worker agent"""
+    encoded = dict(tester_kwargs)
+    for name in ("load_profile", "block_distribution"):
+        if encoded.get(name) is not None:
+            encoded[name] = asdict(encoded[name])
+    return encoded
+
+def decode_tester_kwargs(encoded: Dict) -> Dict:
+    tester_kwargs = dict(encoded)
+    if tester_kwargs.get("load_profile") is not None:
+        tester_kwargs["load_profile"] = LoadProfile(**tester_kwargs["load_profile"])
+    if tester_kwargs.get("block_distribution") is not None:
+        tester_kwargs["block_distribution"] = BlockDistribution(**tester_kwargs["block_distribution"])
+    return tester_kwargs
+
+def interval_to_dict(snapshot: Dict) -> Dict:
+    """JSON-serializable interval snapshot (see IntervalRecorder.flush)"""
+    data = dict(snapshot)
+    for name in ("latencies", "corrected_latencies", "loop_lags"):
+        data[name] = snapshot[name].to_dict()
+    data["by_type"] = {call_type: dict(entry, latencies=entry["latencies"].to_dict())
+                       for call_type, entry in snapshot["by_type"].items()}
+    return data
+
+def interval_from_dict(data: Dict) -> Dict:
+    snapshot = dict(data)
+    for name in ("latencies", "corrected_latencies", "loop_lags"):
+        snapshot[name] = LatencyHistogram.from_dict(data[name])
+    snapshot["by_type"] = {call_type: dict(entry, latencies=LatencyHistogram.from_dict(entry["latencies"]))
+                           for call_type, entry in data["by_type"].items()}
+    return snapshot
+
+def find_saturation_knee(tester_kwargs: Dict, step_duration: int, slo_p99_ms: float,
+                         slo_error_rate: float, growth: float = 1.5, refine: int = 3,
+                         max_rate: Optional[float] = None, workers: int = 1, cooldown: float = 5.0):
+    """Raise the offered rate until p99 or error rate breaks the SLO, then bisect the knee.
     
-    parser.add_argument(
-        "--duration",
-        type=int,
-        default=60,
-        help="Test duration in seconds (default: 60)"
-    )
+    Every step is a separate open-loop run at a constant rate, judged on
+    corrected p99 so that a node falling behind cannot hide its queueing.
+    Returns every step's run for the history, as (tester, settings, completed).
+    """
+    steps = []
+    runs = []
     
-    parser.add_argument(
-        "--concurrent",
-        type=int,
-        default=50,
-        help="Maximum concurrent requests (default: 50)"
-    )
+    def measure(rate: float) -> bool:
+        logger.info(f"Knee search: offering {rate:.1f} calls/second for {step_duration} seconds")
+        step_kwargs = dict(tester_kwargs, rate=rate, load_profile=None)
+        tester = BerachainRPCTester(**step_kwargs)
+        if workers > 1:
+            tester.run_multiprocess(step_duration, workers, step_kwargs)
+        else:
+            asyncio.run(tester.run_test(step_duration, report=False))
+        stats = tester.stats
+        p99 = stats.corrected_latencies.percentile(99)
+        error_rate = stats.failed_calls / stats.total_calls if stats.total_calls else 1.0
+        passed = p99 * 1000 <= slo_p99_ms and error_rate <= slo_error_rate
+        steps.append((rate, stats, p99, error_rate, passed))
+        runs.append((tester, {"rate": rate, "load_profile": None}, True))
+        logger.info(f"Knee search: {rate:.1f} calls/second -> p99 {p99*1000:.1f} ms, "
+                    f"errors {error_rate:.2%}, {'PASS' if passed else 'FAIL'}")
+        for reason in stats.client_bound_reasons():
+            logger.warning(f"Knee search: {rate:.1f} calls/second may be client-bound: {reason}")
+        time.sleep(cooldown)
+        return passed
     
-    parser.add_argument(
-        "--verbose",
-        action="store_true",
-        help="Enable verbose logging"
-    )
+    last_pass, first_fail = None, None
+    rate = tester_kwargs.get("rate") or 50.0
+    try:
+        while True:
+            if not measure(rate):
+                first_fail = rate
+                break
+            last_pass = rate
+            if max_rate and rate >= max_rate:
+                break
+            rate = min(rate * growth, max_rate) if max_rate else rate * growth
+        
+        # Narrow down between the last passing and first failing rate
+        for _ in range(refine if last_pass and first_fail else 0):
+            midpoint = (last_pass + first_fail) / 2
+            if measure(midpoint):
+                last_pass = midpoint
+            else:
+                first_fail = midpoint
+    except KeyboardInterrupt:
+        print("\nKnee search interrupted by user")
     
-    parser.add_argument(
-        "--archive",
-        action="store_true",
-        help="Enable archive node testing with historical queries"
-    )
+    print("\n" + "="*80)
+    print("BERACHAIN RPC SATURATION KNEE SEARCH")
+    print("="*80)
+    print(f"SLO: p99 <= {slo_p99_ms:g} ms (corrected) and error rate <= {slo_error_rate:.2%}")
+    print(f"\n{'Offered/s':>10} {'Achieved/s':>11} {'Errors':>8} {'p50 ms':>9} {'p99 ms':>9}  Result")
+    print("-" * 62)
+    for rate, stats, p99, error_rate, passed in sorted(steps, key=lambda step: step[0]):
+        achieved = stats.successful_calls / stats.total_time if stats.total_time > 0 else 0
+        print(f"{rate:>10.1f} {achieved:>11.1f} {error_rate:>8.2%} "
+              f"{stats.corrected_latencies.percentile(50)*1000:>9.2f} {p99*1000:>9.2f}  "
+              f"{'PASS' if passed else 'FAIL'}")
     
-    parser.add_argument(
-        "--archive-blocks",
-        type=int,
-        default=3_000_000,
-        help="Number of blocks back to test for archive queries (default: 3,000,000)"
-    )
+    print()
+    if last_pass is None:
+        print(f"Knee is below the starting rate of {steps[0][0]:.1f} calls/second - lower --rate and retry"
+              if steps else "No steps completed")
+    elif first_fail is None:
+        print(f"No SLO violation up to {last_pass:.1f} calls/second - raise --end-rate to search further")
+    else:
+        print(f"Max sustainable throughput: ~{last_pass:.1f} calls/second "
+              f"(SLO broken at {first_fail:.1f} calls/second)")
+    print("="*80)
+    return runs
+
+def run_transport_comparison(tester_kwargs: Dict, duration: int, workers: int = 1):
+    """Run the same test over HTTP and then WebSocket and compare them; returns the runs for the history"""
+    rows = []
+    runs = []
+    try:
+        for transport in ("http", "ws"):
+            logger.info(f"Transport comparison: running over {transport.upper()} for {duration} seconds")
+            step_kwargs = dict(tester_kwargs, transport=transport)
+            tester = BerachainRPCTester(**step_kwargs)
+            if workers > 1:
+                tester.run_multiprocess(duration, workers, step_kwargs)
+                tester.print_results()
+            else:
+                asyncio.run(tester.run_test(duration))
+            rows.append((transport.upper(), tester.stats))
+            runs.append((tester, {"transport": transport}, True))
+    except KeyboardInterrupt:
+        print("\nComparison interrupted by user")
     
-    args = parser.parse_args()
+    print("\n" + "="*80)
+    print("HTTP VS WEBSOCKET COMPARISON")
+    print("="*80)
+    print(f"{'Transport':<10} {'Calls/s':>10} {'Success':>8} {'p50 ms':>9} {'p90 ms':>9} "
+          f"{'p99 ms':>9} {'p99.9 ms':>9}")
+    print("-" * 70)
+    for label, stats in rows:
+        if stats.total_time <= 0 or stats.total_calls == 0:
+            continue
+        latencies = stats.latencies
+        print(f"{label:<10} {stats.successful_calls / stats.total_time:>10.2f} "
+              f"{stats.successful_calls / stats.total_calls:>8.1%} "
+              f"{latencies.percentile(50)*1000:>9.2f} {latencies.percentile(90)*1000:>9.2f} "
+              f"{latencies.percentile(99)*1000:>9.2f} {latencies.percentile(99.9)*1000:>9.2f}")
+    print("="*80)
+    return runs
+
+def run_endpoint_comparison(tester_kwargs: Dict, urls: List[str], duration: int):
+    """Drive the same request schedule against several endpoints at once and compare them.
     
-    if args.verbose:
+    Every endpoint gets its own tester with the same seed and the same pinned head
+    (the lowest head among the endpoints), so they pick the same calls, blocks and
+    transactions in the same order. Returns one run per endpoint for the history.
+    """
+    if tester_kwargs.get("seed") is None:
+        tester_kwargs = dict(tester_kwargs, seed=random.randrange(2**32))
+    testers = []
+    for index, url in enumerate(urls):
+        metrics_port = tester_kwargs.get("metrics_port")
+        # One profiler per process: the first tester's capture covers the whole shared event loop
+        testers.append(BerachainRPCTester(**dict(tester_kwargs, rpc_url=url, ws_url=None,
+                                                 metrics_port=metrics_port + index if metrics_port else None,
+                                                 client_profile_path=tester_kwargs.get("client_profile_path")
+                                                 if index == 0 else None)))
+    for tester in testers:
+        tester.response_digests = {}
+    heads: List[Optional[int]] = []
+    
+    async def run_all():
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10), headers=JSON_HEADERS) as session:
+            heads.extend(await asyncio.gather(*(tester.get_current_block(session) for tester in testers)))
+        pinned = tester_kwargs.get("archive_head") or min((head for head in heads if head is not None), default=None)
+        if pinned is not None:
+            logger.info(f"Endpoint comparison: seed {tester_kwargs['seed']}, head pinned at block {pinned:,}")
+            for tester in testers:
+                tester.archive_head = pinned
+        await asyncio.gather(*(tester.run_test(duration, report=False) for tester in testers))
+    
+    completed = True
+    try:
+        asyncio.run(run_all())
+    except KeyboardInterrupt:
+        print("\nComparison interrupted by user")
+        completed = False
+    
+    labels = [f"#{index}" for index in range(1, len(urls) + 1)]
+    stats_list = [tester.stats for tester in testers]
+    call_types = sorted(set().union(*(stats.calls_by_type.keys() for stats in stats_list)))
+    label_width = max([20] + [len(call_type) for call_type in call_types]) + 2
+    width = label_width + 14 * len(testers)
+    
+    def table_row(label: str, values: List[str]):
+        print(f"{label:<{label_width}}" + "".join(f"{value:>14}" for value in values))
+    
+    print("\n" + "="*80)
+    print("ENDPOINT COMPARISON")
+    print("="*80)
+    for label, url in zip(labels, urls):
+        print(f"{label}: {url}")
+    print(f"Seed: {testers[0].seed} (rerun with --seed to repeat the schedule)")
+    print()
+    table_row("", labels)
+    print("-" * width)
+    
+    top = max((head for head in heads if head is not None), default=None)
+    if heads:
+        table_row("Head at start", [f"{head:,}" if head is not None else "n/a" for head in heads])
+        table_row("Blocks behind", [f"{top - head:,}" if head is not None else "n/a" for head in heads])
+    table_row("Calls", [f"{stats.total_calls:,}" for stats in stats_list])
+    table_row("Success calls/s", [f"{stats.successful_calls / stats.total_time:.2f}" if stats.total_time else "n/a"
+                                  for stats in stats_list])
+    table_row("Success rate", [f"{stats.successful_calls / stats.total_calls:.2%}" if stats.total_calls else "n/a"
+                               for stats in stats_list])
+    for pct in (50, 90, 99, 99.9):
+        table_row(f"p{pct:g} ms", [f"{stats.latencies.percentile(pct)*1000:.2f}" for stats in stats_list])
+    table_row("Max ms", [f"{stats.latencies.max()*1000:.2f}" for stats in stats_list])
+    if tester_kwargs.get("rate"):
+        table_row("Corrected p99 ms", [f"{stats.corrected_latencies.percentile(99)*1000:.2f}" for stats in stats_list])
+    if any(stats.historical_calls for stats in stats_list):
+        table_row("Historical success", [f"{stats.historical_successful / stats.historical_calls:.2%}"
+                                         if stats.historical_calls else "n/a" for stats in stats_list])
+        table_row("Historical p99 ms", [f"{stats.historical_latencies.percentile(99)*1000:.2f}"
+                                        for stats in stats_list])
+    if any(stats.rate_limited_calls for stats in stats_list):
+        table_row("Rate limited", [f"{stats.rate_limited_calls / stats.total_calls:.2%}" if stats.total_calls else "n/a"
+                                   for stats in stats_list])
+        table_row("Ceiling calls/s", [f"{stats.rate_limit_ceilings['all']:.0f}" if "all" in stats.rate_limit_ceilings
+                                      else "n/a" for stats in stats_list])
+    table_row("Avg KB", [f"{stats.response_bytes / stats.successful_calls / 1024:.2f}" if stats.successful_calls
+                         else "n/a" for stats in stats_list])
+    
+    if call_types:
+        print(f"\nP99 MS BY CALL TYPE:")
+        table_row("Call Type", labels)
+        print("-" * width)
+        for call_type in call_types:
+            table_row(call_type, [f"{stats.latencies_by_type[call_type].percentile(99)*1000:.2f}"
+                                       if call_type in stats.latencies_by_type else "n/a" for stats in stats_list])
+    
+    if any(stats.error_types for stats in stats_list):
+        print(f"\nTOP ERRORS:")
+        for label, stats in zip(labels, stats_list):
+            for error_type, count in sorted(stats.error_types.items(), key=lambda x: x[1], reverse=True)[:3]:
+                print(f"{label:<4} {error_type[:60]:<60} {count:>8,} ({count / stats.total_calls:.1%})")
+    
+    # Results pinned to a block or transaction hash must match the first endpoint's
+    reference = testers[0].response_digests
+    print(f"\nRESULT CONSISTENCY (vs #1, results at explicit blocks and transaction hashes):")
+    print(f"{'Endpoint':<10} {'Compared':>10} {'Mismatched':>12}  Mismatched calls")
+    print("-" * 80)
+    examples = []
+    for label, tester in zip(labels[1:], testers[1:]):
+        digests = tester.response_digests
+        common = reference.keys() & digests.keys()
+        mismatched = sorted(key for key in common if reference[key][1] != digests[key][1])
+        by_call = defaultdict(int)
+        for key in mismatched:
+            by_call[reference[key][0]] += 1
+        summary = ", ".join(f"{name} x{count}" for name, count in sorted(by_call.items(), key=lambda x: -x[1])[:3])
+        print(f"{label:<10} {len(common):>10,} {len(mismatched):>12,}  {summary or '-'}")
+        examples.extend((label, key) for key in mismatched[:3])
+    if not any(reference.keys() & tester.response_digests.keys() for tester in testers[1:]):
+        print("Nothing to compare: only results at an explicit block or transaction are compared, "
+              "so use --archive or a range/trace workload")
+    for label, key in examples:
+        print(f"  {label} differs from #1 on {key[:140]}")
+    print("="*80)
+    return [(tester, {"rpc_url": url, "seed": tester_kwargs["seed"]}, completed) for tester, url in zip(testers, urls)]
+
+def run_batch_sweep(tester_kwargs: Dict, batch_sizes: List[int], duration: int, workers: int = 1):
+    """Run the test once per batch size and print a comparison table; returns the runs for the history"""
+    rows = []
+    runs = []
+    try:
+        for batch_size in batch_sizes:
+            logger.info(f"Batch sweep: running batch size {batch_size} for {duration} seconds")
+            step_kwargs = dict(tester_kwargs, batch_size=batch_size)
+            tester = BerachainRPCTester(**step_kwargs)
+            if workers > 1:
+                tester.run_multiprocess(duration, workers, step_kwargs)
+            else:
+                asyncio.run(tester.run_test(duration, report=False))
+            rows.append((batch_size, tester.stats))
+            runs.append((tester, {"batch_size": batch_size}, True))
+    except KeyboardInterrupt:
+        print("\nSweep interrupted by user")
+    
+    print("\n" + "="*80)
+    print("BERACHAIN RPC BATCH SIZE SWEEP RESULTS")
+    print("="*80)
+    print(f"{'Batch':>6} {'HTTP req/s':>11} {'Calls/s':>10} {'Success':>8} "
+          f"{'p50 ms':>9} {'p99 ms':>9} {'ms/call':>8}")
+    print("-" * 66)
+    best = max((stats.successful_calls / stats.total_time for _, stats in rows if stats.total_time > 0),
+               default=0)
+    for batch_size, stats in rows:
+        if stats.total_time <= 0 or stats.total_calls == 0:
+            continue
+        # Batch size 1 sends plain objects, so its per-request latency is the call latency
+        per_request = stats.batch_latencies if batch_size > 1 else stats.latencies
+        requests = stats.batches_sent if batch_size > 1 else stats.total_calls
+        calls_per_second = stats.successful_calls / stats.total_time
+        marker = "  <- best" if calls_per_second == best else ""
+        print(f"{batch_size:>6} {requests / stats.total_time:>11.2f} {calls_per_second:>10.2f} "
+              f"{stats.successful_calls / stats.total_calls:>8.1%} "
+              f"{per_request.percentile(50)*1000:>9.2f} {per_request.percentile(99)*1000:>9.2f} "
+              f"{per_request.percentile(50)*1000 / batch_size:>8.3f}{marker}")
+    print("\nCalls/s counts successful calls only; latencies are per HTTP request.")
+    print("="*80)
+    return runs
+
+def run_logs_sweep(tester_kwargs: Dict, range_sizes: List[int], duration: int, workers: int = 1,
+                   slo_p99_ms: float = 500, slo_error_rate: float = 0.01):
+    """Run the range-call workload once per block range size and print a comparison table.
+    
+    Returns the runs for the history.
+    """
+    rows = []
+    runs = []
+    try:
+        for range_size in range_sizes:
+            logger.info(f"Logs sweep: running {range_size}-block ranges for {duration} seconds")
+            step_kwargs = dict(tester_kwargs, block_range=range_size)
+            tester = BerachainRPCTester(**step_kwargs)
+            if not any(call.block_range for call in tester.rpc_calls):
+                print("Error: The workload has no range calls (block_range with ${from_block})")
+                return runs
+            if workers > 1:
+                tester.run_multiprocess(duration, workers, step_kwargs)
+            else:
+                asyncio.run(tester.run_test(duration, report=False))
+            rows.append((range_size, tester.stats))
+            runs.append((tester, {"block_range": range_size}, True))
+    except KeyboardInterrupt:
+        print("\nSweep interrupted by user")
+    
+    print("\n" + "="*80)
+    print("BERACHAIN RPC LOG RANGE SWEEP RESULTS")
+    print("="*80)
+    print(f"{'Blocks':>8} {'Calls/s':>9} {'Errors':>8} {'p50 ms':>9} {'p99 ms':>10} {'Avg KB':>9} {'Max KB':>9}")
+    print("-" * 68)
+    safe_range = None
+    for range_size, stats in rows:
+        if stats.total_time <= 0 or stats.total_calls == 0:
+            continue
+        error_rate = stats.failed_calls / stats.total_calls
+        p99 = stats.latencies.percentile(99) * 1000
+        average_kb = stats.response_bytes / stats.successful_calls / 1024 if stats.successful_calls else 0
+        within_slo = stats.successful_calls > 0 and error_rate <= slo_error_rate and p99 <= slo_p99_ms
+        if within_slo and (safe_range is None or range_size > safe_range):
+            safe_range = range_size
+        print(f"{range_size:>8,} {stats.total_calls / stats.total_time:>9.2f} {error_rate:>8.1%} "
+              f"{stats.latencies.percentile(50)*1000:>9.2f} {p99:>10.2f} {average_kb:>9.2f} "
+              f"{stats.max_response_size / 1024:>9.2f}{'' if within_slo else '  <- over SLO'}")
+    
+    call_names = sorted({name for _, stats in rows for name in stats.calls_by_type})
+    if call_names and rows:
+        print(f"\nP99 MS / AVG KB BY FILTER:")
+        print(f"{'Call Type':<28}" + "".join(f"{range_size:>18,}" for range_size, _ in rows))
+        print("-" * (28 + 18 * len(rows)))
+        for name in call_names:
+            cells = []
+            for _, stats in rows:
+                success = stats.successful_by_type.get(name, 0)
+                if not success:
+                    cells.append(f"{'errors':>18}" if stats.calls_by_type.get(name) else f"{'-':>18}")
+                    continue
+                p99 = stats.latencies_by_type[name].percentile(99) * 1000
+                average_kb = stats.response_bytes_by_type.get(name, 0) / success / 1024
+                cells.append(f"{f'{p99:.1f} / {average_kb:.1f}':>18}")
+            print(f"{name:<28}" + "".join(cells))
+    
+    failing = [(range_size, stats) for range_size, stats in rows if stats.error_types]
+    if failing:
+        print(f"\nMOST COMMON ERROR BY RANGE:")
+        for range_size, stats in failing:
+            # Circuit breaker rejections hide the node's own error, so prefer the latter
+            errors = {e: c for e, c in stats.error_types.items() if e != "Circuit breaker open"} or stats.error_types
+            error, count = max(errors.items(), key=lambda x: x[1])
+            print(f"{range_size:>8,}  {error[:60]} ({count:,})")
+    
+    print(f"\nSLO: p99 <= {slo_p99_ms:g} ms and errors <= {slo_error_rate:.1%} (set with --slo-p99-ms, --slo-error-rate)")
+    if safe_range is not None:
+        print(f"Largest range within SLO: {safe_range:,} blocks")
+    else:
+        print("No range size met the SLO")
+    print("="*80)
+    return runs
+
+class RunHistory:
+    """Test runs stored in a local SQLite database, for comparing node versions over time.
+    
+    Each run keeps its settings, the environment it ran in, the node's
+    web3_clientVersion and the full TestStats (histograms included) as JSON,
+    plus summary columns and a per-call table for querying with plain SQL.
+    """
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        started_at TEXT NOT NULL,
+        label TEXT,
+        rpc_url TEXT NOT NULL,
+        network TEXT,
+        workload TEXT,
+        client_version TEXT,
+        completed INTEGER NOT NULL,
+        duration REAL,
+        total_calls INTEGER,
+        error_rate REAL,
+        throughput REAL,
+        p50_ms REAL,
+        p99_ms REAL,
+        config TEXT,
+        environment TEXT,
+        stats TEXT
+    );
+    CREATE TABLE IF NOT EXISTS call_stats (
+        run_id INTEGER NOT NULL REFERENCES runs(id),
+        call_name TEXT NOT NULL,
+        calls INTEGER,
+        error_rate REAL,
+        p50_ms REAL,
+        p99_ms REAL,
+        avg_bytes REAL,
+        PRIMARY KEY (run_id, call_name)
+    );
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(self.SCHEMA)
+    
+    def close(self):
+        self.db.close()
+    
+    @staticmethod
+    def environment() -> Dict:
+        return {
+            "hostname": socket.gethostname(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "aiohttp": aiohttp.__version__,
+            "orjson": orjson is not None,
+            "cpu_count": os.cpu_count(),
+        }
+    
+    def save(self, tester: "BerachainRPCTester", config: Dict, label: Optional[str] = None,
+             completed: bool = True) -> int:
+        """Store a finished (or interrupted) run and return its id"""
+        stats = tester.stats
+        started_at = datetime.fromtimestamp(getattr(tester, "test_start_time", time.time()))
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (started_at, label, rpc_url, network, workload, client_version, completed, "
+                "duration, total_calls, error_rate, throughput, p50_ms, p99_ms, config, environment, stats) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (started_at.isoformat(timespec="seconds"), label, tester.rpc_url, tester.network,
+                 tester.workload["name"], tester.client_version, int(completed), stats.total_time,
+                 stats.total_calls, stats.failed_calls / stats.total_calls if stats.total_calls else None,
+                 stats.successful_calls / stats.total_time if stats.total_time else None,
+                 stats.latencies.percentile(50) * 1000, stats.latencies.percentile(99) * 1000,
+                 json.dumps(config, default=str), json.dumps(self.environment()), json.dumps(stats.to_dict()))
+            )
+            run_id = cursor.lastrowid
+            for call_name, calls in stats.calls_by_type.items():
+                successes = stats.successful_by_type.get(call_name, 0)
+                histogram = stats.latencies_by_type.get(call_name) or stats.new_histogram()
+                self.db.execute(
+                    "INSERT INTO call_stats VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, call_name, calls, (calls - successes) / calls,
+                     histogram.percentile(50) * 1000, histogram.percentile(99) * 1000,
+                     stats.response_bytes_by_type.get(call_name, 0) / successes if successes else None)
+                )
+        return run_id
+    
+    def find(self, reference: str) -> Optional[sqlite3.Row]:
+        """A run by id, "latest", or label (the most recent run with that label)"""
+        if reference == "latest":
+            return self.db.execute("SELECT * FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        if reference.isdigit():
+            return self.db.execute("SELECT * FROM runs WHERE id = ?", (int(reference),)).fetchone()
+        return self.db.execute("SELECT * FROM runs WHERE label = ? ORDER BY id DESC LIMIT 1",
+                               (reference,)).fetchone()
+    
+    def recent(self, limit: int = 20) -> List[sqlite3.Row]:
+        return self.db.execute("SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+
+def save_runs(args: argparse.Namespace, runs: List[Tuple["BerachainRPCTester", Dict, bool]]):
+    """Save runs to the --history database, unless --no-history.
+    
+    Each run is (tester, settings, completed), where settings are what a
+    sweep or comparison step changed from the command line, e.g. its batch
+    size. They are stored over the command-line settings and shown.
+    """
+    runs = [run for run in runs if run[0].stats.total_calls > 0]
+    if args.no_history or not runs:
+        return
+    path = os.path.abspath(args.history)
+    try:
+        history = RunHistory(path)
+        try:
+            for tester, settings, completed in runs:
+                run_id = history.save(tester, dict(vars(args), **settings), args.label, completed)
+                step = ", ".join(f"{name}={value}" for name, value in settings.items() if value is not None)
+                print(f"Saved as run #{run_id} in {path}" + (f" ({step})" if step else ""))
+        finally:
+            history.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not save run to {path}: {e}")
+
+def print_run_list(history: RunHistory, limit: int = 20):
+    """Most recent runs in the history database, newest first"""
+    print(f"{'ID':>5} {'Started':<19} {'Label':<16} {'Node version':<28} {'Calls':>9} {'Errors':>7} "
+          f"{'p50 ms':>8} {'p99 ms':>8}")
+    print("-" * 107)
+    for run in history.recent(limit):
+        flag = "" if run["completed"] else "  (interrupted)"
+        error_rate = f"{run['error_rate']:.2%}" if run["error_rate"] is not None else "n/a"
+        print(f"{run['id']:>5} {run['started_at'].replace('T', ' '):<19} {(run['label'] or '-')[:16]:<16} "
+              f"{(run['client_version'] or '-')[:28]:<28} {run['total_calls']:>9,} {error_rate:>7} "
+              f"{run['p50_ms']:>8.2f} {run['p99_ms']:>8.2f}{flag}")
+
+def bootstrap_percentile_change(baseline: LatencyHistogram, candidate: LatencyHistogram, pct: float,
+                                replicates: int = 2000, rng: Optional[random.Random] = None
+                                ) -> Tuple[float, float, float]:
+    """Change of a latency percentile between two runs, with a 95% bootstrap confidence interval.
+    
+    Resampling n calls and taking the p-th percentile picks, in effect, the call
+    at a random rank that follows a Beta(k, n - k + 1) distribution (k = p% of n).
+    Each replicate draws that rank for both runs and reads the latencies at
+    those ranks from the histograms, which is the same bootstrap without
+    materializing millions of samples. Returns (change, low, high) in seconds.
+    """
+    rng = rng or random.Random(0)
+    
+    def resampled(histogram: LatencyHistogram) -> float:
+        n = len(histogram)
+        k = min(n, max(1, math.ceil(pct / 100 * n)))
+        return histogram.percentile(rng.betavariate(k, n - k + 1) * 100)
+    
+    changes = sorted(resampled(candidate) - resampled(baseline) for _ in range(replicates))
+    point = candidate.percentile(pct) - baseline.percentile(pct)
+    return point, changes[int(0.025 * replicates)], changes[int(0.975 * replicates) - 1]
+
+def error_rate_change(baseline: TestStats, candidate: TestStats) -> Tuple[float, float, float]:
+    """Change of the error rate between two runs, with a 95% normal-approximation interval"""
+    p1 = baseline.failed_calls / baseline.total_calls
+    p2 = candidate.failed_calls / candidate.total_calls
+    margin = 1.96 * math.sqrt(p1 * (1 - p1) / baseline.total_calls + p2 * (1 - p2) / candidate.total_calls)
+    return p2 - p1, p2 - p1 - margin, p2 - p1 + margin
+
+def compare_runs(history: RunHistory, baseline_ref: str, candidate_ref: str, threshold: float = 0.10) -> bool:
+    """Diff a run against a baseline and print the verdict. Returns True if it regressed.
+    
+    A latency percentile regresses when it grew by more than threshold and its
+    whole confidence interval is above zero, so noise alone doesn't fail a run;
+    the error rate likewise, by more than threshold of the baseline (at least
+    0.1 percentage points). Closed-loop throughput has no interval and is
+    flagged on the threshold alone.
+    """
+    runs = {}
+    for role, reference in (("baseline", baseline_ref), ("candidate", candidate_ref)):
+        run = history.find(reference)
+        if run is None:
+            raise ValueError(f"No run '{reference}' in {history.path}")
+        runs[role] = run
+    baseline_run, candidate_run = runs["baseline"], runs["candidate"]
+    baseline, candidate = (TestStats.from_dict(json.loads(run["stats"])) for run in (baseline_run, candidate_run))
+    if not baseline.total_calls or not candidate.total_calls:
+        raise ValueError("Both runs need at least one call")
+    rng = random.Random(0)
+    regressions = []
+    
+    print("\n" + "="*80)
+    print("RUN COMPARISON")
+    print("="*80)
+    for role, run in (("Baseline", baseline_run), ("Candidate", candidate_run)):
+        print(f"{role + ':':<11} #{run['id']} {run['started_at'].replace('T', ' ')} "
+              f"{run['label'] or ''} {run['client_version'] or 'unknown version'}".rstrip())
+        print(f"{'':<11} {run['rpc_url']}, workload {run['workload']}, {run['duration']:.0f} s, "
+              f"{run['total_calls']:,} calls{'' if run['completed'] else ' (interrupted)'}")
+    
+    # Runs are only comparable under the same load
+    baseline_config, candidate_config = json.loads(baseline_run["config"]), json.loads(candidate_run["config"])
+    differing = [key for key in ("workload", "network", "rate", "concurrent", "archive", "archive_blocks",
+                                 "block_distribution", "batch_size", "transport", "load_profile", "workers")
+                 if baseline_config.get(key) != candidate_config.get(key)]
+    if differing:
+        print(f"Warning: the runs used different settings ({', '.join(differing)}); differences may not be "
+              f"the node's")
+    
+    print(f"\n{'Metric':<25} {'Baseline':>10} {'Candidate':>10} {'Change':>9}  {'95% CI of change':<22} Verdict")
+    print("-" * 93)
+    
+    def latency_row(label: str, base: LatencyHistogram, cand: LatencyHistogram, pct: float) -> bool:
+        if not len(base) or not len(cand):
+            return False
+        change, low, high = bootstrap_percentile_change(base, cand, pct, rng=rng)
+        reference = base.percentile(pct)
+        relative = change / reference if reference else 0.0
+        regressed = low > 0 and relative > threshold
+        improved = high < 0 and -relative > threshold
+        verdict = "REGRESSION" if regressed else ("improved" if improved else "ok")
+        print(f"{label:<25} {reference*1000:>10.2f} {cand.percentile(pct)*1000:>10.2f} {relative:>+9.1%}  "
+              f"{f'{low*1000:+.2f} to {high*1000:+.2f} ms':<22} {verdict}")
+        return regressed
+    
+    for pct in (50, 99):
+        if latency_row(f"p{pct} ms", baseline.latencies, candidate.latencies, pct):
+            regressions.append(f"p{pct} latency")
+    
+    change, low, high = error_rate_change(baseline, candidate)
+    base_rate = baseline.failed_calls / baseline.total_calls
+    regressed = low > 0 and change > max(threshold * base_rate, 0.001)
+    print(f"{'Error rate':<25} {base_rate:>10.2%} {base_rate + change:>10.2%} {change*100:>+7.2f}pp  "
+          f"{f'{low*100:+.2f} to {high*100:+.2f} pp':<22} {'REGRESSION' if regressed else 'ok'}")
+    if regressed:
+        regressions.append("error rate")
+    
+    if not baseline_config.get("rate") and baseline.total_time and candidate.total_time:
+        # Closed-loop: throughput is an outcome, not the offered load
+        base_tput = baseline.successful_calls / baseline.total_time
+        cand_tput = candidate.successful_calls / candidate.total_time
+        relative = cand_tput / base_tput - 1 if base_tput else 0.0
+        regressed = relative < -threshold
+        print(f"{'Success calls/s':<25} {base_tput:>10.2f} {cand_tput:>10.2f} {relative:>+9.1%}  {'n/a':<22} "
+              f"{'REGRESSION' if regressed else 'ok'}")
+        if regressed:
+            regressions.append("throughput")
+    
+    if baseline.historical_latencies and candidate.historical_latencies:
+        if latency_row("Historical p99 ms", baseline.historical_latencies, candidate.historical_latencies, 99):
+            regressions.append("historical p99 latency")
+    
+    common = sorted(set(baseline.latencies_by_type) & set(candidate.latencies_by_type))
+    if common:
+        print(f"\nP99 BY CALL TYPE:")
+        print(f"{'Call Type':<25} {'Baseline':>10} {'Candidate':>10} {'Change':>9}  {'95% CI of change':<22} Verdict")
+        print("-" * 93)
+        regressed_calls = [call_type for call_type in common
+                           if latency_row(call_type[:25], baseline.latencies_by_type[call_type],
+                                          candidate.latencies_by_type[call_type], 99)]
+        if regressed_calls:
+            regressions.append(f"p99 of {len(regressed_calls)} call type{'s' if len(regressed_calls) > 1 else ''}")
+    
+    print(f"\nThreshold: {threshold:.0%} change with a 95% confidence interval excluding zero")
+    if regressions:
+        print(f"Result: REGRESSION in {', '.join(regressions)}")
+    else:
+        print(f"Result: no regression")
+    print("="*80)
+    return bool(regressions)
+
+def load_checkpoint(path: str) -> "BerachainRPCTester":
+    """Rebuild a --soak run from its checkpoint file, e.g. after the tester crashed, for print_results"""
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if not checkpoint.get("tester_kwargs"):
+        raise ValueError(f"{path} is not a soak checkpoint")
+    tester_kwargs = decode_tester_kwargs(checkpoint["tester_kwargs"])
+    tester_kwargs.update(soak_window=checkpoint["window"], checkpoint_path=None,
+                         drift_threshold=checkpoint["threshold"])
+    tester = BerachainRPCTester(**tester_kwargs)
+    tester.stats = TestStats.from_dict(checkpoint["stats"])
+    tester.duration = checkpoint["duration"]
+    tester.client_version = checkpoint["client_version"]
+    tester.soak.windows.extend(checkpoint["windows"])
+    tester.soak.closed = len(checkpoint["windows"])
+    return tester
+
+def run_worker_process(worker_id: int, tester_kwargs: Dict, duration: int, results_queue, log_level: int,
+                       start_at: Optional[float] = None):
+    """Entry point of a --workers child process, or of one shard on a worker agent"""
+    # Keep per-worker chatter down; warnings still come through
+    logging.getLogger().setLevel(max(log_level, logging.WARNING))
+    tester = BerachainRPCTester(**tester_kwargs)
+    if start_at is not None:
+        # Distributed runs: every host starts on the coordinator's wall-clock time
+        if start_at < time.time():
+            logger.warning(f"Worker {worker_id} started {time.time() - start_at:.1f} s late - "
+                           f"check clock sync or raise --start-delay")
+        time.sleep(max(0.0, start_at - time.time()))
+    try:
+        asyncio.run(tester.run_as_worker(duration, worker_id, results_queue))
+    except KeyboardInterrupt:
+        pass
+
+class WorkerAgent:
+    """Runs load shards for a coordinator on another host (--worker-listen).
+    
+    POST /run takes a job (shard kwargs, duration, start time and workload
+    file) and answers with a stream of JSON lines: the snapshot and interval
+    messages that local --workers processes send their parent. One job runs
+    at a time, and its processes are stopped if the coordinator goes away.
+    GET /status says whether a job is running.
+    """
+    
+    def __init__(self, token: Optional[str] = None):
+        self.token = token
+        self.busy = False
+    
+    def authorized(self, request: web.Request) -> bool:
+        if not self.token:
+            return True
+        # Constant-time comparison, so response timing doesn't leak the token
+        return hmac.compare_digest(request.headers.get("Authorization", "").encode(),
+                                   f"Bearer {self.token}".encode())
+    
+    @staticmethod
+    def shard_kwargs(encoded: Dict, workload_path: Optional[str]) -> Dict:
+        """Tester kwargs for one shard: only AGENT_TESTER_KWARGS are taken from the job"""
+        ignored = sorted(name for name, value in encoded.items() if name not in AGENT_TESTER_KWARGS and value)
+        if ignored:
+            logger.warning(f"Ignoring coordinator settings the agent doesn't accept: {', '.join(ignored)}")
+        tester_kwargs = decode_tester_kwargs({name: value for name, value in encoded.items()
+                                              if name in AGENT_TESTER_KWARGS})
+        tester_kwargs["workload"] = workload_path
+        return tester_kwargs
+    
+    async def handle_status(self, request: web.Request) -> web.Response:
+        if not self.authorized(request):
+            return web.Response(status=401, text="bad or missing token")
+        return web.json_response({"busy": self.busy, "cpu_count": os.cpu_count(), "hostname": socket.gethostname()})
+    
+    async def handle_run(self, request: web.Request) -> web.StreamResponse:
+        if not self.authorized(request):
+            return web.Response(status=401, text="bad or missing token")
+        if self.busy:
+            return web.Response(status=409, text="a job is already running")
+        job = await request.json()
+        self.busy = True
+        ctx = multiprocessing.get_context("spawn")
+        results_queue = ctx.Queue()
+        processes = []
+        workload_path = None
+        loop = asyncio.get_running_loop()
+        try:
+            if job.get("workload"):
+                suffix = os.path.splitext(job["workload"]["name"])[1]
+                with tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False) as f:
+                    f.write(job["workload"]["content"])
+                workload_path = f.name
+            for shard in job["shards"]:
+                tester_kwargs = self.shard_kwargs(shard["kwargs"], workload_path)
+                process = ctx.Process(
+                    target=run_worker_process,
+                    args=(shard["worker_id"], tester_kwargs, job["duration"], results_queue,
+                          job.get("log_level", logging.INFO), job.get("start_at")),
+                    daemon=True
+                )
+                process.start()
+                processes.append(process)
+            logger.info(f"Job from {request.remote}: {len(processes)} workers for {job['duration']} s")
+            
+            response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+            await response.prepare(request)
+            finished = 0
+            try:
+                while finished < len(processes):
+                    try:
+                        message = await loop.run_in_executor(None, results_queue.get, True, 1.0)
+                    except queue.Empty:
+                        if not any(process.is_alive() for process in processes):
+                            break
+                        continue
+                    if "interval" in message:
+                        message = dict(message, interval=interval_to_dict(message["interval"]))
+                    elif message["final"]:
+                        finished += 1
+                    await response.write(json.dumps(message).encode() + b"\n")
+                await response.write_eof()
+            except ConnectionResetError:
+                logger.warning("Coordinator disconnected - stopping the job")
+                return response
+            logger.info(f"Job finished: {finished} of {len(processes)} workers completed")
+            return response
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                await loop.run_in_executor(None, process.join)
+            if workload_path:
+                os.unlink(workload_path)
+            self.busy = False
+
+def is_loopback_host(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+def serve_worker_agent(address: str, token: Optional[str] = None):
+    """Run a WorkerAgent on [HOST:]PORT until interrupted.
+    
+    Without a host the agent listens on all interfaces if it has a token,
+    and on loopback only if it doesn't.
+    """
+    host, _, port = address.rpartition(":")
+    host = host or ("0.0.0.0" if token else "127.0.0.1")
+    agent = WorkerAgent(token)
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app.router.add_post("/run", agent.handle_run)
+    app.router.add_get("/status", agent.handle_status)
+    logger.info(f"Worker agent listening on {host}:{port}{' (token required)' if token else ''}")
+    web.run_app(app, host=host, port=int(port), print=None)
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Berachain RPC Throughput Tester",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Test default mainnet RPC for 60 seconds
+  python berachain-rpc-tester.py
+  
+  # Test custom RPC with specific duration and concurrency
+  python berachain-rpc-tester.py --rpc-url https://rpc.berachain.com/ --duration 120 --concurrent 100
+  
+  # Quick 10-second test
+  python berachain-rpc-tester.py --duration 10
+  
+  # Open-loop test at a fixed 500 requests/second (coordinated-omission corrected)
+  python berachain-rpc-tester.py --rate 500 --concurrent 200
+  
+  # Spread 4000 requests/second over 4 processes
+  python berachain-rpc-tester.py --rate 4000 --concurrent 800 --workers 4
+  
+  # Ramp from 100 to 2000 calls/second over 10 minutes
+  python berachain-rpc-tester.py --rate 100 --load-profile ramp --end-rate 2000 --duration 600
+  
+  # Find the highest rate that keeps p99 under 200 ms and errors under 1%
+  python berachain-rpc-tester.py --find-knee --rate 100 --slo-p99-ms 200 --slo-error-rate 0.01
+  
+  # Stream per-second throughput and percentiles to a file for plotting
+  python berachain-rpc-tester.py --duration 600 --timeseries run.jsonl
+  
+  # Replay a weighted production call mix against bepolia
+  python berachain-rpc-tester.py --workload workloads/dapp-frontend.yaml --network bepolia --rate 200
+  
+  # Expose live metrics for Prometheus/Grafana on port 9465
+  python berachain-rpc-tester.py --duration 3600 --rate 300 --metrics-port 9465
+  
+  # eth_getLogs latency and response size for 10 to 10,000 block ranges
+  python berachain-rpc-tester.py --logs-sweep --duration 30 --rate 20
+  
+  # Compare two providers on the same archive request schedule at 50 calls/second
+  python berachain-rpc-tester.py --compare https://rpc-a.example/ https://rpc-b.example/ --archive --rate 50
+  
+  # Trace recent transactions and blocks with a 120 second timeout per trace
+  python berachain-rpc-tester.py --workload workloads/traces.json --rate 5 --trace-timeout 120
+  
+  # Find the best JSON-RPC batch size (30 seconds per size)
+  python berachain-rpc-tester.py --batch-sweep --duration 30
+  
+  # WebSocket transport with head propagation probe
+  python berachain-rpc-tester.py --transport ws --ws-url wss://rpc.berachain.com/ --head-latency
+  
+  # Same node, HTTP then WebSocket, side by side
+  python berachain-rpc-tester.py --transport both --ws-url ws://localhost:8546 --rpc-url http://localhost:8545
+        """
+    )
+    
+    parser.add_argument(
+        "--rpc-url",
+        help="Berachain RPC URL to test (default: the public RPC of --network)"
+    )
+    
+    parser.add_argument(
+        "--compare",
+        nargs="+",
+        metavar="URL",
+        help="Run the same request schedule against all of these endpoints at once and compare them"
+    )
+    
+    parser.add_argument(
+        "--network",
+        choices=sorted(NETWORKS),
+        default="mainnet",
+        help="Network whose contract addresses the workload uses (default: mainnet)"
+    )
+    
+    parser.add_argument(
+        "--workload",
+        help="JSON or YAML workload file defining the call mix (default: workloads/default.json)"
+    )
+    
+    parser.add_argument(
+        "--duration",
+        type=int,
+        default=60,
+        help="Test duration in seconds (default: 60)"
+    )
+    
+    parser.add_argument(
+        "--concurrent",
+        type=int,
+        default=50,
+        help="Maximum concurrent requests (default: 50)"
+    )
+    
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Open-loop mode: send requests at this fixed rate (requests/second) "
+             "regardless of completions, reporting coordinated-omission corrected latency"
+    )
+    
+    parser.add_argument(
+        "--load-profile",
+        choices=["ramp", "step", "spike"],
+        help="Vary the open-loop rate over time, starting from --rate: linear ramp to --end-rate, "
+             "step ladder adding --step-rate every --step-duration, or a --spike-rate spike"
+    )
+    
+    parser.add_argument(
+        "--end-rate",
+        type=float,
+        help="Final rate of a ramp, cap of a step ladder, or highest rate tried by --find-knee"
+    )
+    
+    parser.add_argument(
+        "--step-rate",
+        type=float,
+        default=50.0,
+        help="Rate added at every step of the step ladder (default: 50)"
+    )
+    
+    parser.add_argument(
+        "--step-duration",
+        type=int,
+        default=30,
+        help="Seconds per step for the step ladder and --find-knee (default: 30)"
+    )
+    
+    parser.add_argument(
+        "--spike-rate",
+        type=float,
+        help="Rate during the spike of a spike profile (default: 5x --rate)"
+    )
+    
+    parser.add_argument(
+        "--spike-at",
+        type=float,
+        help="Seconds into the test when the spike starts (default: a third of --duration)"
+    )
+    
+    parser.add_argument(
+        "--spike-duration",
+        type=float,
+        default=10.0,
+        help="Length of the spike in seconds (default: 10)"
+    )
+    
+    parser.add_argument(
+        "--find-knee",
+        action="store_true",
+        help="Increase the offered rate from --rate until p99 or error rate breaks the SLO "
+             "and report the maximum sustainable throughput"
+    )
+    
+    parser.add_argument(
+        "--slo-p99-ms",
+        type=float,
+        default=500.0,
+        help="p99 latency SLO for --find-knee and --logs-sweep, and the latency target of "
+             "--concurrency-limit aimd, in ms (default: 500)"
+    )
+    
+    parser.add_argument(
+        "--slo-error-rate",
+        type=float,
+        default=0.01,
+        help="Error rate SLO for --find-knee and --logs-sweep, as a fraction (default: 0.01)"
+    )
+    
+    parser.add_argument(
+        "--knee-growth",
+        type=float,
+        default=1.5,
+        help="Factor the rate is multiplied by between --find-knee steps (default: 1.5)"
+    )
+    
+    parser.add_argument(
+        "--knee-refine",
+        type=int,
+        default=3,
+        help="Bisection steps between the last passing and first failing rate (default: 3)"
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Pack this many calls into each JSON-RPC batch request (default: 1, no batching)"
+    )
+    
+    parser.add_argument(
+        "--batch-sweep",
+        nargs="?",
+        const="1,5,10,50,100",
+        metavar="SIZES",
+        help="Run once per batch size and compare throughput "
+             "(comma-separated, default: 1,5,10,50,100; --duration applies to each size)"
+    )
+    
+    parser.add_argument(
+        "--timeseries",
+        metavar="PATH",
+        help="Write one record per interval (throughput, errors, percentiles per call type, "
+             "in-flight) to this file while the test runs"
+    )
+    
+    parser.add_argument(
+        "--timeseries-format",
+        choices=["jsonl", "csv"],
+        help="Time-series file format (default: csv if PATH ends in .csv, otherwise jsonl)"
+    )
+    
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds per time-series and dashboard interval (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--dashboard",
+        action="store_true",
+        help="Show a live terminal dashboard while the test runs: throughput, rolling p50/p99 per call "
+             "type, errors, circuit breaker state and sparklines, redrawn every --interval (needs rich)"
+    )
+    
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve live Prometheus metrics on this port at /metrics while the test runs "
+             "(with --workers, worker N uses PORT+N)"
+    )
+    
+    parser.add_argument(
+        "--metrics-host",
+        default="127.0.0.1",
+        help="Address for the metrics endpoint (default: 127.0.0.1)"
+    )
+    
+    parser.add_argument(
+        "--hdr-precision",
+        type=int,
+        default=3,
+        choices=range(1, 6),
+        metavar="{1-5}",
+        help="Significant figures kept by the latency histograms (default: 3)"
+    )
+    
+    parser.add_argument(
+        "--logs-sweep",
+        nargs="?",
+        const="10,100,1000,10000",
+        metavar="SIZES",
+        help="Run the eth_getLogs workload once per block range size and compare "
+             "(comma-separated, default: 10,100,1000,10000; --duration applies to each size)"
+    )
+    
+    parser.add_argument(
+        "--trace-blocks",
+        type=int,
+        default=50,
+        help="Recent blocks to sample transactions from for ${tx_hash}/${tx_block} calls (default: 50)"
+    )
+    
+    parser.add_argument(
+        "--trace-timeout",
+        type=float,
+        help="Timeout in seconds for debug_* and trace_* calls, overriding the workload"
+    )
+    
+    parser.add_argument(
+        "--client-profile",
+        metavar="PATH",
+        help="Profile the tester itself during the run and save the result (pstats format) to PATH"
+    )
+    
+    parser.add_argument(
+        "--client-profiler",
+        choices=["cprofile", "yappi"],
+        default="cprofile",
+        help="Profiler for --client-profile; yappi is coroutine-aware and needs pip install yappi (default: cprofile)"
+    )
+    
+    parser.add_argument(
+        "--connection-phases",
+        action="store_true",
+        help="Record pool wait, DNS, connect, send, time to first byte and body read per HTTP request"
+    )
+    
+    parser.add_argument(
+        "--no-keepalive",
+        action="store_true",
+        help="Open a new connection for every HTTP request, to measure handshake cost (implies --connection-phases)"
+    )
+    
+    parser.add_argument(
+        "--transport",
+        choices=["http", "ws", "both"],
+        default="http",
+        help="Send calls over HTTP POST, multiplexed WebSocket connections, "
+             "or both one after the other for comparison (default: http)"
+    )
+    
+    parser.add_argument(
+        "--ws-url",
+        help="WebSocket endpoint for --transport ws and --head-latency "
+             "(default: --rpc-url with http(s) replaced by ws(s))"
+    )
+    
+    parser.add_argument(
+        "--ws-connections",
+        type=int,
+        default=4,
+        help="Persistent WebSocket connections to multiplex requests over (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--head-latency",
+        action="store_true",
+        help="Subscribe to newHeads over WebSocket and report delivery delay after block timestamp"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of load generator processes (per host with --remote-workers); rate and "
+             "concurrency are split evenly between them (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--remote-workers",
+        nargs="+",
+        metavar="HOST:PORT",
+        help="Run the load on worker agents on other hosts (started with --worker-listen), "
+             "--workers processes each, and merge their results"
+    )
+    
+    parser.add_argument(
+        "--worker-listen",
+        metavar="[HOST:]PORT",
+        help="Run as a worker agent, waiting for jobs from a --remote-workers coordinator"
+    )
+    
+    parser.add_argument(
+        "--worker-token",
+        default=os.environ.get("RPC_WORKER_TOKEN"),
+        help="Shared secret between coordinator and worker agents (default: $RPC_WORKER_TOKEN)"
+    )
+    
+    parser.add_argument(
+        "--start-delay",
+        type=float,
+        default=5.0,
+        help="Seconds between sending jobs to worker agents and the common start time (default: 5)"
+    )
+    
+    parser.add_argument(
+        "--ignore-retry-after",
+        action="store_true",
+        help="Keep sending after HTTP 429 or rate-limit errors instead of backing off, "
+             "to measure a gateway's ceiling under constant pressure"
+    )
+    
+    parser.add_argument(
+        "--soak",
+        action="store_true",
+        help="Soak test: rolling-window statistics, a checkpoint file after every window, and "
+             "detection of latency or error-rate drift over the run (exit status 1 on drift)"
+    )
+    
+    parser.add_argument(
+        "--soak-window",
+        type=float,
+        default=300,
+        metavar="SECONDS",
+        help="Length of a soak window (default: 300)"
+    )
+    
+    parser.add_argument(
+        "--checkpoint",
+        default="soak-checkpoint.json",
+        metavar="PATH",
+        help="Soak checkpoint file, replaced after every window (default: soak-checkpoint.json)"
+    )
+    
+    parser.add_argument(
+        "--drift-threshold",
+        type=float,
+        default=0.10,
+        metavar="FRACTION",
+        help="p99 rise per hour, as a fraction of its starting value, that counts as drift (default: 0.10)"
+    )
+    
+    parser.add_argument(
+        "--from-checkpoint",
+        metavar="PATH",
+        help="Print the report of a soak run from its checkpoint file, e.g. after a crash"
+    )
+    
+    parser.add_argument(
+        "--cache-hit-ratio",
+        type=float,
+        metavar="RATIO",
+        help="Measure a caching proxy: send this share of eth_calls unchanged (cacheable) and the rest "
+             "with unique calldata that no cache can answer, and report hit and miss latency separately "
+             "(0 busts every eth_call, 1 repeats them all)"
+    )
+    
+    parser.add_argument(
+        "--concurrency-limit",
+        choices=CONCURRENCY_LIMITS,
+        default="fixed",
+        help="In-flight limit: fixed at --concurrent, or adapted per call type by AIMD or gradient "
+             "up to --concurrent (default: fixed)"
+    )
+    
+    parser.add_argument(
+        "--history",
+        metavar="PATH",
+        default="rpc-history.sqlite",
+        help="SQLite database that every run is saved to, sweep and comparison steps included; a relative "
+             "path is in the current directory (default: rpc-history.sqlite, see --no-history)"
+    )
+    
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Don't save this run to the history database"
+    )
+    
+    parser.add_argument(
+        "--label",
+        help="Name for this run in the history database, e.g. the node version or change under test"
+    )
+    
+    parser.add_argument(
+        "--list-runs",
+        action="store_true",
+        help="List the most recent runs in the history database and exit"
+    )
+    
+    parser.add_argument(
+        "--diff-runs",
+        nargs="+",
+        metavar="RUN",
+        help="Compare a run (default: latest) against a baseline run, by id, label or 'latest', and exit "
+             "with status 1 on a regression: --diff-runs BASELINE [RUN]"
+    )
+    
+    parser.add_argument(
+        "--regression-threshold",
+        type=float,
+        default=0.10,
+        help="Relative change that --diff-runs flags as a regression when significant (default: 0.10)"
+    )
+    
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging"
+    )
+    
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="Enable archive node testing with historical queries"
+    )
+    
+    parser.add_argument(
+        "--archive-blocks",
+        type=int,
+        default=3_000_000,
+        help="Number of blocks back to test for archive queries (default: 3,000,000)"
+    )
+    
+    parser.add_argument(
+        "--block-distribution",
+        choices=["uniform", "recent", "zipf", "replay"],
+        default="uniform",
+        help="How --archive picks historical blocks (default: uniform)"
+    )
+    
+    parser.add_argument(
+        "--recent-mean",
+        type=float,
+        default=10_000,
+        help="Mean block age for --block-distribution recent (default: 10,000)"
+    )
+    
+    parser.add_argument(
+        "--hot-blocks",
+        type=int,
+        default=1_000,
+        help="Size of the hot block set for --block-distribution zipf (default: 1,000)"
+    )
+    
+    parser.add_argument(
+        "--zipf-exponent",
+        type=float,
+        default=1.1,
+        help="Skew of --block-distribution zipf; higher is more concentrated (default: 1.1)"
+    )
+    
+    parser.add_argument(
+        "--block-file",
+        help="Block numbers to replay for --block-distribution replay, one per line"
+    )
+    
+    parser.add_argument(
+        "--archive-head",
+        type=int,
+        help="Use this block as the head for archive ranges instead of the latest block, "
+             "so seeded runs pick identical blocks"
+    )
+    
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed for call, historical and block selection (workers use SEED+N)"
+    )
+    
+    parser.add_argument(
+        "--depth-export",
+        metavar="PATH",
+        help="With --archive, write latency by block age to a CSV (.csv) or JSON file"
+    )
+    
+    args = parser.parse_args()
+    
+    if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.worker_listen:
+        host = args.worker_listen.rpartition(":")[0]
+        if host and not is_loopback_host(host) and not args.worker_token:
+            print("Error: --worker-listen on a non-loopback address needs --worker-token")
+            sys.exit(1)
+        try:
+            serve_worker_agent(args.worker_listen, args.worker_token)
+        except ValueError:
+            print(f"Error: --worker-listen needs [HOST:]PORT, got {args.worker_listen}")
+            sys.exit(1)
+        return
+    
+    if args.regression_threshold <= 0:
+        print("Error: --regression-threshold must be positive")
+        sys.exit(1)
+    
+    if args.cache_hit_ratio is not None and not 0 <= args.cache_hit_ratio <= 1:
+        print("Error: --cache-hit-ratio must be between 0 and 1")
+        sys.exit(1)
+    
+    if args.from_checkpoint:
+        try:
+            tester = load_checkpoint(args.from_checkpoint)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: Could not load checkpoint: {e}")
+            sys.exit(1)
+        tester.print_results()
+        sys.exit(1 if tester.soak.drifting() else 0)
+    
+    if args.list_runs or args.diff_runs:
+        if not os.path.exists(args.history):
+            print(f"Error: History database not found: {args.history}")
+            sys.exit(1)
+        if args.diff_runs and len(args.diff_runs) > 2:
+            print("Error: --diff-runs takes a baseline run and optionally a second run")
+            sys.exit(1)
+        history = RunHistory(args.history)
+        try:
+            if args.list_runs:
+                print_run_list(history)
+                return
+            candidate = args.diff_runs[1] if len(args.diff_runs) > 1 else "latest"
+            regressed = compare_runs(history, args.diff_runs[0], candidate, args.regression_threshold)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        finally:
+            history.close()
+        sys.exit(1 if regressed else 0)
+    
     # Validate arguments
     if args.duration <= 0:
         print("Error: Duration must be positive")
@@ -639,23 +5146,266 @@ Examples:
         print("Error: Concurrent requests must be positive")
         sys.exit(1)
     
+    if args.rate is not None and args.rate <= 0:
+        print("Error: Rate must be positive")
+        sys.exit(1)
+    
+    if args.workers <= 0:
+        print("Error: Workers must be positive")
+        sys.exit(1)
+    
+    if args.batch_size <= 0:
+        print("Error: Batch size must be positive")
+        sys.exit(1)
+    
+    if args.ws_connections <= 0:
+        print("Error: WebSocket connections must be positive")
+        sys.exit(1)
+    
+    if args.transport == "both" and args.batch_sweep:
+        print("Error: --transport both cannot be combined with --batch-sweep")
+        sys.exit(1)
+    
+    load_profile = None
+    if args.load_profile:
+        if not args.rate:
+            print("Error: --load-profile needs --rate as the starting rate")
+            sys.exit(1)
+        if args.load_profile == "ramp" and not args.end_rate:
+            print("Error: A ramp profile needs --end-rate")
+            sys.exit(1)
+        if args.step_duration <= 0 or args.spike_duration <= 0:
+            print("Error: Step and spike durations must be positive")
+            sys.exit(1)
+        load_profile = LoadProfile(
+            kind=args.load_profile,
+            rate=args.rate,
+            end_rate=args.end_rate,
+            step_rate=args.step_rate,
+            step_seconds=args.step_duration,
+            spike_rate=args.spike_rate or args.rate * 5,
+            spike_at=args.spike_at if args.spike_at is not None else args.duration / 3,
+            spike_seconds=args.spike_duration
+        )
+        if min(load_profile.rate, load_profile.end_rate or load_profile.rate, load_profile.spike_rate) <= 0:
+            print("Error: Load profile rates must be positive")
+            sys.exit(1)
+    
+    if args.interval <= 0:
+        print("Error: Interval must be positive")
+        sys.exit(1)
+    
+    if args.depth_export and not args.archive:
+        print("Error: --depth-export needs --archive")
+        sys.exit(1)
+    
+    if args.block_distribution != "uniform" and not args.archive:
+        print("Error: --block-distribution needs --archive")
+        sys.exit(1)
+    
+    if args.recent_mean <= 0 or args.hot_blocks <= 0 or args.zipf_exponent <= 0:
+        print("Error: --recent-mean, --hot-blocks and --zipf-exponent must be positive")
+        sys.exit(1)
+    
+    replay_blocks = []
+    if args.block_distribution == "replay":
+        if not args.block_file:
+            print("Error: --block-distribution replay needs --block-file")
+            sys.exit(1)
+        try:
+            replay_blocks = load_block_list(args.block_file)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read block file: {e}")
+            sys.exit(1)
+        if not replay_blocks:
+            print(f"Error: No block numbers in {args.block_file}")
+            sys.exit(1)
+    
+    block_distribution = BlockDistribution(
+        kind=args.block_distribution,
+        recent_mean=args.recent_mean,
+        zipf_exponent=args.zipf_exponent,
+        hot_blocks=args.hot_blocks,
+        replay_blocks=replay_blocks
+    )
+    
+    if args.find_knee and (args.knee_growth <= 1 or args.step_duration <= 0):
+        print("Error: --knee-growth must be above 1 and --step-duration positive")
+        sys.exit(1)
+    
+    batch_sizes = None
+    if args.batch_sweep:
+        try:
+            batch_sizes = [int(size) for size in args.batch_sweep.split(",")]
+        except ValueError:
+            batch_sizes = []
+        if not batch_sizes or min(batch_sizes) <= 0:
+            print("Error: Batch sweep sizes must be a comma-separated list of positive integers")
+            sys.exit(1)
+    
+    range_sizes = None
+    if args.logs_sweep:
+        try:
+            range_sizes = [int(size) for size in args.logs_sweep.split(",")]
+        except ValueError:
+            range_sizes = []
+        if not range_sizes or min(range_sizes) <= 0:
+            print("Error: Logs sweep sizes must be a comma-separated list of positive integers")
+            sys.exit(1)
+        if batch_sizes or args.transport == "both" or args.find_knee:
+            print("Error: --logs-sweep cannot be combined with --batch-sweep, --transport both or --find-knee")
+            sys.exit(1)
+        # The sweep needs range calls; default to the bundled eth_getLogs workload
+        args.workload = args.workload or LOGS_WORKLOAD
+    
+    if args.compare:
+        if len(args.compare) < 2:
+            print("Error: --compare needs at least two endpoints")
+            sys.exit(1)
+        if (args.rpc_url or args.ws_url or args.workers > 1 or args.timeseries or batch_sizes or range_sizes
+                or args.transport == "both" or args.find_knee):
+            print("Error: --compare cannot be combined with --rpc-url, --ws-url, --workers, --timeseries, "
+                  "sweeps, --transport both or --find-knee")
+            sys.exit(1)
+    
+    if args.remote_workers:
+        if args.compare or batch_sizes or range_sizes or args.transport == "both" or args.find_knee:
+            print("Error: --remote-workers cannot be combined with --compare, sweeps, --transport both "
+                  "or --find-knee")
+            sys.exit(1)
+        if args.start_delay <= 0:
+            print("Error: --start-delay must be positive")
+            sys.exit(1)
+    
+    if args.soak:
+        if args.compare or batch_sizes or range_sizes or args.transport == "both" or args.find_knee:
+            print("Error: --soak cannot be combined with --compare, sweeps, --transport both or --find-knee")
+            sys.exit(1)
+        if args.soak_window < args.interval or args.drift_threshold <= 0:
+            print("Error: --soak-window must be at least --interval and --drift-threshold positive")
+            sys.exit(1)
+    
+    if args.dashboard:
+        if Live is None:
+            print("Error: --dashboard needs rich. Install it with: pip install rich")
+            sys.exit(1)
+        if args.compare or batch_sizes or range_sizes or args.transport == "both" or args.find_knee:
+            print("Error: --dashboard cannot be combined with --compare, sweeps, --transport both or --find-knee")
+            sys.exit(1)
+    
+    if args.trace_blocks <= 0 or (args.trace_timeout is not None and args.trace_timeout <= 0):
+        print("Error: --trace-blocks and --trace-timeout must be positive")
+        sys.exit(1)
+    
+    if args.client_profiler == "yappi" and args.client_profile and yappi is None:
+        print("Error: --client-profiler yappi needs yappi. Install it with: pip install yappi")
+        sys.exit(1)
+    
+    if args.workload and not os.path.exists(args.workload):
+        print(f"Error: Workload file not found: {args.workload}")
+        sys.exit(1)
+    
+    try:
+        load_workload(args.workload or DEFAULT_WORKLOAD, args.network)
+    except ValueError as e:
+        print(f"Error: Invalid workload: {e}")
+        sys.exit(1)
+    
     # Create and run tester
-    tester = BerachainRPCTester(
-        args.rpc_url, 
-        args.concurrent, 
-        args.archive, 
-        args.archive_blocks
+    tester_kwargs = dict(
+        rpc_url=args.rpc_url or NETWORKS[args.network],
+        max_concurrent=args.concurrent,
+        test_archive=args.archive,
+        archive_blocks=args.archive_blocks,
+        rate=args.rate,
+        hdr_precision=args.hdr_precision,
+        batch_size=args.batch_size,
+        transport=args.transport,
+        ws_url=args.ws_url,
+        ws_connections=args.ws_connections,
+        head_latency=args.head_latency,
+        load_profile=load_profile,
+        timeseries_path=args.timeseries,
+        timeseries_format=args.timeseries_format,
+        interval=args.interval,
+        metrics_port=args.metrics_port,
+        metrics_host=args.metrics_host,
+        workload=args.workload,
+        network=args.network,
+        depth_export_path=args.depth_export,
+        block_distribution=block_distribution,
+        seed=args.seed,
+        archive_head=args.archive_head,
+        trace_blocks=args.trace_blocks,
+        trace_timeout=args.trace_timeout,
+        client_profile_path=args.client_profile,
+        client_profiler=args.client_profiler,
+        trace_connections=args.connection_phases,
+        keepalive=not args.no_keepalive,
+        concurrency_limit=args.concurrency_limit,
+        latency_target=args.slo_p99_ms / 1000,
+        honor_retry_after=not args.ignore_retry_after,
+        cache_hit_ratio=args.cache_hit_ratio,
+        soak_window=args.soak_window if args.soak else None,
+        checkpoint_path=args.checkpoint,
+        drift_threshold=args.drift_threshold,
+        dashboard=args.dashboard
     )
+    tester = BerachainRPCTester(**tester_kwargs)
+    if tester.soak is not None:
+        tester.soak.tester_kwargs = tester_kwargs
+        logger.info(f"Soak mode: {format_elapsed(args.soak_window)} windows, checkpoint {args.checkpoint}")
+    
+    if args.compare:
+        save_runs(args, run_endpoint_comparison(tester_kwargs, args.compare, args.duration))
+        return
+    
+    if batch_sizes:
+        save_runs(args, run_batch_sweep(tester_kwargs, batch_sizes, args.duration, args.workers))
+        return
+    
+    if range_sizes:
+        save_runs(args, run_logs_sweep(tester_kwargs, range_sizes, args.duration, args.workers,
+                                       args.slo_p99_ms, args.slo_error_rate))
+        return
+    
+    if args.transport == "both":
+        save_runs(args, run_transport_comparison(tester_kwargs, args.duration, args.workers))
+        return
+    
+    if args.find_knee:
+        save_runs(args, find_saturation_knee(
+            tester_kwargs, args.step_duration, args.slo_p99_ms, args.slo_error_rate,
+            args.knee_growth, args.knee_refine, args.end_rate, args.workers
+        ))
+        return
     
+    completed = True
     try:
-        asyncio.run(tester.run_test(args.duration))
+        if args.remote_workers:
+            tester.run_distributed(args.duration, args.remote_workers, args.workers, tester_kwargs,
+                                   args.worker_token, args.start_delay)
+            tester.print_results()
+        elif args.workers > 1:
+            tester.run_multiprocess(args.duration, args.workers, tester_kwargs)
+            tester.print_results()
+        else:
+            asyncio.run(tester.run_test(args.duration))
     except KeyboardInterrupt:
         print("\nTest interrupted by user")
+        completed = False
+        if tester.soak is not None:
+            tester.soak.finish()
         if tester.stats.total_calls > 0:
             tester.print_results()
     except Exception as e:
         logger.error(f"Test failed: {e}")
         sys.exit(1)
+    
+    save_runs(args, [(tester, {}, completed)])
+    
+    if tester.soak is not None and tester.soak.drifting():
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,672 @@
+#!/usr/bin/env python3
+"""
+Mock Berachain JSON-RPC Server
+
+A local stand-in for a Berachain node, for exercising berachain-rpc-tester.py
+without a live chain endpoint. It answers the methods the tester sends with
+configurable latency distributions, error rates, HTTP 429s and timeouts, so the
+tester's own maximum throughput, circuit breaker and percentile math can be
+checked against known inputs.
+
+Usage:
+    python mock-rpc-server.py --port 8545 --latency lognormal --latency-ms 20
+    python berachain-rpc-tester.py --rpc-url http://127.0.0.1:8545/ --duration 30
+
+Key features:
+- HTTP POST (single objects and batch arrays) and WebSocket on the same port
+- eth_subscribe newHeads on a simulated chain that advances every --block-time
+- Fixed, uniform, normal, lognormal and exponential latency distributions
+- Injected JSON-RPC errors, HTTP 429 with Retry-After, and hung requests
+- Gateway-style rate limits: requests/second for the endpoint (HTTP 429) and per method
+  (JSON-RPC -32005), as token buckets
+- eth_getLogs with result counts and latency that grow with the block range,
+  plus provider-style block range and result count limits
+- debug_traceTransaction (callTracer, prestateTracer, struct logs),
+  debug_traceBlockByNumber and trace_block over deterministic block transactions
+- Optional caching proxy in front of the node: identical requests within a TTL are
+  answered fast with X-Cache: HIT, like eRPC or nginx in front of a real node
+- Latency that creeps up with uptime, to check soak-test drift detection
+- Seeded random number generator for repeatable runs
+"""
+
+import asyncio
+import argparse
+import hashlib
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict, defaultdict
+import logging
+import sys
+
+try:
+    from aiohttp import web, WSMsgType
+except ImportError:
+    print("Error: Required dependencies not installed.")
+    print("Please install them with:")
+    print("  pip install aiohttp")
+    sys.exit(1)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MAINNET_CHAIN_ID = 80094
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+ANY_CONTRACT_FACTOR = 20  # eth_getLogs without an address matches this many contracts' worth of logs
+MAX_BLOCK_TRANSACTIONS = 8  # Blocks hold 0 to this many - 1 transactions
+STRUCT_LOG_FACTOR = 5  # Struct-log traces (no tracer) cost this many times a callTracer trace
+# Position of the block tag in params, for methods that read state at a block
+BLOCK_TAG_INDEX = {"eth_call": 1, "eth_getBalance": 1, "eth_getTransactionCount": 1,
+                   "eth_getCode": 1, "eth_getBlockByNumber": 0}
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock node"""
+    latency: str = "fixed"  # fixed, uniform, normal, lognormal, exponential
+    latency_ms: float = 5.0  # Mean (median for lognormal)
+    jitter_ms: float = 2.0  # Spread: half-width (uniform), stdev (normal), sigma*median (lognormal)
+    historical_extra_ms: float = 0.0  # Added to state reads at an explicit block number
+    latency_drift_ms: float = 0.0  # Added to every call's latency per minute of uptime (slow degradation)
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    rate_limit_rps: float = 0.0  # HTTP requests/second before 429s, 0 for unlimited
+    method_rate_limits: Dict[str, float] = field(default_factory=dict)  # Calls/second per method
+    timeout_rate: float = 0.0
+    hang_seconds: float = 30.0
+    max_batch_size: int = 0  # 0 means unlimited
+    block_time: float = 2.0
+    start_block: int = 5_000_000
+    seed: Optional[int] = None
+    log_density: float = 0.5  # eth_getLogs: logs per block per address for one event type
+    log_ms_per_1k: float = 20.0  # eth_getLogs: extra latency per 1,000 logs scanned
+    max_logs: int = 10_000  # 0 means unlimited
+    max_block_range: int = 0  # 0 means unlimited
+    trace_ms: float = 40.0  # Trace methods: extra latency per transaction traced
+    cache_ttl: float = 0.0  # Seconds a cached single-request result stays fresh, 0 for no cache
+    cache_latency_ms: float = 0.5  # Response delay of cache hits
+    cache_max_items: int = 10_000  # Least recently used results are evicted beyond this
+
+class TokenBucket:
+    """Allows `rate` events per second on average, in bursts of up to one second's worth"""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+    
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+@dataclass
+class MockStats:
+    """What the server has seen, printed on shutdown"""
+    http_requests: int = 0
+    ws_messages: int = 0
+    calls: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    hung: int = 0
+    cache_hits: int = 0
+    calls_by_method: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+class MockRPCServer:
+    """aiohttp application answering Berachain JSON-RPC calls"""
+    
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.stats = MockStats()
+        self.genesis_time = time.time()
+        self.request_bucket = TokenBucket(config.rate_limit_rps) if config.rate_limit_rps else None
+        self.method_buckets = {method: TokenBucket(rate) for method, rate in config.method_rate_limits.items()}
+        self.cache: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()  # Request key -> (expiry, result)
+    
+    def current_block(self) -> int:
+        """Simulated head: advances by one every block_time seconds"""
+        return self.config.start_block + int((time.time() - self.genesis_time) / self.config.block_time)
+    
+    def block_timestamp(self, number: int) -> int:
+        return int(self.genesis_time + (number - self.config.start_block) * self.config.block_time)
+    
+    def sample_latency(self) -> float:
+        """Draw one response delay in seconds from the configured distribution"""
+        mean = self.config.latency_ms / 1000
+        jitter = self.config.jitter_ms / 1000
+        kind = self.config.latency
+        
+        if kind == "fixed":
+            delay = mean
+        elif kind == "uniform":
+            delay = self.rng.uniform(mean - jitter, mean + jitter)
+        elif kind == "normal":
+            delay = self.rng.gauss(mean, jitter)
+        elif kind == "lognormal":
+            sigma = jitter / mean if mean > 0 else 0
+            delay = mean * math.exp(self.rng.gauss(0, sigma))
+        elif kind == "exponential":
+            delay = self.rng.expovariate(1 / mean) if mean > 0 else 0
+        else:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        
+        return max(delay, 0.0)
+    
+    def parse_block(self, tag) -> int:
+        if tag in (None, "latest", "pending", "safe", "finalized"):
+            return self.current_block()
+        if tag == "earliest":
+            return 0
+        return int(tag, 16)
+    
+    def log_query(self, params: List) -> Tuple[int, Optional[str]]:
+        """Number of logs an eth_getLogs filter matches, and the error a provider would return"""
+        query = params[0] if params else {}
+        try:
+            start = self.parse_block(query.get("fromBlock"))
+            end = self.parse_block(query.get("toBlock"))
+        except (TypeError, ValueError):
+            return 0, "invalid block tag"
+        if end < start:
+            return 0, "invalid block range"
+        blocks = end - start + 1
+        if self.config.max_block_range and blocks > self.config.max_block_range:
+            return 0, f"query exceeds max block range {self.config.max_block_range}"
+        
+        address = query.get("address")
+        addresses = len(address) if isinstance(address, list) else (1 if address else ANY_CONTRACT_FACTOR)
+        topics = query.get("topics") or []
+        # No topics matches every event type; each indexed argument filter is far more selective
+        selectivity = 2.0 if not topics else 0.05 ** sum(1 for topic in topics[1:] if topic is not None)
+        count = int(blocks * self.config.log_density * addresses * selectivity)
+        if self.config.max_logs and count > self.config.max_logs:
+            return self.config.max_logs, f"query returned more than {self.config.max_logs} results"
+        return count, None
+    
+    def logs_for(self, params: List) -> List[Dict]:
+        query = params[0] if params else {}
+        count, _ = self.log_query(params)
+        start = self.parse_block(query.get("fromBlock"))
+        blocks = self.parse_block(query.get("toBlock")) - start + 1
+        address = query.get("address") or "0x0000000000000000000000000000000000000000"
+        addresses = address if isinstance(address, list) else [address]
+        topic0 = (query.get("topics") or [TRANSFER_TOPIC])[0]
+        topic0 = topic0[0] if isinstance(topic0, list) else topic0 or TRANSFER_TOPIC
+        logs = []
+        for i in range(count):
+            block = start + i * blocks // count
+            logs.append({
+                "address": addresses[i % len(addresses)],
+                "topics": [topic0, f"0x{i:064x}", f"0x{block:064x}"],
+                "data": f"0x{(block * 31 + i):064x}",
+                "blockNumber": hex(block),
+                "blockHash": f"0x{block:064x}",
+                "transactionHash": f"0x{(block << 20) | i:064x}",
+                "transactionIndex": hex(i % 200),
+                "logIndex": hex(i),
+                "removed": False,
+            })
+        return logs
+    
+    def block_transactions(self, number: int) -> List[str]:
+        """Transaction hashes of a block; the block number is encoded in each hash"""
+        count = int(hashlib.sha256(f"block:{number}".encode()).hexdigest()[:2], 16) % MAX_BLOCK_TRANSACTIONS
+        return [f"0x{(number << 20) | i:064x}" for i in range(count)]
+    
+    def trace_transaction(self, tx_hash: str, options: Dict) -> Dict:
+        """debug_traceTransaction result for the requested tracer"""
+        digest = hashlib.sha256(f"trace:{tx_hash}".encode()).hexdigest()
+        sender = "0x" + digest[:40]
+        target = "0x" + digest[24:64]
+        gas = 21_000 + int(digest[:4], 16) * 4
+        tracer = options.get("tracer")
+        if tracer == "callTracer":
+            calls = [{"type": "STATICCALL" if i % 2 else "CALL", "from": target,
+                      "to": "0x" + hashlib.sha256(f"{digest}:{i}".encode()).hexdigest()[:40],
+                      "gas": hex(gas // 2), "gasUsed": hex(gas // 8), "input": "0x" + digest * 2, "output": "0x" + digest}
+                     for i in range(int(digest[4], 16) % 6)]
+            return {"type": "CALL", "from": sender, "to": target, "value": "0x0", "gas": hex(gas * 2),
+                    "gasUsed": hex(gas), "input": "0x" + digest * 4, "output": "0x", "calls": calls}
+        if tracer == "prestateTracer":
+            accounts = {address: {"balance": hex(int(digest[:12], 16)), "nonce": int(digest[12:14], 16),
+                                  "code": "0x" + digest * 8,
+                                  "storage": {f"0x{i:064x}": "0x" + digest for i in range(int(digest[5], 16) % 8)}}
+                        for address in (sender, target)}
+            if (options.get("tracerConfig") or {}).get("diffMode"):
+                return {"pre": accounts, "post": {sender: {"nonce": accounts[sender]["nonce"] + 1}}}
+            return accounts
+        if tracer:
+            raise ValueError(f"tracer not found: {tracer}")
+        struct_logs = [{"pc": i * 2, "op": "PUSH1" if i % 3 else "SLOAD", "gas": gas - i * 3, "gasCost": 3,
+                        "depth": 1, "stack": ["0x" + digest[:8]] * (i % 4)} for i in range(200)]
+        return {"gas": gas, "failed": False, "returnValue": "", "structLogs": struct_logs}
+    
+    def trace_block(self, number: int) -> List[Dict]:
+        """Parity-style trace_block result: one top-level call per transaction"""
+        traces = []
+        for position, tx_hash in enumerate(self.block_transactions(number)):
+            call = self.trace_transaction(tx_hash, {"tracer": "callTracer"})
+            traces.append({"action": {"callType": "call", "from": call["from"], "to": call["to"], "gas": call["gas"],
+                                      "input": call["input"], "value": call["value"]},
+                           "blockHash": "0x" + hashlib.sha256(f"block:{number}".encode()).hexdigest(),
+                           "blockNumber": number, "result": {"gasUsed": call["gasUsed"], "output": call["output"]},
+                           "subtraces": len(call["calls"]), "traceAddress": [], "transactionHash": tx_hash,
+                           "transactionPosition": position, "type": "call"})
+        return traces
+    
+    def trace_cost(self, method: str, params: List) -> float:
+        """Extra seconds a trace method takes: trace_ms per transaction traced"""
+        options = params[1] if len(params) > 1 and isinstance(params[1], dict) else {}
+        factor = 1 if options.get("tracer") or method == "trace_block" else STRUCT_LOG_FACTOR
+        try:
+            if method == "debug_traceTransaction":
+                transactions = 1
+            else:
+                transactions = len(self.block_transactions(self.parse_block(params[0] if params else None)))
+        except (TypeError, ValueError):
+            return 0.0
+        return transactions * factor * self.config.trace_ms / 1000
+    
+    def result_for(self, method: str, params: List) -> object:
+        """Plausible result for a supported method, or raise KeyError"""
+        if method == "eth_call":
+            # Deterministic 32-byte word per (to, data, block) so results are comparable across runs
+            call = params[0] if params else {}
+            tag = params[1] if len(params) > 1 else "latest"
+            digest = hashlib.sha256(f"{call.get('to')}:{call.get('data')}:{tag}".encode()).hexdigest()
+            return "0x" + digest
+        if method == "eth_blockNumber":
+            return hex(self.current_block())
+        if method == "eth_getLogs":
+            return self.logs_for(params)
+        if method == "eth_getBalance":
+            digest = hashlib.sha256(f"balance:{params[0] if params else ''}".encode()).hexdigest()
+            return hex(int(digest[:16], 16))
+        if method == "eth_getTransactionCount":
+            digest = hashlib.sha256(f"nonce:{params[0] if params else ''}".encode()).hexdigest()
+            return hex(int(digest[:4], 16))
+        if method == "eth_getCode":
+            return "0x" + hashlib.sha256(f"code:{params[0] if params else ''}".encode()).hexdigest() * 4
+        if method == "eth_getBlockByNumber":
+            tag = params[0] if params else "latest"
+            number = self.current_block() if not str(tag).startswith("0x") else int(tag, 16)
+            return {"number": hex(number), "timestamp": hex(self.block_timestamp(number)),
+                    "hash": "0x" + hashlib.sha256(f"block:{number}".encode()).hexdigest(),
+                    "transactions": self.block_transactions(number)}
+        if method == "debug_traceTransaction":
+            tx_hash = params[0] if params else "0x0"
+            if int(tx_hash, 16) & 0xFFFFF >= len(self.block_transactions(int(tx_hash, 16) >> 20)):
+                raise ValueError(f"transaction {tx_hash} not found")
+            return self.trace_transaction(tx_hash, params[1] if len(params) > 1 else {})
+        if method == "debug_traceBlockByNumber":
+            options = params[1] if len(params) > 1 else {}
+            return [{"txHash": tx_hash, "result": self.trace_transaction(tx_hash, options)}
+                    for tx_hash in self.block_transactions(self.parse_block(params[0] if params else None))]
+        if method == "trace_block":
+            return self.trace_block(self.parse_block(params[0] if params else None))
+        if method == "eth_gasPrice":
+            return hex(1_000_000_000)
+        if method == "eth_chainId":
+            return hex(MAINNET_CHAIN_ID)
+        if method == "net_version":
+            return str(MAINNET_CHAIN_ID)
+        if method == "web3_clientVersion":
+            return "mock-rpc-server/1.0"
+        raise KeyError(method)
+    
+    async def handle_call(self, request: Dict) -> Dict:
+        """Answer one JSON-RPC request object after the simulated delay"""
+        request_id = request.get("id")
+        method = request.get("method", "")
+        params = request.get("params") or []
+        self.stats.calls += 1
+        self.stats.calls_by_method[method] += 1
+        
+        bucket = self.method_buckets.get(method)
+        if bucket is not None and not bucket.take():
+            self.stats.rate_limited += 1
+            return {"jsonrpc": "2.0", "id": request_id,
+                    "error": {"code": -32005, "message": f"mock: rate limit exceeded for {method}"}}
+        
+        delay = self.sample_latency()
+        delay += self.config.latency_drift_ms / 1000 * (time.time() - self.genesis_time) / 60
+        tag_index = BLOCK_TAG_INDEX.get(method)
+        if tag_index is not None and len(params) > tag_index and str(params[tag_index]).startswith("0x"):
+            delay += self.config.historical_extra_ms / 1000
+        log_error = None
+        if method == "eth_getLogs":
+            log_count, log_error = self.log_query(params)
+            delay += log_count / 1000 * self.config.log_ms_per_1k / 1000
+        if method in ("debug_traceTransaction", "debug_traceBlockByNumber", "trace_block"):
+            delay += self.trace_cost(method, params)
+        await asyncio.sleep(delay)
+        
+        if self.rng.random() < self.config.error_rate:
+            self.stats.errors += 1
+            return {"jsonrpc": "2.0", "id": request_id,
+                    "error": {"code": -32000, "message": "mock: injected error"}}
+        if log_error:
+            self.stats.errors += 1
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32005, "message": log_error}}
+        try:
+            result = self.result_for(method, params)
+        except KeyError:
+            self.stats.errors += 1
+            return {"jsonrpc": "2.0", "id": request_id,
+                    "error": {"code": -32601, "message": f"the method {method} does not exist/is not available"}}
+        except ValueError as e:
+            self.stats.errors += 1
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32000, "message": str(e)}}
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+    
+    async def handle_body(self, body) -> object:
+        """Answer a single request or a batch array"""
+        if isinstance(body, list):
+            if self.config.max_batch_size and len(body) > self.config.max_batch_size:
+                self.stats.errors += 1
+                return {"jsonrpc": "2.0", "id": None,
+                        "error": {"code": -32600, "message": f"batch size exceeds {self.config.max_batch_size}"}}
+            return list(await asyncio.gather(*(self.handle_call(request) for request in body)))
+        return await self.handle_call(body)
+    
+    async def handle_cached(self, body: Dict) -> web.Response:
+        """Answer like a caching proxy in front of the node: identical requests within the TTL come from cache"""
+        key = json.dumps([body.get("method"), body.get("params")], sort_keys=True)
+        entry = self.cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.cache.move_to_end(key)
+            self.stats.cache_hits += 1
+            await asyncio.sleep(self.config.cache_latency_ms / 1000)
+            return web.json_response({"jsonrpc": "2.0", "id": body.get("id"), "result": entry[1]},
+                                     headers={"X-Cache": "HIT"})
+        response = await self.handle_call(body)
+        if "result" in response:
+            self.cache[key] = (time.monotonic() + self.config.cache_ttl, response["result"])
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.config.cache_max_items:
+                self.cache.popitem(last=False)
+        return web.json_response(response, headers={"X-Cache": "MISS"})
+    
+    async def maybe_fault(self) -> Optional[web.Response]:
+        """Whole-request faults: hang past the client timeout, or HTTP 429"""
+        if self.rng.random() < self.config.timeout_rate:
+            self.stats.hung += 1
+            await asyncio.sleep(self.config.hang_seconds)
+        if self.rng.random() < self.config.rate_limit_rate or (
+                self.request_bucket is not None and not self.request_bucket.take()):
+            self.stats.rate_limited += 1
+            return web.json_response(
+                {"jsonrpc": "2.0", "id": None, "error": {"code": -32005, "message": "mock: rate limited"}},
+                status=429,
+                headers={"Retry-After": f"{self.config.retry_after:g}"}
+            )
+        return None
+    
+    async def handle_http(self, request: web.Request) -> web.StreamResponse:
+        if request.headers.get("Upgrade", "").lower() == "websocket":
+            return await self.handle_ws(request)
+        
+        self.stats.http_requests += 1
+        fault = await self.maybe_fault()
+        if fault is not None:
+            return fault
+        
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            return web.json_response(
+                {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "parse error"}},
+                status=400
+            )
+        if self.config.cache_ttl and isinstance(body, dict):
+            return await self.handle_cached(body)
+        return web.json_response(await self.handle_body(body))
+    
+    async def handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        tasks = set()
+        
+        async def respond(body):
+            if isinstance(body, dict) and body.get("method") == "eth_subscribe":
+                params = body.get("params") or []
+                if params[:1] != ["newHeads"]:
+                    await ws.send_json({"jsonrpc": "2.0", "id": body.get("id"),
+                                        "error": {"code": -32602, "message": "only newHeads is supported"}})
+                    return
+                subscription = hex(self.rng.getrandbits(64))
+                await ws.send_json({"jsonrpc": "2.0", "id": body.get("id"), "result": subscription})
+                spawn(self.stream_heads(ws, subscription))
+                return
+            await ws.send_json(await self.handle_body(body))
+        
+        def spawn(coroutine):
+            task = asyncio.create_task(coroutine)
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.TEXT:
+                    self.stats.ws_messages += 1
+                    # Answer concurrently so one slow call never blocks the socket
+                    spawn(respond(json.loads(message.data)))
+        finally:
+            for task in tasks:
+                task.cancel()
+        return ws
+    
+    async def stream_heads(self, ws: web.WebSocketResponse, subscription: str):
+        """Push a newHeads notification whenever the simulated chain advances"""
+        last = self.current_block()
+        while not ws.closed:
+            next_time = self.block_timestamp(last + 1)
+            await asyncio.sleep(max(next_time - time.time(), 0) + self.sample_latency())
+            head = self.current_block()
+            for number in range(last + 1, head + 1):
+                header = {
+                    "number": hex(number),
+                    "hash": "0x" + hashlib.sha256(str(number).encode()).hexdigest(),
+                    "timestamp": hex(self.block_timestamp(number)),
+                }
+                await ws.send_json({"jsonrpc": "2.0", "method": "eth_subscription",
+                                    "params": {"subscription": subscription, "result": header}})
+            last = head
+    
+    def build_app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_route("*", "/", self.handle_http)
+        return app
+    
+    def print_stats(self):
+        print("\n" + "="*60)
+        print("MOCK RPC SERVER STATISTICS")
+        print("="*60)
+        print(f"HTTP requests:        {self.stats.http_requests:,}")
+        print(f"WebSocket messages:   {self.stats.ws_messages:,}")
+        print(f"JSON-RPC calls:       {self.stats.calls:,}")
+        print(f"Injected/other errors:{self.stats.errors:>7,}")
+        print(f"Rate limited:         {self.stats.rate_limited:,}")
+        print(f"Hung requests:        {self.stats.hung:,}")
+        if self.config.cache_ttl:
+            print(f"Cache hits:           {self.stats.cache_hits:,}")
+        for method, count in sorted(self.stats.calls_by_method.items(), key=lambda x: x[1], reverse=True):
+            print(f"  {method:<24} {count:>10,}")
+        print("="*60)
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Mock Berachain JSON-RPC server for offline benchmarking",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Zero-latency server: measures the tester's own maximum throughput
+  python mock-rpc-server.py --latency-ms 0 --jitter-ms 0
+  
+  # Realistic-looking node with a long tail and 1% errors
+  python mock-rpc-server.py --latency lognormal --latency-ms 20 --jitter-ms 15 --error-rate 0.01
+  
+  # Failing node: should trip the tester's circuit breaker
+  python mock-rpc-server.py --error-rate 0.6
+  
+  # Rate-limited public endpoint
+  python mock-rpc-server.py --rate-limit-rate 0.2 --retry-after 2
+  
+  # Gateway capped at 300 requests/second, and eth_getLogs at 20 calls/second
+  python mock-rpc-server.py --rate-limit-rps 300 --method-rate-limit eth_getLogs=20
+  
+  # Node that slows down by 1 ms every minute, for soak tests
+  python mock-rpc-server.py --latency-ms 20 --latency-drift-ms 1
+  
+  # Node at 20 ms behind a caching proxy that keeps results for 5 seconds
+  python mock-rpc-server.py --latency-ms 20 --cache-ttl 5
+        """
+    )
+    
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8545, help="Port to listen on (default: 8545)")
+    parser.add_argument(
+        "--latency",
+        choices=["fixed", "uniform", "normal", "lognormal", "exponential"],
+        default="fixed",
+        help="Response latency distribution (default: fixed)"
+    )
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="Mean latency in ms; median for lognormal (default: 5)")
+    parser.add_argument("--jitter-ms", type=float, default=2.0,
+                        help="Latency spread in ms: half-width (uniform), stdev (normal), "
+                             "sigma x median (lognormal) (default: 2)")
+    parser.add_argument("--historical-extra-ms", type=float, default=0.0,
+                        help="Extra latency for state reads at an explicit block number (default: 0)")
+    parser.add_argument("--latency-drift-ms", type=float, default=0.0,
+                        help="Extra latency in ms per minute of uptime, a slowly degrading node (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of calls answered with a JSON-RPC error (default: 0)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="Fraction of HTTP requests answered with 429 (default: 0)")
+    parser.add_argument("--retry-after", type=float, default=1.0,
+                        help="Retry-After seconds sent with 429 responses (default: 1)")
+    parser.add_argument("--rate-limit-rps", type=float, default=0.0,
+                        help="Answer HTTP requests beyond this many per second with 429 (default: unlimited)")
+    parser.add_argument("--method-rate-limit", action="append", default=[], metavar="METHOD=RATE",
+                        help="Answer calls to METHOD beyond RATE per second with a -32005 error; repeatable")
+    parser.add_argument("--timeout-rate", type=float, default=0.0,
+                        help="Fraction of HTTP requests that hang for --hang-seconds (default: 0)")
+    parser.add_argument("--hang-seconds", type=float, default=30.0,
+                        help="How long hung requests stall; above the tester's 10 s timeout (default: 30)")
+    parser.add_argument("--max-batch-size", type=int, default=0,
+                        help="Reject batches larger than this, like many providers (default: unlimited)")
+    parser.add_argument("--block-time", type=float, default=2.0,
+                        help="Seconds between simulated blocks (default: 2)")
+    parser.add_argument("--start-block", type=int, default=5_000_000,
+                        help="Simulated head block at startup (default: 5,000,000)")
+    parser.add_argument("--log-density", type=float, default=0.5,
+                        help="eth_getLogs: logs per block per address for one event type (default: 0.5)")
+    parser.add_argument("--log-ms-per-1k", type=float, default=20.0,
+                        help="eth_getLogs: extra latency in ms per 1,000 matching logs (default: 20)")
+    parser.add_argument("--max-logs", type=int, default=10_000,
+                        help="eth_getLogs: reject queries matching more logs, 0 for unlimited (default: 10,000)")
+    parser.add_argument("--max-block-range", type=int, default=0,
+                        help="eth_getLogs: reject wider block ranges (default: unlimited)")
+    parser.add_argument("--trace-ms", type=float, default=40.0,
+                        help="Trace methods: extra latency in ms per transaction traced (default: 40)")
+    parser.add_argument("--cache-ttl", type=float, default=0.0,
+                        help="Act as a caching proxy: answer repeats of a single request from cache for this "
+                             "many seconds, with an X-Cache header (default: no cache)")
+    parser.add_argument("--cache-latency-ms", type=float, default=0.5,
+                        help="Latency of cache hits in ms (default: 0.5)")
+    parser.add_argument("--cache-max-items", type=int, default=10_000,
+                        help="Cached results kept, least recently used evicted first (default: 10,000)")
+    parser.add_argument("--seed", type=int, help="Random seed for repeatable fault injection")
+    
+    args = parser.parse_args()
+    
+    for name in ("error_rate", "rate_limit_rate", "timeout_rate"):
+        if not 0 <= getattr(args, name) <= 1:
+            print(f"Error: --{name.replace('_', '-')} must be between 0 and 1")
+            sys.exit(1)
+    
+    if args.latency_ms < 0 or args.jitter_ms < 0 or args.latency_drift_ms < 0 or args.block_time <= 0:
+        print("Error: Latency, jitter and drift must be non-negative and block time positive")
+        sys.exit(1)
+    
+    if min(args.log_density, args.log_ms_per_1k, args.max_logs, args.max_block_range) < 0:
+        print("Error: eth_getLogs options must be non-negative")
+        sys.exit(1)
+    
+    if args.trace_ms < 0:
+        print("Error: --trace-ms must be non-negative")
+        sys.exit(1)
+    
+    if args.cache_ttl < 0 or args.cache_latency_ms < 0 or args.cache_max_items <= 0:
+        print("Error: --cache-ttl and --cache-latency-ms must be non-negative and --cache-max-items positive")
+        sys.exit(1)
+    
+    method_rate_limits = {}
+    for entry in args.method_rate_limit:
+        method, _, rate = entry.partition("=")
+        try:
+            method_rate_limits[method] = float(rate)
+        except ValueError:
+            method_rate_limits[method] = 0.0
+        if not method or method_rate_limits[method] <= 0:
+            print(f"Error: --method-rate-limit needs METHOD=RATE with a positive rate, got {entry}")
+            sys.exit(1)
+    
+    if args.rate_limit_rps < 0:
+        print("Error: --rate-limit-rps must be non-negative")
+        sys.exit(1)
+    
+    config = MockConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        historical_extra_ms=args.historical_extra_ms,
+        latency_drift_ms=args.latency_drift_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        rate_limit_rps=args.rate_limit_rps,
+        method_rate_limits=method_rate_limits,
+        timeout_rate=args.timeout_rate,
+        hang_seconds=args.hang_seconds,
+        max_batch_size=args.max_batch_size,
+        block_time=args.block_time,
+        start_block=args.start_block,
+        seed=args.seed,
+        log_density=args.log_density,
+        log_ms_per_1k=args.log_ms_per_1k,
+        max_logs=args.max_logs,
+        max_block_range=args.max_block_range,
+        trace_ms=args.trace_ms,
+        cache_ttl=args.cache_ttl,
+        cache_latency_ms=args.cache_latency_ms,
+        cache_max_items=args.cache_max_items
+    )
+    server = MockRPCServer(config)
+    
+    logger.info(f"Mock RPC server listening on http://{args.host}:{args.port}/ (WebSocket on the same URL)")
+    logger.info(f"Latency: {config.latency} {config.latency_ms:g} ms +/- {config.jitter_ms:g} ms, "
+                f"errors {config.error_rate:.1%}, 429s {config.rate_limit_rate:.1%}, "
+                f"timeouts {config.timeout_rate:.1%}")
+    
+    try:
+        web.run_app(server.build_app(), host=args.host, port=args.port, print=None)
+    finally:
+        server.print_stats()
+
+if __name__ == "__main__":
+    main()
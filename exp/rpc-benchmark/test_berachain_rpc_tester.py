@@ -0,0 +1,198 @@
+"""Unit tests for the statistics that berachain-rpc-tester.py reports are built on.
+
+Run from this directory with: python -m pytest test_berachain_rpc_tester.py
+"""
+
+import importlib.util
+import json
+import math
+import os
+import random
+
+import pytest
+
+# The script's file name has hyphens, so it is loaded by path rather than imported
+_spec = importlib.util.spec_from_file_location(
+    "berachain_rpc_tester", os.path.join(os.path.dirname(os.path.abspath(__file__)), "berachain-rpc-tester.py")
+)
+rpc_tester = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(rpc_tester)
+LatencyHistogram = rpc_tester.LatencyHistogram
+
+
+def lognormal_latencies(count, seed, median=0.02, sigma=1.0):
+    """Latencies in seconds spread over several orders of magnitude"""
+    rng = random.Random(seed)
+    return [rng.lognormvariate(math.log(median), sigma) for _ in range(count)]
+
+
+def histogram_of(latencies, significant_figures=3):
+    histogram = LatencyHistogram(significant_figures)
+    for latency in latencies:
+        histogram.record(latency)
+    return histogram
+
+
+def exact_percentile(latencies, pct):
+    """Nearest-rank percentile of the recorded values, which are whole microseconds"""
+    values = sorted(int(latency * 1_000_000) for latency in latencies)
+    return values[max(1, math.ceil(pct / 100 * len(values))) - 1] / 1_000_000
+
+
+@pytest.mark.parametrize("significant_figures", [2, 3, 4])
+def test_percentiles_within_configured_precision(significant_figures):
+    latencies = lognormal_latencies(20_000, seed=significant_figures)
+    histogram = histogram_of(latencies, significant_figures)
+
+    for pct in (1, 10, 50, 90, 99, 99.9, 100):
+        exact = exact_percentile(latencies, pct)
+        assert histogram.percentile(pct) == pytest.approx(exact, rel=10 ** -significant_figures, abs=1e-6)
+
+
+def test_percentiles_stay_within_recorded_range():
+    histogram = histogram_of([0.0123, 0.0456, 0.0789])
+
+    # A bucket reports its highest value, but never more than the largest sample
+    assert 0.0123 <= histogram.percentile(0) <= 0.0123 * 1.001
+    assert histogram.percentile(100) == pytest.approx(0.0789)
+    assert histogram.min() == pytest.approx(0.0123)
+    assert histogram.max() == pytest.approx(0.0789)
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+
+    assert len(histogram) == 0
+    assert histogram.percentile(99) == 0.0
+    assert histogram.mean() == 0.0
+    assert histogram.stdev() == 0.0
+
+
+def test_values_above_highest_trackable_are_capped():
+    histogram = LatencyHistogram(3, highest_trackable_seconds=10.0)
+    histogram.record(0.5)
+    histogram.record(7200.0)
+
+    assert histogram.max() == pytest.approx(10.0)
+    assert histogram.percentile(100) == pytest.approx(10.0, rel=1e-3)
+
+
+def test_record_with_count_matches_repeated_records():
+    repeated = histogram_of([0.015] * 5 + [0.2])
+    counted = LatencyHistogram()
+    counted.record(0.015, count=5)
+    counted.record(0.2)
+
+    assert counted.to_dict() == repeated.to_dict()
+
+
+def test_mean_and_stdev():
+    latencies = lognormal_latencies(5_000, seed=7, sigma=0.5)
+    histogram = histogram_of(latencies)
+    values = [int(latency * 1_000_000) / 1_000_000 for latency in latencies]
+    mean = sum(values) / len(values)
+    stdev = math.sqrt(sum((value - mean) ** 2 for value in values) / (len(values) - 1))
+
+    assert histogram.mean() == pytest.approx(mean)
+    assert histogram.stdev() == pytest.approx(stdev)
+
+
+def test_merge_equals_recording_everything_in_one():
+    first, second = lognormal_latencies(3_000, seed=1), lognormal_latencies(5_000, seed=2, median=0.1)
+    merged = histogram_of(first)
+    merged.merge(histogram_of(second))
+    combined = histogram_of(first + second)
+
+    assert merged.to_dict() == combined.to_dict()
+    for pct in (50, 90, 99, 99.9):
+        assert merged.percentile(pct) == combined.percentile(pct)
+
+
+def test_merge_into_empty_and_from_empty():
+    filled = histogram_of(lognormal_latencies(100, seed=3))
+
+    into_empty = LatencyHistogram()
+    into_empty.merge(filled)
+    assert into_empty.to_dict() == filled.to_dict()
+
+    before = filled.to_dict()
+    filled.merge(LatencyHistogram())
+    assert filled.to_dict() == before
+
+
+def test_merge_rejects_different_precision():
+    with pytest.raises(ValueError):
+        LatencyHistogram(3).merge(histogram_of([0.01], significant_figures=2))
+
+
+def test_dict_round_trip_through_json():
+    histogram = histogram_of(lognormal_latencies(10_000, seed=4))
+    restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+
+    assert restored.to_dict() == histogram.to_dict()
+    for pct in (0, 50, 99, 99.99, 100):
+        assert restored.percentile(pct) == histogram.percentile(pct)
+    assert restored.mean() == histogram.mean()
+
+    # A restored histogram keeps working: later samples land in the same buckets
+    for target in (restored, histogram):
+        target.record(0.25)
+    assert restored.to_dict() == histogram.to_dict()
+
+
+def test_stats_round_trip_keeps_histograms():
+    stats = rpc_tester.TestStats(hdr_precision=3)
+    latencies = lognormal_latencies(1_000, seed=5)
+    for latency in latencies:
+        stats.record_latency(rpc_tester.RPCResult(success=True, latency=latency, call_name="eth_blockNumber"))
+
+    restored = rpc_tester.TestStats.from_dict(json.loads(json.dumps(stats.to_dict())))
+
+    assert restored.latencies.to_dict() == stats.latencies.to_dict()
+    assert restored.latencies_by_type["eth_blockNumber"].to_dict() == stats.latencies_by_type["eth_blockNumber"].to_dict()
+    assert restored.latencies.percentile(99) == pytest.approx(exact_percentile(latencies, 99), rel=1e-3)
+
+
+def bootstrap(baseline, candidate, pct, **kwargs):
+    """bootstrap_percentile_change with fewer replicates, to keep the tests quick"""
+    return rpc_tester.bootstrap_percentile_change(baseline, candidate, pct, replicates=500, **kwargs)
+
+
+def test_bootstrap_identical_runs_interval_covers_zero():
+    histogram = histogram_of(lognormal_latencies(5_000, seed=10))
+
+    change, low, high = bootstrap(histogram, histogram, 99)
+
+    assert change == 0.0
+    assert low <= 0.0 <= high
+
+
+def test_bootstrap_detects_a_shift():
+    baseline_latencies = lognormal_latencies(20_000, seed=11, sigma=0.3)
+    baseline = histogram_of(baseline_latencies)
+    candidate = histogram_of([latency + 0.010 for latency in lognormal_latencies(20_000, seed=12, sigma=0.3)])
+
+    change, low, high = bootstrap(baseline, candidate, 50)
+
+    assert change == pytest.approx(0.010, rel=0.1)
+    assert 0.0 < low <= change <= high
+    assert low <= 0.010 <= high
+
+
+def test_bootstrap_interval_narrows_with_more_samples():
+    def interval_width(count):
+        baseline = histogram_of(lognormal_latencies(count, seed=13))
+        candidate = histogram_of(lognormal_latencies(count, seed=14))
+        _, low, high = bootstrap(baseline, candidate, 99)
+        return high - low
+
+    assert interval_width(20_000) < interval_width(500) / 3
+
+
+def test_bootstrap_is_repeatable():
+    baseline = histogram_of(lognormal_latencies(2_000, seed=15))
+    candidate = histogram_of(lognormal_latencies(2_000, seed=16))
+
+    first = bootstrap(baseline, candidate, 90)
+    assert bootstrap(baseline, candidate, 90) == first
+    assert bootstrap(baseline, candidate, 90, rng=random.Random(1)) != first